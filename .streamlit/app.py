@@ -5,11 +5,23 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import io
 import os
+import sys
+import time
 from datetime import datetime
 
+# Les modules de calcul partagés (moteur de régression...) sont à la racine du dépôt
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 # Importer l'API météo et le modèle optimisé
 from weather_api import WeatherAPI
 from optimized_model import OptimizedModelIPMVP
+from chronometrage import Chronometre
+from donnees import FORMATS, agreger_intervalles, lire_donnees
+from degres_jours import meilleure_base, nom_colonne
+
+# Grilles des bases de température évaluées par la recherche automatique (pas de 0,5 °C)
+GRILLE_DJU = np.arange(10, 22.01, 0.5)
+GRILLE_DJF = np.arange(18, 28.01, 0.5)
 
 # Configuration de la page
 st.set_page_config(
@@ -62,9 +74,12 @@ if not check_password():
 
 # Fonction pour charger les données
 @st.cache_data
-def load_data(file):
+def load_data(contenu, nom, agreger=False):
     try:
-        return pd.read_excel(file)
+        if agreger:
+            # Relevés à pas de temps fin agrégés par mois, comme les données météo
+            return agreger_intervalles(contenu, nom, pas='MS')[0]
+        return lire_donnees(contenu, nom)
     except Exception as e:
         st.error(f"Erreur lors du chargement du fichier: {e}")
         return None
@@ -80,13 +95,21 @@ au protocole IPMVP (International Performance Measurement and Verification Proto
 # Barre latérale pour les paramètres
 st.sidebar.header("Configuration")
 
+# Durées des étapes de l'analyse (affichées sur demande dans l'encadré "Performance")
+chronometre = Chronometre()
+
 # Section 1: Chargement des données
 st.sidebar.subheader("1. Données de consommation")
-uploaded_file = st.sidebar.file_uploader("Chargez votre fichier Excel de consommation", type=["xlsx", "xls"])
+uploaded_file = st.sidebar.file_uploader("Chargez votre fichier de consommation (Excel, CSV, Parquet, Arrow)", type=list(FORMATS))
+donnees_fines = st.sidebar.checkbox(
+    "Relevés à pas de temps fin (15 min, horaire)",
+    value=False,
+    help="Les relevés sont lus par blocs et agrégés par mois à l'import (consommations sommées, autres variables moyennées)"
+)
 
 # Afficher un dataset d'exemple si aucun fichier n'est chargé
 if uploaded_file is None:
-    st.info("👆 Veuillez charger votre fichier Excel contenant les données de consommation.")
+    st.info("👆 Veuillez charger votre fichier (Excel, CSV, Parquet ou Arrow) contenant les données de consommation.")
     
     # Créer un exemple de données
     example_data = {
@@ -111,7 +134,8 @@ if uploaded_file is None:
     proceed = False
 else:
     # Charger les données
-    df = load_data(uploaded_file)
+    with chronometre.etape("lecture du fichier"):
+        df = load_data(uploaded_file.getvalue(), uploaded_file.name, donnees_fines)
     
     if df is not None:
         st.subheader("Données chargées")
@@ -199,6 +223,13 @@ if proceed:
             )
         else:
             djf_bases = []
+        
+        # Base ajustée aux données : s'ajoute aux bases choisies ci-dessus
+        base_auto = st.sidebar.checkbox(
+            "Rechercher la base optimale",
+            value=False,
+            help="Évalue les bases de 10 à 22 °C (DJU) et de 18 à 28 °C (DJF) par pas de 0,5 °C, et retient celle dont les degrés-jours mensuels expliquent le mieux la consommation"
+        )
 
     # Section 3: Configuration du modèle
     st.sidebar.subheader("3. Configuration du modèle")
@@ -206,6 +237,20 @@ if proceed:
     # Nombre maximum de variables
     max_features = st.sidebar.slider("Nombre maximum de variables", 1, 4, min(4, len(selected_vars) if selected_vars else 1))
     
+    # Recherche par séparation et évaluation (meilleur sous-ensemble de chaque taille)
+    recherche_bb = st.sidebar.checkbox(
+        "Recherche branch-and-bound",
+        value=False,
+        help="Ne teste que le meilleur sous-ensemble de variables de chaque taille, en élaguant les combinaisons qui ne peuvent pas l'améliorer"
+    )
+    
+    # Mesure des durées de chaque étape de l'analyse
+    mesures_performance = st.sidebar.checkbox(
+        "Mesures de performance",
+        value=False,
+        help="Affiche la durée et le nombre d'appels de chaque étape (lecture, météo, recherche du modèle, graphiques...), avec un export JSON"
+    )
+    
     # Bouton pour lancer l'analyse
     if st.sidebar.button("🚀 Lancer l'analyse IPMVP"):
         if not selected_vars and not use_weather_api:
@@ -236,14 +281,44 @@ if proceed:
             # Initialiser l'API météo
             weather_api = WeatherAPI()
             
+            # Recherche des bases optimales sur les observations quotidiennes (stockées localement)
+            bases_optimales = []
+            if base_auto and (include_dju or include_djf):
+                status_text.text("Recherche des bases de température optimales...")
+                with chronometre.etape("recherche de la base optimale"):
+                    try:
+                        observations, _ = weather_api.get_daily_observations(location, start_date, end_date)
+                        mois_conso = pd.to_datetime(consumption_data[date_col]).dt.to_period('M')
+                        conso_mensuelle = pd.to_numeric(consumption_data[conso_col], errors='coerce').groupby(mois_conso).sum()
+                        # Bases ajoutées seulement si la recherche aboutit pour toutes les grandeurs
+                        bases_auto = {True: list(dju_bases), False: list(djf_bases)}
+                        messages = []
+                        for chauffage, grille in ((True, GRILLE_DJU), (False, GRILLE_DJF)):
+                            if not (include_dju if chauffage else include_djf):
+                                continue
+                            base, scores = meilleure_base(observations['date'], observations['temp_mean'],
+                                                          conso_mensuelle, grille, chauffage=chauffage)
+                            if base is not None:
+                                if base not in bases_auto[chauffage]:
+                                    bases_auto[chauffage].append(base)
+                                bases_optimales.append(nom_colonne(base, chauffage))
+                                messages.append(f"🌡️ Base optimale {'DJU' if chauffage else 'DJF'} : {base:g} °C (R² = {scores[base]:.3f})")
+                        dju_bases, djf_bases = bases_auto[True], bases_auto[False]
+                        for message in messages:
+                            st.info(message)
+                    except Exception as e:
+                        bases_optimales = []
+                        st.error(f"Erreur lors de la recherche des bases optimales: {str(e)}. Les bases choisies manuellement sont utilisées.")
+            
             # Récupérer les données
-            weather_data = weather_api.get_weather_data(
-                location,
-                start_date,
-                end_date,
-                bases_dju=dju_bases,
-                bases_djf=djf_bases
-            )
+            with chronometre.etape("données météo"):
+                weather_data = weather_api.get_weather_data(
+                    location,
+                    start_date,
+                    end_date,
+                    bases_dju=dju_bases,
+                    bases_djf=djf_bases
+                )
             
             if not weather_data.empty:
                 st.subheader("Données météo mensuelles")
@@ -257,7 +332,8 @@ if proceed:
                 consumption_data['month'] = pd.to_datetime(consumption_data[date_col]).dt.to_period('M')
                 
                 # Fusion
-                merged_df = pd.merge(consumption_data, weather_data, on='month', how='inner')
+                with chronometre.etape("fusion des données"):
+                    merged_df = pd.merge(consumption_data, weather_data, on='month', how='inner')
                 
                 # Vérifier la fusion
                 if len(merged_df) < len(consumption_data):
@@ -278,7 +354,7 @@ if proceed:
                 selected_analysis_vars = st.multiselect(
                     "Variables à utiliser pour l'analyse IPMVP",
                     options=all_available_vars,
-                    default=[v for v in all_available_vars if "dju_base_18" in v] if "dju_base_18" in all_available_vars else all_available_vars[:1]
+                    default=bases_optimales if bases_optimales else [v for v in all_available_vars if "dju_base_18" in v] if "dju_base_18" in all_available_vars else all_available_vars[:1]
                 )
                 
                 if selected_analysis_vars:
@@ -301,10 +377,16 @@ if proceed:
         status_text.text("Recherche du meilleur modèle... Priorité aux modèles simples")
         
         modele_ipmvp = OptimizedModelIPMVP()
-        success = modele_ipmvp.trouver_meilleur_modele(
-            X, y, max_features=max_features,
-            progress_callback=lambda p: progress_bar.progress(50 + p * 0.4)
-        )
+        with chronometre.etape("recherche du modèle"):
+            success = modele_ipmvp.trouver_meilleur_modele(
+                X, y, max_features=max_features,
+                progress_callback=lambda p: progress_bar.progress(50 + p * 0.4),
+                methode="branch_and_bound" if recherche_bb else "exhaustive"
+            )
+        
+        if modele_ipmvp.stats_recherche:
+            stats_bb = modele_ipmvp.stats_recherche
+            st.info(f"🌳 Branch-and-bound : {stats_bb['elagues']} combinaisons élaguées sur {stats_bb['total']}")
         
         if success:
             status_text.text("Analyse terminée avec succès!")
@@ -316,7 +398,8 @@ if proceed:
             
             # Visualisation
             st.subheader("Visualisation des résultats")
-            results_df = modele_ipmvp.visualiser_resultats(X, y, dates=dates_for_analysis)
+            with chronometre.etape("graphiques"):
+                results_df = modele_ipmvp.visualiser_resultats(X, y, dates=dates_for_analysis)
             
             # Afficher les graphiques
             st.image('resultats_modele_ipmvp.png')
@@ -324,6 +407,7 @@ if proceed:
             
             # Téléchargement des résultats
             buffer = io.BytesIO()
+            debut_export = time.perf_counter()
             with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
                 df.to_excel(writer, sheet_name='Données d\'origine', index=False)
                 if 'merged_df' in locals():
@@ -332,6 +416,7 @@ if proceed:
                     results_df.to_excel(writer, sheet_name='Résultats', index=False)
                 else:
                     pd.DataFrame({"Message": ["Pas de résultats valides"]}).to_excel(writer, sheet_name='Résultats', index=False)
+            chronometre.ajouter("export Excel", time.perf_counter() - debut_export)
                     
             st.download_button(
                 label="📥 Télécharger les résultats",
@@ -345,6 +430,20 @@ if proceed:
 
         # Terminer la barre de progression
         progress_bar.progress(100)
+        
+        # Durées des étapes de l'analyse
+        if mesures_performance:
+            contexte = {'fichier': uploaded_file.name, 'lignes': len(df), 'variables': list(analysis_vars),
+                        'max_features': max_features, 'meteo': use_weather_api}
+            chronometre.journaliser(**contexte)
+            with st.expander("⏱️ Performance", expanded=True):
+                st.dataframe(chronometre.dataframe(), use_container_width=True)
+                st.download_button(
+                    label="📥 Exporter les mesures (JSON)",
+                    data=chronometre.to_json(**contexte),
+                    file_name="performance_ipmvp.json",
+                    mime="application/json"
+                )
 
 # Footer
 st.sidebar.markdown("---")
@@ -1,7 +1,98 @@
+import os
+import sqlite3
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 import pandas as pd
 import streamlit as st
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Le stockage des observations est partagé avec les modules de calcul, à la racine du dépôt
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from degres_jours import degres_jours_mensuels
+from stockage_meteo import ELEMENTS, StockageMeteo
+
+# Délais de connexion et de lecture des requêtes (s)
+DELAIS_REQUETE = (5, 60)
+
+# Nouvelles tentatives sur les erreurs transitoires (quota, surcharge), espacées de 0,5 s, 1 s, 2 s...
+TENTATIVES = Retry(total=4, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                   allowed_methods=("GET",), respect_retry_after_header=True)
+
+# Nombre maximum de requêtes simultanées (une par année de la période demandée)
+REQUETES_SIMULTANEES = 4
+
+_session = None
+_verrou_session = threading.Lock()
+
+
+def session_http():
+    """
+    Session HTTP partagée par toutes les requêtes météo : les connexions sont réutilisées
+    d'un site et d'une analyse à l'autre, avec délais et nouvelles tentatives.
+    """
+    global _session
+    with _verrou_session:
+        if _session is None:
+            session = requests.Session()
+            adaptateur = HTTPAdapter(pool_connections=REQUETES_SIMULTANEES, pool_maxsize=REQUETES_SIMULTANEES,
+                                     max_retries=TENTATIVES)
+            session.mount("https://", adaptateur)
+            session.mount("http://", adaptateur)
+            _session = session
+    return _session
+
+def decouper_periode(start_date, end_date):
+    """
+    Découpe une période en tranches d'une année civile au plus.
+
+    Parameters:
+    start_date (str): Date de début au format 'YYYY-MM-DD'
+    end_date (str): Date de fin au format 'YYYY-MM-DD'
+
+    Returns:
+    list: Tranches (début, fin) au format 'YYYY-MM-DD', dans l'ordre chronologique
+    """
+    debut, fin = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    tranches = []
+    while debut <= fin:
+        fin_tranche = min(pd.Timestamp(year=debut.year, month=12, day=31), fin)
+        tranches.append((debut.strftime('%Y-%m-%d'), fin_tranche.strftime('%Y-%m-%d')))
+        debut = fin_tranche + pd.Timedelta(days=1)
+    return tranches
+
+def fusionner_tranches(reponses):
+    """
+    Observations quotidiennes des réponses du service pour plusieurs tranches d'une période.
+
+    Parameters:
+    reponses (iterable): Réponses JSON des tranches, dans un ordre quelconque
+
+    Returns:
+    pd.DataFrame: Observations triées par date, une ligne par date
+    """
+    observations = pd.DataFrame([
+        {
+            'date': day.get('datetime'),
+            'temp_max': day.get('tempmax'),
+            'temp_min': day.get('tempmin'),
+            'temp_mean': day.get('temp'),
+            'humidity': day.get('humidity'),
+            'precip': day.get('precip'),
+            'sunshine_hours': day.get('sunhours', 0),
+            'cloud_cover': day.get('cloudcover', 0)
+        }
+        for data in reponses for day in data.get('days', [])
+    ], columns=['date', *ELEMENTS])
+    observations['date'] = pd.to_datetime(observations['date'])
+    return (observations.drop_duplicates('date', keep='last')
+            .sort_values('date')
+            .reset_index(drop=True))
+
 
 class WeatherAPI:
     def __init__(self, api_key=None):
@@ -9,11 +100,14 @@ class WeatherAPI:
         self.api_key = api_key or "ZE3U556AFCCFHBXSFC95XRABC"
         self.base_url = "https://weather.visualcrossing.com/VisualCrossingWebServices/rest/services/timeline"
     
-    @st.cache_data(ttl=3600)
     def get_weather_data(self, location, start_date, end_date, bases_dju=[16, 18, 19], bases_djf=[22, 24, 26]):
         """
         Récupère les données météo pour une période donnée
         
+        Les observations quotidiennes sont lues dans le stockage local (voir stockage_meteo) ;
+        seules les dates absentes sont demandées au service. Les DJU et DJF sont calculés à
+        partir des observations : changer de base ne demande aucune nouvelle requête.
+        
         Parameters:
         -----------
         location : str
@@ -32,59 +126,14 @@ class WeatherAPI:
         pd.DataFrame
             Données mensuelles avec DJU, DJF pour différentes bases
         """
-        # S'assurer que la localisation se termine par ,FR pour les villes françaises
-        if ',' not in location and not (location.replace('.', '').replace('-', '').isdigit()):
-            location = f"{location},FR"
-            
-        url = f"{self.base_url}/{location}/{start_date}/{end_date}"
-        
-        params = {
-            'unitGroup': 'metric',
-            'include': 'days',
-            'key': self.api_key,
-            'contentType': 'json',
-            'elements': 'datetime,tempmax,tempmin,temp,humidity,precip,sunhours,dew,windspeed,cloudcover'
-        }
-        
         try:
-            with st.spinner(f"Récupération des données météo pour {location}..."):
-                response = requests.get(url, params=params)
-                response.raise_for_status()
-                data = response.json()
+            weather_df, resolved_address = self.get_daily_observations(location, start_date, end_date)
             
-            # Extraire la localisation exacte utilisée
-            resolved_address = data.get('resolvedAddress', location)
-            st.success(f"Données météo récupérées pour: {resolved_address}")
-            
-            # Extraire les données quotidiennes
-            daily_data = []
-            for day in data.get('days', []):
-                day_data = {
-                    'date': day.get('datetime'),
-                    'temp_max': day.get('tempmax'),
-                    'temp_min': day.get('tempmin'),
-                    'temp_mean': day.get('temp'),
-                    'humidity': day.get('humidity'),
-                    'precip': day.get('precip'),
-                    'sunshine_hours': day.get('sunhours', 0),
-                    'cloud_cover': day.get('cloudcover', 0)
-                }
-                
-                # Calculer DJU pour différentes bases
-                for base in bases_dju:
-                    day_data[f'dju_base_{base}'] = max(0, base - day.get('temp'))
-                
-                # Calculer DJF pour différentes bases
-                for base in bases_djf:
-                    day_data[f'djf_base_{base}'] = max(0, day.get('temp') - base)
-                
-                daily_data.append(day_data)
-            
-            # Convertir en DataFrame
-            weather_df = pd.DataFrame(daily_data)
+            # DJU et DJF mensuels de toutes les bases, en une seule opération
+            degres_jours = degres_jours_mensuels(weather_df['date'], weather_df['temp_mean'], bases_dju, bases_djf)
             
             # Agréger les données par mois
-            monthly_df = self._aggregate_monthly(weather_df)
+            monthly_df = self._aggregate_monthly(weather_df, degres_jours)
             
             # Ajouter la localisation utilisée
             monthly_df['localisation'] = resolved_address
@@ -95,8 +144,116 @@ class WeatherAPI:
             st.error(f"Erreur lors de la récupération des données météo: {str(e)}")
             return pd.DataFrame()
     
-    def _aggregate_monthly(self, df):
-        """Agrège les données quotidiennes en mensuelles"""
+    def get_daily_observations(self, location, start_date, end_date):
+        """
+        Observations météo quotidiennes d'une période, complétées auprès du service pour
+        les seules dates absentes du stockage local
+        
+        Parameters:
+        -----------
+        location : str
+            Ville française (ex: "Paris,FR", "Lyon,FR") ou coordonnées GPS
+        start_date : str
+            Date de début au format 'YYYY-MM-DD'
+        end_date : str
+            Date de fin au format 'YYYY-MM-DD'
+            
+        Returns:
+        --------
+        tuple
+            (observations quotidiennes triées par date, localisation résolue par le service)
+        """
+        # S'assurer que la localisation se termine par ,FR pour les villes françaises
+        if ',' not in location and not (location.replace('.', '').replace('-', '').isdigit()):
+            location = f"{location},FR"
+        
+        # Stockage local indisponible (répertoire en lecture seule...) : toute la période est demandée
+        try:
+            stockage = StockageMeteo()
+            resolved_address = stockage.adresse_resolue(location)
+        except sqlite3.Error:
+            stockage, resolved_address = None, None
+        
+        if resolved_address is None:
+            plages = [(start_date, end_date)]
+        else:
+            plages = stockage.plages_manquantes(resolved_address, start_date, end_date)
+        
+        recuperees = pd.DataFrame(columns=['date', *ELEMENTS])
+        if plages:
+            params = {
+                'unitGroup': 'metric',
+                'include': 'days',
+                'key': self.api_key,
+                'contentType': 'json',
+                'elements': 'datetime,tempmax,tempmin,temp,humidity,precip,sunhours,dew,windspeed,cloudcover'
+            }
+            
+            # Une requête par année, en parallèle : une longue période ne fait pas une seule
+            # réponse volumineuse, et une erreur transitoire ne fait reprendre qu'une année
+            tranches = [tranche for debut, fin in plages for tranche in decouper_periode(debut, fin)]
+            with st.spinner(f"Récupération des données météo pour {location}..."):
+                reponses, erreurs = self._requetes_tranches(location, tranches, params)
+                # Seconde passe pour les seules tranches en échec malgré les nouvelles tentatives
+                if erreurs:
+                    reprises, erreurs = self._requetes_tranches(location, list(erreurs), params)
+                    reponses.update(reprises)
+            
+            if reponses:
+                # Extraire la localisation exacte utilisée (première tranche récupérée)
+                resolved_address = reponses[min(reponses)].get('resolvedAddress', location)
+                recuperees = fusionner_tranches(reponses.values())
+                
+                if stockage is not None:
+                    try:
+                        stockage.enregistrer(location, resolved_address, recuperees)
+                    except sqlite3.Error:
+                        pass  # Les observations restent utilisables pour cette analyse
+            
+            # Tranches toujours en échec : les tranches récupérées sont conservées dans le
+            # stockage, seules les dates manquantes seront demandées à la prochaine analyse
+            if erreurs:
+                tranche, erreur = min(erreurs.items())
+                raise RuntimeError(f"{len(erreurs)} tranche(s) non récupérée(s), dont "
+                                   f"{tranche[0]} - {tranche[1]} : {erreur}") from erreur
+            st.success(f"Données météo récupérées pour: {resolved_address}")
+        
+        stockees = stockage.lire(resolved_address, start_date, end_date) if stockage is not None else recuperees.iloc[:0]
+        observations = (pd.concat([stockees, recuperees], ignore_index=True)
+                        .drop_duplicates('date', keep='last')
+                        .sort_values('date')
+                        .reset_index(drop=True))
+        return observations, resolved_address
+    
+    def _requetes_tranches(self, location, tranches, params):
+        """
+        Requêtes parallèles des tranches d'une période ; une tranche en échec n'interrompt
+        pas les autres. Retourne ({tranche: réponse}, {tranche: erreur}).
+        """
+        def requete(tranche):
+            try:
+                return tranche, self._requete(location, tranche[0], tranche[1], params), None
+            except (requests.RequestException, ValueError) as erreur:
+                return tranche, None, erreur
+        
+        reponses, erreurs = {}, {}
+        with ThreadPoolExecutor(max_workers=min(len(tranches), REQUETES_SIMULTANEES)) as executeur:
+            for tranche, reponse, erreur in executeur.map(requete, tranches):
+                if erreur is None:
+                    reponses[tranche] = reponse
+                else:
+                    erreurs[tranche] = erreur
+        return reponses, erreurs
+    
+    def _requete(self, location, start_date, end_date, params):
+        """Requête d'une tranche de la période, par la session partagée"""
+        url = f"{self.base_url}/{location}/{start_date}/{end_date}"
+        response = session_http().get(url, params=params, timeout=DELAIS_REQUETE)
+        response.raise_for_status()
+        return response.json()
+    
+    def _aggregate_monthly(self, df, degres_jours=None):
+        """Agrège les données quotidiennes en mensuelles (degrés-jours mensuels déjà calculés en tête)"""
         if df.empty:
             return pd.DataFrame()
         
@@ -106,15 +263,11 @@ class WeatherAPI:
         # Extraire le mois
         df['month'] = df['date'].dt.to_period('M')
         
-        # Identifier les colonnes par type pour savoir comment les agréger
-        dju_cols = [col for col in df.columns if 'dju_base' in col]
-        djf_cols = [col for col in df.columns if 'djf_base' in col]
-        
         # Créer le dictionnaire d'agrégation
         agg_dict = {}
         
-        # DJU, DJF, précip, ensoleillement -> somme
-        for col in dju_cols + djf_cols + ['precip', 'sunshine_hours']:
+        # Précip, ensoleillement -> somme
+        for col in ['precip', 'sunshine_hours']:
             if col in df.columns:
                 agg_dict[col] = 'sum'
         
@@ -130,7 +283,10 @@ class WeatherAPI:
             agg_dict['temp_min'] = 'min'
         
         # Agréger par mois
-        monthly_df = df.groupby('month').agg(agg_dict).reset_index()
+        monthly_df = df.groupby('month').agg(agg_dict)
+        if degres_jours is not None:
+            monthly_df = degres_jours.join(monthly_df, how='right')
+        monthly_df = monthly_df.reset_index()
         
         # Convertir le mois en date (1er jour du mois)
         monthly_df['date'] = monthly_df['month'].dt.to_timestamp()
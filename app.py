@@ -3,18 +3,16 @@ import pandas as pd
 import numpy as np
 import io
 import matplotlib.pyplot as plt
-from itertools import combinations
-from sklearn.linear_model import LinearRegression, Ridge, Lasso
-from sklearn.preprocessing import PolynomialFeatures
-from sklearn.pipeline import Pipeline
-from sklearn.metrics import r2_score, mean_squared_error, mean_absolute_error
-import math
 import hashlib
 import pickle
 import os
 from datetime import datetime, timedelta
 import base64
-import scipy.stats as stats  # Ajouté pour les calculs statistiques t-test
+import time
+from cache_analyses import CacheAnalyses, cle_analyse
+from chronometrage import Chronometre
+from donnees import AGREGATIONS, FORMATS, charger_fichier, empreinte_contenu
+from moteur_ipmvp import periodes_glissantes, rechercher_modeles, types_modeles_a_tester
 
 # 📌 Configuration de la page
 st.set_page_config(
@@ -300,67 +298,6 @@ if st.session_state.get('show_admin', False) and st.session_state.get('is_admin'
 ###################################
 # NOUVELLES FONCTIONS POUR AMÉLIORER L'AFFICHAGE ET CALCULER LES STATISTIQUES T
 
-# Fonction pour calculer les valeurs t-stat pour les coefficients
-def calculate_t_stats(X, y, model, coefs):
-    """
-    Calcule les valeurs t-stat pour les coefficients de régression.
-    
-    Parameters:
-    X (pandas.DataFrame): Variables explicatives
-    y (pandas.Series): Variable cible
-    model: Modèle de régression ajusté
-    coefs (dict): Dictionnaire des coefficients
-    
-    Returns:
-    dict: Dictionnaire des valeurs t-stat et p-values pour chaque variable
-    """
-    # Ne s'applique qu'aux modèles linéaires standards
-    if not hasattr(model, 'coef_'):
-        # Pour les modèles non standards comme les polynomiaux via Pipeline
-        return {feature: None for feature in coefs.keys()}
-    
-    # Calcul des prédictions et des résidus
-    y_pred = model.predict(X)
-    residuals = y - y_pred
-    
-    # Degrés de liberté et MSE
-    n = len(y)
-    p = len(model.coef_)
-    df = n - p - 1
-    if df <= 0:  # Éviter division par zéro ou valeurs négatives
-        return {feature: None for feature in coefs.keys()}
-        
-    mse = np.sum(residuals ** 2) / df
-    
-    # Calcul de la matrice (X'X)^-1
-    try:
-        # Pour les modèles de régression linéaire standard
-        X_matrix = X.values
-        XtX_inv = np.linalg.inv(np.dot(X_matrix.T, X_matrix))
-        
-        # Erreurs standard
-        se = np.sqrt(np.diag(XtX_inv) * mse)
-        
-        # Calcul des valeurs t
-        t_stats = model.coef_ / se
-        
-        # Calcul des p-values
-        p_values = [2 * (1 - stats.t.cdf(abs(t), df)) for t in t_stats]
-        
-        # Créer un dictionnaire des valeurs t et p-values
-        result = {}
-        for i, feature in enumerate(X.columns):
-            result[feature] = {
-                't_value': t_stats[i],
-                'p_value': p_values[i],
-                'significant': p_values[i] < 0.05  # Significatif au niveau 5%
-            }
-        
-        return result
-    except:
-        # En cas d'erreur, retourner None pour toutes les variables
-        return {feature: None for feature in X.columns}
-
 # Fonction pour formater l'équation en ignorant les coefficients proches de zéro
 def format_equation(intercept, coefficients, threshold=1e-4):
     """
@@ -389,90 +326,10 @@ def format_equation(intercept, coefficients, threshold=1e-4):
     
     return equation
 
-# Fonction pour détecter automatiquement les colonnes de date et de consommation
-def detecter_colonnes(df):
-    # Initialiser les résultats
-    date_col_guess = None
-    conso_col_guess = None
-    
-    if df is None or df.empty:
-        return date_col_guess, conso_col_guess
-    
-    # 1. Détecter la colonne de date
-    date_keywords = ['date', 'temps', 'période', 'period', 'time', 'jour', 'day', 'mois', 'month', 'année', 'year']
-    
-    # Essayer d'abord de trouver une colonne de type datetime
-    datetime_cols = df.select_dtypes(include=['datetime64']).columns.tolist()
-    if datetime_cols:
-        date_col_guess = datetime_cols[0]
-    else:
-        # Chercher par mots-clés dans les noms de colonnes
-        for keyword in date_keywords:
-            potential_cols = [col for col in df.columns if keyword.lower() in col.lower()]
-            if potential_cols:
-                # Essayer de convertir en datetime
-                for col in potential_cols:
-                    try:
-                        pd.to_datetime(df[col])
-                        date_col_guess = col
-                        break
-                    except:
-                        continue
-                if date_col_guess:
-                    break
-    
-    # 2. Détecter la colonne de consommation
-    conso_keywords = ['consommation', 'conso', 'énergie', 'energy', 'kwh', 'mwh', 'wh', 
-                      'électricité', 'electricity', 'gaz', 'gas', 'chaleur', 'heat', 
-                      'puissance', 'power', 'compteur', 'meter']
-    
-    # Exclure la colonne de date si elle a été trouvée
-    cols_to_check = [col for col in df.columns if col != date_col_guess]
-    
-    # Chercher par mots-clés dans les noms de colonnes
-    for keyword in conso_keywords:
-        potential_cols = [col for col in cols_to_check if keyword.lower() in col.lower()]
-        if potential_cols:
-            # Vérifier que ce sont des valeurs numériques
-            for col in potential_cols:
-                try:
-                    if pd.to_numeric(df[col], errors='coerce').notna().sum() > 0.8 * len(df):
-                        conso_col_guess = col
-                        break
-                except:
-                    continue
-            if conso_col_guess:
-                break
-    
-    # Si aucune correspondance par mot-clé, essayer de trouver une colonne numérique
-    if not conso_col_guess:
-        numeric_cols = [col for col in cols_to_check if 
-                        pd.api.types.is_numeric_dtype(df[col]) or 
-                        pd.to_numeric(df[col], errors='coerce').notna().sum() > 0.8 * len(df)]
-        if numeric_cols:
-            # Sélectionner la première colonne numérique non-index qui n'est pas une date
-            for col in numeric_cols:
-                if not (col.lower().startswith('id') or col.lower().startswith('index')):
-                    conso_col_guess = col
-                    break
-            if not conso_col_guess and numeric_cols:
-                conso_col_guess = numeric_cols[0]
-    
-    return date_col_guess, conso_col_guess
-
 # Fonction pour créer une info-bulle (mise à jour pour décaler les bulles à droite)
 def tooltip(text, explanation):
     return f'<span>{text} <span class="tooltip">ℹ️<span class="tooltiptext tooltip-right">{explanation}</span></span></span>'
 
-# Fonction pour évaluer la conformité IPMVP
-def evaluer_conformite(r2, cv_rmse):
-    if r2 >= 0.75 and cv_rmse <= 0.15:
-        return "Excellente", "good"
-    elif r2 >= 0.5 and cv_rmse <= 0.25:
-        return "Acceptable", "medium"
-    else:
-        return "Insuffisante", "bad"
-
 # Fonction sécurisée pour formater les valeurs numériques (ajoutée pour éviter les erreurs)
 def format_value(value, fmt=".4f", default="N/A"):
     """
@@ -786,21 +643,33 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+# Durées des étapes de l'analyse (affichées sur demande dans l'encadré "Performance")
+chronometre = Chronometre()
+
 # 📂 **Import du fichier et lancement du calcul**
 col1, col2 = st.columns([3, 1])  # Mise en page : Import à gauche, bouton à droite
 
 with col1:
-    uploaded_file = st.file_uploader("📂 Importer un fichier Excel", type=["xlsx", "xls"])
+    uploaded_file = st.file_uploader("📂 Importer un fichier de données (Excel, CSV, Parquet, Arrow)", type=list(FORMATS))
+    # Relevés de compteur à pas de temps fin, agrégés à l'import
+    donnees_fines = st.checkbox(
+        "⏱️ Relevés à pas de temps fin (15 min, horaire)",
+        value=False,
+        help="Les relevés sont lus par blocs et agrégés à l'import (consommations sommées, autres variables moyennées) : inutile de les agréger au préalable dans Excel."
+    )
+    pas_agregation = AGREGATIONS[st.radio("Agrégation", list(AGREGATIONS), format_func=str.capitalize, horizontal=True)] if donnees_fines else None
 
 with col2:
     lancer_calcul = st.button("🚀 Lancer le calcul", use_container_width=True)
     # Traitement du fichier importé
 if uploaded_file:
+    # Empreinte du fichier calculée une fois par exécution, pour la lecture et le cache des analyses
+    empreinte_fichier = empreinte_contenu(uploaded_file.getvalue())
     try:
-        df = pd.read_excel(uploaded_file)  # Chargement du fichier
-        
-        # Détecter automatiquement les colonnes de date et de consommation
-        date_col_guess, conso_col_guess = detecter_colonnes(df)
+        # Lecture et détection des colonnes, une seule fois par fichier importé (conservées dans la session)
+        df, date_col_guess, conso_col_guess = charger_fichier(uploaded_file.getvalue(), uploaded_file.name,
+                                                              empreinte_fichier, st.session_state,
+                                                              chronometre, pas_agregation)
         
         # Informer l'utilisateur des colonnes détectées automatiquement
         if date_col_guess and conso_col_guess:
@@ -812,7 +681,7 @@ if uploaded_file:
         else:
             st.warning("⚠️ Impossible de détecter automatiquement les colonnes date et consommation. Veuillez les sélectionner manuellement.")
     except Exception as e:
-        st.error(f"❌ Erreur lors du chargement du fichier Excel : {str(e)}")
+        st.error(f"❌ Erreur lors du chargement du fichier : {str(e)}")
         df = None
         date_col_guess = None
         conso_col_guess = None
@@ -898,24 +767,40 @@ selected_vars = st.sidebar.multiselect("📊 Variables explicatives", var_option
 # Type de modèle à utiliser
 model_type = st.sidebar.selectbox(
     "🧮 Type de modèle de régression",
-    ["Automatique (meilleur modèle)", "Linéaire", "Ridge", "Lasso", "Polynomiale"],
+    ["Automatique (meilleur modèle)", "Linéaire", "Ridge", "Lasso", "Polynomiale", "Points de rupture"],
     index=0,
     help="Sélectionnez 'Automatique' pour tester tous les types de modèles et choisir le meilleur, ou sélectionnez un type spécifique"
 )
 
 # Paramètres spécifiques aux modèles
 if model_type == "Ridge":
-    alpha_ridge = st.sidebar.slider(
-        "Alpha (régularisation Ridge)", 
-        0.01, 10.0, 1.0, 0.01,
-        help="Le paramètre alpha contrôle l'intensité de la régularisation. Une valeur plus élevée réduit davantage les coefficients pour éviter le surapprentissage."
+    ridge_auto = st.sidebar.checkbox(
+        "Alpha optimal automatique (GCV)",
+        value=True,
+        help="Calcule le chemin Ridge complet pour une grille d'alphas à partir d'une seule décomposition SVD des variables standardisées, et retient l'alpha qui minimise le critère de validation croisée généralisée (GCV). Cet alpha s'applique aux variables standardisées : il n'est pas sur la même échelle que l'alpha du curseur manuel."
     )
+    if ridge_auto:
+        alpha_ridge = None
+    else:
+        alpha_ridge = st.sidebar.slider(
+            "Alpha (régularisation Ridge)", 
+            0.01, 10.0, 1.0, 0.01,
+            help="Le paramètre alpha contrôle l'intensité de la régularisation. Une valeur plus élevée réduit davantage les coefficients pour éviter le surapprentissage."
+        )
 elif model_type == "Lasso":
-    alpha_lasso = st.sidebar.slider(
-        "Alpha (régularisation Lasso)", 
-        0.01, 1.0, 0.1, 0.01,
-        help="Le paramètre alpha contrôle l'intensité de la régularisation. Lasso peut réduire certains coefficients à zéro, effectuant ainsi une sélection de variables."
+    lasso_chemin = st.sidebar.checkbox(
+        "Chemin Lasso (alpha automatique)",
+        value=True,
+        help="Calcule une seule fois par période le chemin Lasso complet sur toutes les variables sélectionnées (descente de coordonnées à démarrage à chaud sur une grille d'alphas). Chaque ensemble de variables actives rencontré sur le chemin est ensuite évalué selon les critères IPMVP."
     )
+    if lasso_chemin:
+        alpha_lasso = None
+    else:
+        alpha_lasso = st.sidebar.slider(
+            "Alpha (régularisation Lasso)", 
+            0.01, 1.0, 0.1, 0.01,
+            help="Le paramètre alpha contrôle l'intensité de la régularisation. Lasso peut réduire certains coefficients à zéro, effectuant ainsi une sélection de variables."
+        )
 elif model_type == "Polynomiale":
     poly_degree = st.sidebar.slider(
         "Degré du polynôme", 
@@ -926,6 +811,34 @@ elif model_type == "Polynomiale":
 # Nombre de variables à tester
 max_features = st.sidebar.slider("🔢 Nombre de variables à tester", 1, 4, 2)
 
+# Recherche par séparation et évaluation (branch-and-bound)
+recherche_bb = st.sidebar.checkbox(
+    "🌳 Recherche branch-and-bound",
+    value=False,
+    help="Ne teste que le meilleur sous-ensemble de variables de chaque taille (au sens de la régression linéaire), en élaguant les combinaisons qui ne peuvent pas l'améliorer. Recommandé lorsque de nombreuses variables explicatives sont sélectionnées."
+)
+
+# Calcul parallèle sur plusieurs processus
+calcul_parallele = st.sidebar.checkbox(
+    "⚡ Calcul parallèle (multi-cœurs)",
+    value=False,
+    help="Répartit l'évaluation des périodes, combinaisons de variables et types de modèles sur tous les cœurs du serveur. Utile pour les longues historiques et les nombreuses variables."
+)
+
+# Reprise des analyses déjà effectuées (même fichier, mêmes paramètres)
+reutiliser_analyses = st.sidebar.checkbox(
+    "♻️ Réutiliser les analyses précédentes",
+    value=True,
+    help="Une analyse déjà effectuée avec le même fichier et les mêmes paramètres est reprise instantanément depuis le cache sur disque. Décochez pour forcer un nouveau calcul."
+)
+
+# Mesure des durées de chaque étape de l'analyse
+mesures_performance = st.sidebar.checkbox(
+    "⏱️ Mesures de performance",
+    value=False,
+    help="Mesure la durée et le nombre d'appels de chaque étape (lecture du fichier, fenêtres glissantes, ajustement des modèles, valeurs t, graphiques...) et les affiche dans un encadré, avec un export JSON. Les mesures sont aussi écrites dans les journaux du serveur."
+)
+
 st.sidebar.markdown("---")
 
 # Ajouter les contrôles d'administration et de profil dans la barre latérale
@@ -986,6 +899,7 @@ st.sidebar.markdown(f"""
 - {tooltip("Régression Ridge", "Technique de régularisation qui réduit le risque de surapprentissage en pénalisant les coefficients élevés. Conforme à l'IPMVP tant que les critères de qualité statistique (R², CV) sont respectés et que le modèle reste documentable.")}
 - {tooltip("Régression Lasso", "Méthode qui peut réduire certains coefficients à zéro, effectuant ainsi une sélection de variables. Conforme à l'IPMVP car elle simplifie le modèle tout en maintenant sa précision statistique.")}
 - {tooltip("Régression polynomiale", "Permet de modéliser des relations non linéaires. L'IPMVP accepte les modèles non linéaires si les relations physiques sont plausibles et si les critères statistiques sont respectés.")}
+- {tooltip("Points de rupture (3P, 4P, 5P)", "Modèles ASHRAE Guideline 14 sur une variable (température, DJU...) : consommation constante jusqu'à une température de rupture, puis linéaire en chauffage (3P chauffage), en climatisation (3P climatisation) ou des deux côtés (4P, 5P avec une zone neutre). Les températures de rupture sont recherchées automatiquement.")}
 """, unsafe_allow_html=True)
 
 # Pied de page amélioré
@@ -1000,8 +914,13 @@ st.markdown("""
 if df is not None and lancer_calcul:
     st.subheader("⚙️ Analyse en cours...")
     
-    # Initialiser la liste all_models ici pour s'assurer qu'elle existe toujours
-    all_models = []
+    # Types de modèles évalués par le moteur de recherche
+    types_modeles = types_modeles_a_tester(
+        model_type,
+        alpha_ridge=alpha_ridge if model_type == "Ridge" else None,
+        alpha_lasso=alpha_lasso if model_type == "Lasso" else None,
+        poly_degree=poly_degree if model_type == "Polynomiale" else 2
+    )
     
     # Convertir la colonne de date si elle ne l'est pas déjà
     if not pd.api.types.is_datetime64_any_dtype(df[date_col]):
@@ -1013,253 +932,72 @@ if df is not None and lancer_calcul:
             st.error("❌ La colonne de date n'a pas pu être convertie. Assurez-vous qu'elle contient des dates valides.")
             st.stop()
     
+    progress_bar = st.progress(0)
+    progress_text = st.empty()
+    
+    def afficher_progression(fraction, message):
+        """Relaie l'avancement du moteur de recherche dans l'interface"""
+        progress_bar.progress(min(fraction, 1.0))
+        if message:
+            progress_text.text(message)
+    
+    # Analyses indexées par le contenu du fichier et la configuration complète de l'analyse
+    cache_analyses = CacheAnalyses()
+    cle = cle_analyse(empreinte_fichier, {
+        'colonne_date': date_col,
+        'colonne_conso': conso_col,
+        'agregation': pas_agregation,
+        'variables': selected_vars,
+        'periode': "auto" if period_choice == "Rechercher automatiquement la meilleure période de 12 mois" else [start_date, end_date],
+        'types_modeles': types_modeles,
+        'max_features': max_features,
+        'recherche_bb': recherche_bb
+    })
+    
+    def rechercher(X, y, **periodes):
+        """Recherche par le moteur, ou reprise d'une analyse identique déjà stockée"""
+        if reutiliser_analyses:
+            recherche = cache_analyses.lire(cle)
+            if recherche is not None:
+                st.info("♻️ Résultats repris d'une analyse identique déjà effectuée (même fichier, mêmes paramètres).")
+                return recherche
+        recherche = rechercher_modeles(
+            X, y, types_modeles, max_features,
+            recherche_bb=recherche_bb, parallele=calcul_parallele, progression=afficher_progression,
+            chronometre=chronometre if mesures_performance else None, **periodes
+        )
+        cache_analyses.ecrire(cle, recherche)
+        return recherche
+    
     # Option 1: Recherche automatique de la meilleure période
     if period_choice == "Rechercher automatiquement la meilleure période de 12 mois":
         # Vérifier s'il y a suffisamment de données (au moins 12 mois)
-        date_ranges = []
-        min_date = df[date_col].min()
-        max_date = df[date_col].max()
-        current_date = min_date
-        
-        while current_date + pd.DateOffset(months=11) <= max_date:
-            end_date = current_date + pd.DateOffset(months=11)
-            period_name = f"{current_date.strftime('%b %Y')} - {end_date.strftime('%b %Y')}"
-            date_ranges.append((period_name, current_date, end_date))
-            current_date = current_date + pd.DateOffset(months=1)
+        df = df.sort_values(by=date_col)
+        date_ranges = periodes_glissantes(df[date_col], mois=12)
         
         if not date_ranges:
             st.error("❌ Pas assez de données pour une analyse sur 12 mois. Assurez-vous d'avoir au moins 12 mois de données.")
             st.stop()
-            
-        progress_bar = st.progress(0)
-        progress_text = st.empty()
         
-        best_period_data = None
-        best_period_model = None
-        best_period_features = None
-        best_period_metrics = None
-        best_period_r2 = -1
+        # Données triées et converties une seule fois : les produits croisés de chaque fenêtre
+        # sont ensuite mis à jour par le moteur en ajoutant le mois entrant et en retirant le mois sortant
+        with chronometre.etape("préparation des données"):
+            X_complet = df[selected_vars].apply(pd.to_numeric, errors='coerce') if selected_vars else pd.DataFrame(index=df.index)
+            y_complet = pd.to_numeric(df[conso_col], errors='coerce')
         
-        for idx, (period_name, period_start, period_end) in enumerate(date_ranges):
-            progress_text.text(f"Analyse de la période {period_name} ({idx+1}/{len(date_ranges)})")
-            
-            # Filtrer les données pour cette période
-            period_df = df[(df[date_col] >= period_start) & (df[date_col] <= period_end)]
-            
-            # Vérifier que les données sont suffisantes
-            if len(period_df) < 10:  # Éviter les périodes avec trop peu de données
-                continue
-                
-            X = period_df[selected_vars] if selected_vars else pd.DataFrame(index=period_df.index)
-            y = period_df[conso_col]
-            
-            # Nettoyage des données avant entraînement
-            if X.isnull().values.any() or np.isinf(X.values).any():
-                continue
-                
-            if y.isnull().values.any() or np.isinf(y.values).any():
-                continue
-                
-            X = X.apply(pd.to_numeric, errors='coerce').dropna()
-            y = pd.to_numeric(y, errors='coerce').dropna()
-            
-            # Test des combinaisons de variables
-            for n in range(1, max_features + 1):
-                for combo in combinations(selected_vars, n):
-                    X_subset = X[list(combo)]
-                    
-                    try:
-                        # Si mode automatique, tester tous les types de modèles
-                        if model_type == "Automatique (meilleur modèle)":
-                            # Tester chaque type de modèle
-                            model_types_to_test = [
-                                ("Linéaire", LinearRegression(), "Régression linéaire"),
-                                ("Ridge", Ridge(alpha=1.0), f"Régression Ridge (α=1.0)"),
-                                ("Lasso", Lasso(alpha=0.1), f"Régression Lasso (α=0.1)"),
-                                ("Polynomiale", Pipeline([
-                                    ('poly', PolynomialFeatures(degree=2)),
-                                    ('linear', LinearRegression())
-                                ]), f"Régression polynomiale (degré 2)")
-                            ]
-                            
-                            for m_type, m_obj, m_name in model_types_to_test:
-                                try:
-                                    m_obj.fit(X_subset, y)
-                                    y_pred = m_obj.predict(X_subset)
-                                    r2 = r2_score(y, y_pred)
-                                    
-                                    # Calcul des métriques
-                                   # RMSE corrigé selon IPMVP 
-                                    n = len(y) 
-                                    p = len(combo) 
-                                    ssr = np.sum((y - y_pred) ** 2) 
-                                    df_res = n - p - 1 if (n - p - 1) > 0 else 1 
-                                    rmse = math.sqrt(ssr / df_res)
-                                    mae = mean_absolute_error(y, y_pred)
-                                    cv_rmse = rmse / np.mean(y) if np.mean(y) != 0 else float('inf')
-                                    bias = np.mean(y_pred - y) / np.mean(y) * 100
-                                    
-                                    # Récupération des coefficients selon le type de modèle
-                                    if m_type == "Linéaire":
-                                        coefs = {feature: coef for feature, coef in zip(combo, m_obj.coef_)}
-                                        intercept = m_obj.intercept_
-                                    elif m_type in ["Ridge", "Lasso"]:
-                                        coefs = {feature: coef for feature, coef in zip(combo, m_obj.coef_)}
-                                        intercept = m_obj.intercept_
-                                    elif m_type == "Polynomiale":
-                                        # Pour le modèle polynomial, nous gardons une représentation simplifiée
-                                        linear_model = m_obj.named_steps['linear']
-                                        poly = m_obj.named_steps['poly']
-                                        feature_names = poly.get_feature_names_out(input_features=combo)
-                                        coefs = {name: coef for name, coef in zip(feature_names, linear_model.coef_)}
-                                        intercept = linear_model.intercept_
-                                    
-                                    # Calcul des valeurs t de Student
-                                    t_stats = calculate_t_stats(X_subset, y, m_obj, coefs) if m_type in ["Linéaire", "Ridge", "Lasso"] else {feature: None for feature in combo}
-                                    
-                                    # Statut de conformité IPMVP
-                                    conformite, classe = evaluer_conformite(r2, cv_rmse)
-                                    
-                                    # Ajouter le modèle à la liste de tous les modèles testés
-                                    model_info = {
-                                        'features': list(combo),
-                                        'r2': r2,
-                                        'rmse': rmse,
-                                        'cv_rmse': cv_rmse,
-                                        'mae': mae,
-                                        'bias': bias,
-                                        'coefficients': coefs,
-                                        'intercept': intercept,
-                                        'conformite': conformite,
-                                        'classe': classe,
-                                        'model_type': m_type,
-                                        'model_name': m_name,
-                                        'period': period_name,
-                                        't_stats': t_stats
-                                    }
-                                    all_models.append(model_info)
-                                    
-                                    # Mettre à jour le meilleur modèle si nécessaire
-                                    if r2 > best_period_r2:
-                                        best_period_r2 = r2
-                                        best_period_start = period_start
-                                        best_period_end = period_end
-                                        best_period_name = period_name
-                                        best_period_data = period_df
-                                        best_period_model = m_obj
-                                        best_period_features = list(combo)
-                                        
-                                        # Stockage des métriques du meilleur modèle
-                                        best_period_metrics = model_info
-                                except Exception as e:
-                                    # Gestion des erreurs
-                                    continue
-                        else:
-                            # Création du modèle selon le type sélectionné
-                            if model_type == "Linéaire":
-                                model = LinearRegression()
-                                model_name = "Régression linéaire"
-                            elif model_type == "Ridge":
-                                model = Ridge(alpha=alpha_ridge)
-                                model_name = f"Régression Ridge (α={alpha_ridge})"
-                            elif model_type == "Lasso":
-                                model = Lasso(alpha=alpha_lasso)
-                                model_name = f"Régression Lasso (α={alpha_lasso})"
-                            elif model_type == "Polynomiale":
-                                model = Pipeline([
-                                    ('poly', PolynomialFeatures(degree=poly_degree)),
-                                    ('linear', LinearRegression())
-                                ])
-                                model_name = f"Régression polynomiale (degré {poly_degree})"
-                            
-                            model.fit(X_subset, y)
-                            
-                            # Prédictions selon le type de modèle
-                            y_pred = model.predict(X_subset)
-                            r2 = r2_score(y, y_pred)
-                            
-                            # Calcul des métriques
-                           # RMSE corrigé selon IPMVP 
-                            n = len(y) 
-                            p = len(combo) 
-                            ssr = np.sum((y - y_pred) ** 2) 
-                            df_res = n - p - 1 if (n - p - 1) > 0 else 1 
-                            rmse = math.sqrt(ssr / df_res)
-                            mae = mean_absolute_error(y, y_pred)
-                            cv_rmse = rmse / np.mean(y) if np.mean(y) != 0 else float('inf')
-                            bias = np.mean(y_pred - y) / np.mean(y) * 100
-                            
-                            # Récupération des coefficients selon le type de modèle
-                            if model_type == "Linéaire":
-                                coefs = {feature: coef for feature, coef in zip(combo, model.coef_)}
-                                intercept = model.intercept_
-                            elif model_type in ["Ridge", "Lasso"]:
-                                coefs = {feature: coef for feature, coef in zip(combo, model.coef_)}
-                                intercept = model.intercept_
-                            elif model_type == "Polynomiale":
-                                # Pour le modèle polynomial, nous gardons une représentation simplifiée
-                                linear_model = model.named_steps['linear']
-                                poly = model.named_steps['poly']
-                                feature_names = poly.get_feature_names_out(input_features=combo)
-                                coefs = {name: coef for name, coef in zip(feature_names, linear_model.coef_)}
-                                intercept = linear_model.intercept_
-                            
-                            # Calcul des valeurs t de Student
-                            t_stats = calculate_t_stats(X_subset, y, model, coefs) if model_type in ["Linéaire", "Ridge", "Lasso"] else {feature: None for feature in combo}
-                            
-                            # Statut de conformité IPMVP
-                            conformite, classe = evaluer_conformite(r2, cv_rmse)
-                            
-                            # Ajouter le modèle à la liste de tous les modèles testés
-                            model_info = {
-                                'features': list(combo),
-                                'r2': r2,
-                                'rmse': rmse,
-                                'cv_rmse': cv_rmse,
-                                'mae': mae,
-                                'bias': bias,
-                                'coefficients': coefs,
-                                'intercept': intercept,
-                                'conformite': conformite,
-                                'classe': classe,
-                                'model_type': model_type,
-                                'model_name': model_name,
-                                'period': period_name,
-                                't_stats': t_stats
-                            }
-                            all_models.append(model_info)
-                            
-                            # Mettre à jour le meilleur modèle si nécessaire
-                            if r2 > best_period_r2:
-                                best_period_r2 = r2
-                                best_period_start = period_start
-                                best_period_end = period_end
-                                best_period_name = period_name
-                                best_period_data = period_df
-                                best_period_model = model
-                                best_period_features = list(combo)
-                                
-                                # Stockage des métriques du meilleur modèle
-                                best_period_metrics = model_info
-                    except Exception as e:
-                        # st.warning(f"Erreur lors de l'analyse d'une combinaison : {str(e)}")
-                        continue
-            
-            # Mise à jour de la barre de progression
-            progress_bar.progress((idx + 1) / len(date_ranges))
+        recherche = rechercher(X_complet, y_complet, dates=df[date_col], periodes=date_ranges)
         
         progress_bar.empty()
         progress_text.empty()
         
-        if best_period_data is not None:
-            st.success(f"✅ Meilleure période trouvée : {best_period_name}")
-            st.info(f"Période : {best_period_start.strftime('%d/%m/%Y')} - {best_period_end.strftime('%d/%m/%Y')}")
+        meilleur = recherche['meilleur']
+        if meilleur is not None:
+            st.success(f"✅ Meilleure période trouvée : {meilleur['period']}")
+            st.info(f"Période : {meilleur['debut'].strftime('%d/%m/%Y')} - {meilleur['fin'].strftime('%d/%m/%Y')}")
             
             # Utiliser les meilleurs résultats trouvés
-            df_filtered = best_period_data
-            best_model = best_period_model
-            best_features = best_period_features
-            best_metrics = best_period_metrics
+            df_filtered = df.iloc[meilleur['lo']:meilleur['hi']]
+            y = y_complet.loc[df_filtered.index]
             
             # Afficher les détails sur les données
             st.markdown(f"**📊 Nombre de points de données :** {len(df_filtered)}")
@@ -1293,184 +1031,26 @@ if df is not None and lancer_calcul:
 
         X = X.apply(pd.to_numeric, errors='coerce').dropna()
         y = pd.to_numeric(y, errors='coerce').dropna()
-
-        best_model = None
-        best_r2 = -1
-        best_features = []
-        best_metrics = {}
-
-        # 🔹 Test des combinaisons de variables (de 1 à max_features)
-        for n in range(1, max_features + 1):
-            for combo in combinations(selected_vars, n):
-                X_subset = X[list(combo)]
-                
-                # Si mode automatique, tester tous les types de modèles
-                if model_type == "Automatique (meilleur modèle)":
-                    # Tester chaque type de modèle
-                    model_types_to_test = [
-                        ("Linéaire", LinearRegression(), "Régression linéaire"),
-                        ("Ridge", Ridge(alpha=1.0), f"Régression Ridge (α=1.0)"),
-                        ("Lasso", Lasso(alpha=0.1), f"Régression Lasso (α=0.1)"),
-                        ("Polynomiale", Pipeline([
-                            ('poly', PolynomialFeatures(degree=2)),
-                            ('linear', LinearRegression())
-                        ]), f"Régression polynomiale (degré 2)")
-                    ]
-                    
-                    for m_type, m_obj, m_name in model_types_to_test:
-                        try:
-                            m_obj.fit(X_subset, y)
-                            y_pred = m_obj.predict(X_subset)
-                            
-                            # Calcul des métriques
-                            r2 = r2_score(y, y_pred)
-                           # RMSE corrigé selon IPMVP 
-                            n = len(y) 
-                            p = len(combo) 
-                            ssr = np.sum((y - y_pred) ** 2) 
-                            df_res = n - p - 1 if (n - p - 1) > 0 else 1 
-                            rmse = math.sqrt(ssr / df_res)
-                            mae = mean_absolute_error(y, y_pred)
-                            cv_rmse = rmse / np.mean(y) if np.mean(y) != 0 else float('inf')
-                            bias = np.mean(y_pred - y) / np.mean(y) * 100
-                            
-                            # Récupération des coefficients selon le type de modèle
-                            if m_type == "Linéaire":
-                                coefs = {feature: coef for feature, coef in zip(combo, m_obj.coef_)}
-                                intercept = m_obj.intercept_
-                            elif m_type in ["Ridge", "Lasso"]:
-                                coefs = {feature: coef for feature, coef in zip(combo, m_obj.coef_)}
-                                intercept = m_obj.intercept_
-                            elif m_type == "Polynomiale":
-                                # Pour le modèle polynomial, nous prenons une représentation simplifiée
-                                linear_model = m_obj.named_steps['linear']
-                                poly = m_obj.named_steps['poly']
-                                feature_names = poly.get_feature_names_out(input_features=combo)
-                                coefs = {name: coef for name, coef in zip(feature_names, linear_model.coef_)}
-                                intercept = linear_model.intercept_
-                            
-                            # Calcul des valeurs t de Student
-                            t_stats = calculate_t_stats(X_subset, y, m_obj, coefs) if m_type in ["Linéaire", "Ridge", "Lasso"] else {feature: None for feature in combo}
-                            
-                            # Statut de conformité IPMVP
-                            conformite, classe = evaluer_conformite(r2, cv_rmse)
-                            
-                            # Création du modèle et ajout à la liste
-                            model_info = {
-                                'features': list(combo),
-                                'r2': r2,
-                                'rmse': rmse,
-                                'cv_rmse': cv_rmse,
-                                'mae': mae,
-                                'bias': bias,
-                                'coefficients': coefs,
-                                'intercept': intercept,
-                                'conformite': conformite,
-                                'classe': classe,
-                                'model_type': m_type,
-                                'model_name': m_name,
-                                'period': 'selected',
-                                't_stats': t_stats
-                            }
-                            all_models.append(model_info)
-                            
-                            # Mettre à jour le meilleur modèle si nécessaire
-                            if r2 > best_r2:
-                                best_r2 = r2
-                                best_model = m_obj
-                                best_features = list(combo)
-                                best_metrics = model_info
-                        except Exception as e:
-                            # st.warning(f"Erreur lors de l'analyse : {str(e)}")
-                            continue
-                else:
-                    # Création du modèle selon le type sélectionné
-                    try:
-                        if model_type == "Linéaire":
-                            model = LinearRegression()
-                            model_name = "Régression linéaire"
-                        elif model_type == "Ridge":
-                            model = Ridge(alpha=alpha_ridge)
-                            model_name = f"Régression Ridge (α={alpha_ridge})"
-                        elif model_type == "Lasso":
-                            model = Lasso(alpha=alpha_lasso)
-                            model_name = f"Régression Lasso (α={alpha_lasso})"
-                        elif model_type == "Polynomiale":
-                            model = Pipeline([
-                                ('poly', PolynomialFeatures(degree=poly_degree)),
-                                ('linear', LinearRegression())
-                            ])
-                            model_name = f"Régression polynomiale (degré {poly_degree})"
-                        
-                        model.fit(X_subset, y)
-                        
-                        # Prédictions selon le type de modèle
-                        y_pred = model.predict(X_subset)
-                        
-                        # Calcul des métriques
-                        r2 = r2_score(y, y_pred)
-                       # RMSE corrigé selon IPMVP
-                        n = len(y) 
-                        p = len(combo) 
-                        ssr = np.sum((y - y_pred) ** 2) 
-                        df_res = n - p - 1 if (n - p - 1) > 0 else 1 
-                        rmse = math.sqrt(ssr / df_res)
-                        mae = mean_absolute_error(y, y_pred)
-                        cv_rmse = rmse / np.mean(y) if np.mean(y) != 0 else float('inf')
-                        bias = np.mean(y_pred - y) / np.mean(y) * 100
-                        
-                        # Récupération des coefficients selon le type de modèle
-                        if model_type == "Linéaire":
-                            coefs = {feature: coef for feature, coef in zip(combo, model.coef_)}
-                            intercept = model.intercept_
-                        elif model_type in ["Ridge", "Lasso"]:
-                            coefs = {feature: coef for feature, coef in zip(combo, model.coef_)}
-                            intercept = model.intercept_
-                        elif model_type == "Polynomiale":
-                            # Pour le modèle polynomial, nous gardons une représentation simplifiée
-                            linear_model = model.named_steps['linear']
-                            poly = model.named_steps['poly']
-                            feature_names = poly.get_feature_names_out(input_features=combo)
-                            coefs = {name: coef for name, coef in zip(feature_names, linear_model.coef_)}
-                            intercept = linear_model.intercept_
-                        
-                        # Calcul des valeurs t de Student
-                        t_stats = calculate_t_stats(X_subset, y, model, coefs) if model_type in ["Linéaire", "Ridge", "Lasso"] else {feature: None for feature in combo}
-                        
-                        # Statut de conformité IPMVP
-                        conformite, classe = evaluer_conformite(r2, cv_rmse)
-                        
-                        # Création du modèle et ajout à la liste
-                        model_info = {
-                            'features': list(combo),
-                            'r2': r2,
-                            'rmse': rmse,
-                            'cv_rmse': cv_rmse,
-                            'mae': mae,
-                            'bias': bias,
-                            'coefficients': coefs,
-                            'intercept': intercept,
-                            'conformite': conformite,
-                            'classe': classe,
-                            'model_type': model_type,
-                            'model_name': model_name,
-                            'period': 'selected',
-                            't_stats': t_stats
-                        }
-                        all_models.append(model_info)
-                        
-                        # Mettre à jour le meilleur modèle si nécessaire
-                        if r2 > best_r2:
-                            best_r2 = r2
-                            best_model = model
-                            best_features = list(combo)
-                            best_metrics = model_info
-                    except Exception as e:
-                        # st.warning(f"Erreur lors de l'analyse : {str(e)}")
-                        continue
-
-    # 🔹 Tri des modèles par R² décroissant
-    all_models.sort(key=lambda x: x['r2'], reverse=True)
+        
+        # Toutes les lignes de la période sélectionnée forment une seule fenêtre
+        recherche = rechercher(X, y)
+        
+        progress_bar.empty()
+        progress_text.empty()
+        
+        meilleur = recherche['meilleur']
+    
+    # Classement borné des modèles testés (seuls les 15 meilleurs sont affichés)
+    classement = recherche['classement']
+    
+    # Statistiques de la recherche branch-and-bound (cumulées sur les périodes)
+    stats_bb = recherche['stats_bb']
+    
+    best_model = meilleur['model'] if meilleur is not None else None
+    best_features = meilleur['model_info']['features'] if meilleur is not None else []
+    best_metrics = meilleur['model_info'] if meilleur is not None else {}
+    if recherche_bb and stats_bb['total']:
+        st.info(f"🌳 Branch-and-bound : {stats_bb['elagues']} combinaisons élaguées sur {stats_bb['total']} (le meilleur sous-ensemble de chaque taille reste garanti)")
 
     # 🔹 Résultats du modèle sélectionné
     if best_model:
@@ -1484,6 +1064,7 @@ if df is not None and lancer_calcul:
             st.markdown(f"""
             <div class="metrics-card">
                 <h4>Modèle sélectionné: <span class="model-badge">{best_metrics['model_name']}</span></h4>
+                {f"<p>Alpha retenu (variables standardisées): {best_model.alpha_:.4g}</p>" if hasattr(best_model, 'alpha_') else ""}
                 <p>Variables utilisées: {', '.join(best_features)}</p>
                 <p>Conformité IPMVP: <span class="conformity-{best_metrics['classe']}">{best_metrics['conformite']}</span></p>
             </div>
@@ -1492,7 +1073,7 @@ if df is not None and lancer_calcul:
             # Créer l'équation adaptée selon le type de modèle en utilisant la nouvelle fonction
             if best_metrics['model_type'] in ["Linéaire", "Ridge", "Lasso"]:
                 equation = format_equation(best_metrics['intercept'], {feature: best_metrics['coefficients'][feature] for feature in best_features})
-            elif best_metrics['model_type'] == "Polynomiale":
+            elif best_metrics['model_type'] in ["Polynomiale", "Point de rupture"]:
                 equation = format_equation(best_metrics['intercept'], best_metrics['coefficients'])
             
             st.markdown(f"""
@@ -1610,6 +1191,7 @@ if df is not None and lancer_calcul:
         
         # 🔹 Graphique de consommation
         st.subheader("📈 Visualisation des résultats")
+        debut_graphiques = time.perf_counter()
         
         # Prédictions du modèle
         X_best = df_filtered[best_features]
@@ -1683,6 +1265,7 @@ if df is not None and lancer_calcul:
                         fontsize=12, fontweight='bold', color='#00485F',
                         bbox=dict(boxstyle="round,pad=0.3", facecolor="#E7DDD9", edgecolor="#00485F", alpha=0.8))
             st.pyplot(fig3)
+        chronometre.ajouter("graphiques", time.perf_counter() - debut_graphiques)
         
         # Ajout d'un expander pour expliquer les différents modèles de régression
         with st.expander("📚 Interprétation des différents modèles de régression"):
@@ -1716,6 +1299,14 @@ if df is not None and lancer_calcul:
             - Forces : Peut capturer des relations non linéaires
             - Limites : Risque élevé de surapprentissage, interprétation plus complexe
             - Statut IPMVP : Acceptable si les relations physiques sont plausibles et documentées
+            
+            **Modèles à points de rupture (3P, 4P, 5P)**
+            - Modèles ASHRAE Guideline 14 sur une seule variable (température extérieure, DJU...)
+            - 3P chauffage : Y = c + a × max(0, Tc - T) ; 3P climatisation : Y = c + b × max(0, T - Tc)
+            - 4P : Y = c + a × max(0, Tc - T) + b × max(0, T - Tc) ; 5P : deux températures de rupture Tc1 < Tc2 encadrant une zone neutre
+            - Forces : Représentent directement la consommation de base et les besoins de chauffage ou de climatisation
+            - Limites : Une seule variable explicative ; au moins quelques observations de part et d'autre de chaque rupture
+            - Statut IPMVP : Modèles de référence de l'ASHRAE Guideline 14, acceptables si les critères statistiques sont respectés
             """)
             
             st.info("""
@@ -1783,63 +1374,45 @@ if df is not None and lancer_calcul:
         # 🔹 Tableau des résultats pour tous les modèles testés
         st.subheader("📋 Classement des modèles testés")
         
-        # Assurer que la liste all_models est unique par modèle et variables
-        # C'est-à-dire qu'il n'y a pas de doublons du même modèle avec les mêmes variables
-        seen = set()
-        unique_models = []
-        for model in all_models:
-            key = (model['model_name'], tuple(sorted(model['features'])))
-            if key not in seen:
-                seen.add(key)
-                unique_models.append(model)
+        # Modèles retenus rangés en colonnes : dédoublonnés par modèle et variables, triés par R²
+        # décroissant, avec les statistiques t agrégées de façon vectorisée
+        resultats = classement.resultats(selected_vars).dataframe(15)
         
-        # Vérifier que unique_models existe et n'est pas vide
-        if unique_models:
-            # Trier par R² décroissant
-            unique_models.sort(key=lambda x: x['r2'], reverse=True)
+        # Vérifier que des modèles ont été retenus
+        if len(resultats):
+            models_summary = pd.DataFrame({
+                "Rang": np.arange(1, len(resultats) + 1),
+                "Type": resultats['model_name'],
+                "Variables": resultats['variables'],
+                "R²": resultats['r2'].map("{:.4f}".format),
+                "CV(RMSE)": resultats['cv_rmse'].map("{:.4f}".format),
+                "Biais (%)": resultats['bias'].map("{:.2f}".format),
+                "Conformité": resultats['conformite']
+            })
             
-            models_summary = []
+            # Ajouter la valeur t moyenne (valeur absolue) et le pourcentage de variables significatives
+            avec_t = resultats['nb_t'] > 0
+            if avec_t.any():
+                models_summary["t moyen"] = resultats['t_moyen'].map("{:.2f}".format).where(avec_t)
+                models_summary["% Var. signif."] = (resultats['part_significatives'] * 100).map("{:.0f}%".format).where(avec_t)
             
-            # Afficher jusqu'à 15 modèles pour donner une vue plus complète
-            for i, model in enumerate(unique_models[:min(15, len(unique_models))]):
-                model_info = {
-                    "Rang": i+1,
-                    "Type": model['model_name'],
-                    "Variables": ", ".join(model['features']),
-                    "R²": f"{model['r2']:.4f}",
-                    "CV(RMSE)": f"{model['cv_rmse']:.4f}",
-                    "Biais (%)": f"{model['bias']:.2f}",
-                    "Conformité": model['conformite']
-                }
-                
-                # Ajouter les valeurs t si disponibles
-                if 't_stats' in model and model['model_type'] in ["Linéaire", "Ridge", "Lasso"]:
-                    # Calculer la valeur t moyenne (valeur absolue) pour ce modèle
-                    t_values = []
-                    for feature in model['features']:
-                        if (feature in model['t_stats'] and model['t_stats'][feature] is not None):
-                            t_val = None
-                            if isinstance(model['t_stats'][feature], dict) and 't_value' in model['t_stats'][feature]:
-                                t_val = model['t_stats'][feature]['t_value']
-                            elif not isinstance(model['t_stats'][feature], dict):
-                                t_val = model['t_stats'][feature]
-                                
-                            if t_val is not None and (isinstance(t_val, float) or isinstance(t_val, int)):
-                                t_values.append(abs(t_val))
-                                
-                    if t_values:
-                        avg_t = sum(t_values) / len(t_values)
-                        model_info["t moyen"] = f"{avg_t:.2f}"
-                        
-                        # Calculer le pourcentage de variables significatives
-                        sig_count = sum(1 for t in t_values if t > 2)
-                        sig_pct = sig_count / len(t_values) * 100
-                        model_info["% Var. signif."] = f"{sig_pct:.0f}%"
-                
-                models_summary.append(model_info)
-            
-            st.table(pd.DataFrame(models_summary))
+            st.table(models_summary)
         else:
             st.info("Aucun modèle alternatif disponible pour comparaison.")
     else:
         st.error("⚠️ Aucun modèle valide n'a été trouvé.")
+
+    # ⏱️ Durées des étapes de l'analyse
+    if mesures_performance:
+        contexte = {'fichier': uploaded_file.name, 'lignes': len(df), 'variables': selected_vars,
+                    'type_modele': model_type, 'max_features': max_features, 'parallele': calcul_parallele}
+        chronometre.journaliser(**contexte)
+        with st.expander("⏱️ Performance", expanded=True):
+            st.caption("En calcul parallèle, les durées des étapes exécutées dans les processus de calcul sont cumulées sur tous les processus.")
+            st.dataframe(chronometre.dataframe(), use_container_width=True)
+            st.download_button(
+                label="📥 Exporter les mesures (JSON)",
+                data=chronometre.to_json(**contexte),
+                file_name="performance_ipmvp.json",
+                mime="application/json"
+            )
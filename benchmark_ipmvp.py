@@ -0,0 +1,269 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from itertools import combinations
+from math import comb
+
+import numpy as np
+import pandas as pd
+
+from degres_jours import degres_jours_mensuels
+from lot_ipmvp import TYPES_MODELES
+from moteur_ipmvp import calculate_t_stats, periodes_glissantes, rechercher_modeles, types_modeles_a_tester
+
+# Banc d'essai des chemins critiques de la recherche de modèles, sur données synthétiques.
+# Chaque mesure est ajoutée au fichier de résultats avec le commit courant, et comparée à la
+# dernière mesure de la même configuration pour rendre visibles les régressions. Exemple :
+#   python benchmark_ipmvp.py --mois 36 --variables 8 --max-features 3 --modeles auto lineaire
+
+CAS = ('recherche', 'trouver_meilleur_modele', 'evaluer_combinaison', 'calculate_t_stats', 'degres_jours')
+
+
+def donnees_synthetiques(mois, nb_variables, frequence='D', graine=0):
+    """
+    Jeu de données de consommation synthétique : variables explicatives saisonnières et
+    bruitées, consommation linéaire en les deux premières variables.
+
+    Parameters:
+    mois (int): Durée couverte en mois
+    nb_variables (int): Nombre de variables explicatives candidates
+    frequence (str): Pas de temps pandas des observations ('D' journalier, 'MS' mensuel)
+    graine (int): Graine du générateur aléatoire
+
+    Returns:
+    tuple: (dates, X, y)
+    """
+    rng = np.random.default_rng(graine)
+    dates = pd.Series(pd.date_range('2020-01-01', pd.Timestamp('2020-01-01') + pd.DateOffset(months=mois, days=-1),
+                                    freq=frequence))
+    saison = np.cos(2 * np.pi * dates.dt.dayofyear.to_numpy() / 365.25)
+    X = pd.DataFrame({
+        f"var_{i + 1}": 10 * saison * rng.uniform(-1, 1) + rng.normal(0, 1 + i % 3, len(dates)) + 20
+        for i in range(nb_variables)
+    })
+    y = 500 + 12 * X.iloc[:, 0] + (4 * X.iloc[:, 1] if nb_variables > 1 else 0) + rng.normal(0, 15, len(dates))
+    return dates, X, pd.Series(y, name='consommation')
+
+def mesurer(fonction):
+    """
+    Exécute une fonction et renvoie (résultat, durée en s, pic mémoire en Mo).
+    Le pic mémoire est celui des allocations Python du processus courant (tracemalloc) :
+    il ne comprend pas la mémoire des processus de calcul du mode parallèle.
+    """
+    tracemalloc.start()
+    debut = time.perf_counter()
+    try:
+        resultat = fonction()
+        duree = time.perf_counter() - debut
+        _, pic = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return resultat, duree, pic / 2 ** 20
+
+def pic_rss_processus_calcul():
+    """
+    Mémoire résidente maximale (Mo) des processus enfants terminés depuis le lancement,
+    mémoire partagée avec le processus principal comprise (None hors Unix)
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss est en octets sous macOS, en kilo-octets ailleurs
+    return rss / 2 ** 20 if sys.platform == 'darwin' else rss / 2 ** 10
+
+def nb_sous_ensembles(nb_variables, max_features):
+    """Nombre de combinaisons de 1 à max_features variables"""
+    return sum(comb(nb_variables, k) for k in range(1, min(max_features, nb_variables) + 1))
+
+def bench_recherche(dates, X, y, config):
+    """Boucle des fenêtres glissantes de l'application (rechercher_modeles)"""
+    periodes = periodes_glissantes(dates, mois=12)
+    # Types de modèles des différents choix, sans doublon (le mode automatique inclut les autres)
+    types_modeles = list({(m_type, m_name): (m_type, m_name, params)
+                          for modele in config['modeles']
+                          for m_type, m_name, params in types_modeles_a_tester(TYPES_MODELES[modele])}.values())
+    recherche, duree, pic = mesurer(lambda: rechercher_modeles(
+        X, y, types_modeles, config['max_features'], dates=dates, periodes=periodes,
+        recherche_bb=config['recherche_bb'], parallele=config['parallele']
+    ))
+    nb_fenetres = recherche['nb_periodes']
+    # En branch-and-bound, seuls les sous-ensembles non élagués sont évalués
+    if config['recherche_bb']:
+        sous_ensembles = recherche['stats_bb']['evalues']
+    else:
+        sous_ensembles = nb_fenetres * nb_sous_ensembles(X.shape[1], config['max_features'])
+    mesures = {
+        'duree_s': duree,
+        'pic_memoire_mo': pic,
+        'fenetres': nb_fenetres,
+        'sous_ensembles': sous_ensembles,
+        'sous_ensembles_par_s': sous_ensembles / duree if duree else None,
+        'duree_par_fenetre_s': duree / nb_fenetres if nb_fenetres else None
+    }
+    if config['parallele']:
+        # pic_memoire_mo ne mesure que le processus principal : mémoire des processus de calcul
+        mesures['pic_rss_processus_calcul_mo'] = pic_rss_processus_calcul()
+    return mesures
+
+def bench_trouver_meilleur_modele(dates, X, y, config):
+    """Recherche de OptimizedModelIPMVP sur la première période de 12 mois"""
+    from optimized_model import OptimizedModelIPMVP, vider_cache_combinaisons
+    fenetre = (dates < dates.iloc[0] + pd.DateOffset(months=12)).to_numpy()
+    X_fenetre, y_fenetre = X[fenetre].reset_index(drop=True), y[fenetre].reset_index(drop=True)
+    vider_cache_combinaisons()
+    methode = "branch_and_bound" if config['recherche_bb'] else "exhaustive"
+    modele = OptimizedModelIPMVP()
+    _, duree, pic = mesurer(lambda: modele.trouver_meilleur_modele(
+        X_fenetre, y_fenetre, max_features=config['max_features'], methode=methode
+    ))
+    if modele.stats_recherche is not None:
+        sous_ensembles = modele.stats_recherche['evalues']
+    else:
+        sous_ensembles = nb_sous_ensembles(X.shape[1], config['max_features'])
+    return {
+        'duree_s': duree,
+        'pic_memoire_mo': pic,
+        'sous_ensembles': sous_ensembles,
+        'sous_ensembles_par_s': sous_ensembles / duree if duree else None
+    }
+
+def bench_evaluer_combinaison(dates, X, y, config):
+    """Appels à evaluer_combinaison (cache vidé) sur toutes les combinaisons d'une période"""
+    from optimized_model import empreinte_donnees, evaluer_combinaison, vider_cache_combinaisons
+    fenetre = (dates < dates.iloc[0] + pd.DateOffset(months=12)).to_numpy()
+    X_fenetre, y_fenetre = X[fenetre].reset_index(drop=True), y[fenetre].reset_index(drop=True)
+    combos = [list(c) for k in range(1, config['max_features'] + 1) for c in combinations(X.columns, k)]
+    vider_cache_combinaisons()
+
+    def appels():
+        # Empreinte calculée une fois pour toutes les combinaisons, comme dans trouver_meilleur_modele
+        empreinte = empreinte_donnees(X_fenetre, y_fenetre)
+        return [evaluer_combinaison(X_fenetre, y_fenetre, combo, empreinte=empreinte) for combo in combos]
+
+    _, duree, pic = mesurer(appels)
+    return {
+        'duree_s': duree,
+        'pic_memoire_mo': pic,
+        'appels': len(combos),
+        'appels_par_s': len(combos) / duree if duree else None
+    }
+
+def bench_calculate_t_stats(dates, X, y, config):
+    """calculate_t_stats sur un modèle Ridge ajusté pour chaque combinaison d'une période"""
+    from sklearn.linear_model import Ridge
+    fenetre = (dates < dates.iloc[0] + pd.DateOffset(months=12)).to_numpy()
+    X_fenetre, y_fenetre = X[fenetre], y[fenetre]
+    modeles = []
+    for k in range(1, config['max_features'] + 1):
+        for combo in combinations(X.columns, k):
+            X_subset = X_fenetre[list(combo)]
+            modele = Ridge(alpha=1.0).fit(X_subset, y_fenetre)
+            modeles.append((X_subset, modele, dict(zip(combo, modele.coef_))))
+    _, duree, pic = mesurer(lambda: [calculate_t_stats(X_subset, y_fenetre, modele, coefs)
+                                     for X_subset, modele, coefs in modeles])
+    return {
+        'duree_s': duree,
+        'pic_memoire_mo': pic,
+        'appels': len(modeles),
+        'appels_par_s': len(modeles) / duree if duree else None
+    }
+
+def bench_degres_jours(dates, X, y, config):
+    """DJU et DJF mensuels sur une grille de 20 bases, à partir de températures quotidiennes"""
+    jours = pd.Series(pd.date_range(dates.iloc[0], dates.iloc[-1], freq='D'))
+    temperatures = 12 - 8 * np.cos(2 * np.pi * jours.dt.dayofyear.to_numpy() / 365.25)
+    bases_dju, bases_djf = np.arange(10, 20), np.arange(18, 28)
+    _, duree, pic = mesurer(lambda: degres_jours_mensuels(jours, temperatures, bases_dju, bases_djf))
+    return {
+        'duree_s': duree,
+        'pic_memoire_mo': pic,
+        'jours': len(jours),
+        'bases': len(bases_dju) + len(bases_djf)
+    }
+
+def version_courante():
+    """Commit git du répertoire du banc d'essai (None hors dépôt git)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def derniere_mesure(fichier, cas, config):
+    """Dernière mesure enregistrée pour le même cas et la même configuration"""
+    if not os.path.exists(fichier):
+        return None
+    precedente = None
+    with open(fichier, encoding='utf-8') as f:
+        for ligne in f:
+            mesure = json.loads(ligne)
+            if mesure['cas'] == cas and mesure['config'] == config:
+                precedente = mesure
+    return precedente
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banc d'essai des chemins critiques de la recherche de modèles IPMVP.")
+    parser.add_argument('--cas', nargs='+', choices=CAS, default=list(CAS), help="Cas à mesurer")
+    parser.add_argument('--mois', type=int, default=36, help="Durée des données synthétiques en mois")
+    parser.add_argument('--frequence', default='D', help="Pas de temps des observations ('D', 'MS'...)")
+    parser.add_argument('--variables', type=int, default=6, help="Nombre de variables candidates")
+    parser.add_argument('--max-features', type=int, default=2, help="Nombre maximum de variables par modèle")
+    parser.add_argument('--modeles', nargs='+', choices=sorted(TYPES_MODELES), default=['auto'],
+                        help="Types de modèles de la recherche")
+    parser.add_argument('--recherche-bb', action='store_true', help="Recherche branch-and-bound")
+    parser.add_argument('--parallele', action='store_true', help="Calcul parallèle de la recherche")
+    parser.add_argument('--repetitions', type=int, default=3, help="Nombre d'exécutions (la plus rapide est retenue)")
+    parser.add_argument('--resultats', default='benchmarks_ipmvp.jsonl', help="Fichier des mesures (JSON lines)")
+    args = parser.parse_args(argv)
+
+    config = {
+        'mois': args.mois,
+        'frequence': args.frequence,
+        'variables': args.variables,
+        'max_features': args.max_features,
+        'modeles': args.modeles,
+        'recherche_bb': args.recherche_bb,
+        'parallele': args.parallele
+    }
+    dates, X, y = donnees_synthetiques(args.mois, args.variables, args.frequence)
+    fonctions = {
+        'recherche': bench_recherche,
+        'trouver_meilleur_modele': bench_trouver_meilleur_modele,
+        'evaluer_combinaison': bench_evaluer_combinaison,
+        'calculate_t_stats': bench_calculate_t_stats,
+        'degres_jours': bench_degres_jours
+    }
+    version = version_courante()
+
+    for cas in args.cas:
+        # Meilleure des répétitions : moins sensible à la charge de la machine
+        mesures = min((fonctions[cas](dates, X, y, config) for _ in range(max(args.repetitions, 1))),
+                      key=lambda m: m['duree_s'])
+        precedente = derniere_mesure(args.resultats, cas, config)
+
+        details = ", ".join(f"{cle}={valeur:.4g}" if isinstance(valeur, float) else f"{cle}={valeur}"
+                            for cle, valeur in mesures.items())
+        print(f"{cas} : {details}")
+        if 'pic_rss_processus_calcul_mo' in mesures:
+            print("    pic_memoire_mo : processus principal seul ; pic_rss_processus_calcul_mo : "
+                  "mémoire résidente du plus gros processus de calcul")
+        if precedente is not None:
+            rapport = mesures['duree_s'] / precedente['mesures']['duree_s']
+            print(f"    {rapport:.2f}× la durée de la mesure précédente ({precedente['version']}, {precedente['date']})")
+
+        with open(args.resultats, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'cas': cas, 'config': config, 'version': version,
+                                'date': datetime.now().isoformat(timespec='seconds'),
+                                'mesures': mesures}, ensure_ascii=False) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
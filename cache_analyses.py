@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+from contextlib import contextmanager
+
+from classement import ClassementModeles
+
+# Cache persistant des analyses complètes (recherche de la meilleure période et du meilleur modèle)
+# Les résultats sont indexés par le contenu du fichier importé et la configuration complète de
+# l'analyse, et stockés dans une base SQLite partagée par les sessions et les redémarrages.
+
+CHEMIN_CACHE = os.environ.get('IPMVP_CACHE_ANALYSES', 'cache_analyses.sqlite')
+TAILLE_MAX = 256 * 2 ** 20  # Taille totale maximale des résultats stockés (octets)
+
+# Modules dont dépend le résultat d'une analyse (lecture et agrégation des données, degrés-jours,
+# recherche) : toute modification invalide le cache
+MODULES_MOTEUR = ('donnees.py', 'degres_jours.py', 'moteur_ipmvp.py', 'moteur_regression.py', 'regularisation.py',
+                  'classement.py', 'points_rupture.py')
+
+
+def _version_moteur():
+    """Empreinte du code source du moteur de recherche"""
+    empreinte = hashlib.sha256()
+    repertoire = os.path.dirname(os.path.abspath(__file__))
+    for module in MODULES_MOTEUR:
+        with open(os.path.join(repertoire, module), 'rb') as f:
+            empreinte.update(f.read())
+    return empreinte.hexdigest()[:16]
+
+VERSION_MOTEUR = _version_moteur()
+
+def cle_analyse(empreinte_fichier, configuration):
+    """
+    Clé d'une analyse : empreinte du fichier importé et de la configuration complète.
+
+    Parameters:
+    empreinte_fichier (str): Empreinte du contenu du fichier importé (voir donnees.empreinte_contenu)
+    configuration (dict): Colonnes, variables, période, types de modèles et paramètres de recherche
+
+    Returns:
+    str: Clé hexadécimale
+    """
+    empreinte = hashlib.sha256(empreinte_fichier.encode())
+    empreinte.update(json.dumps(configuration, sort_keys=True, ensure_ascii=False, default=str).encode())
+    return empreinte.hexdigest()
+
+
+class CacheAnalyses:
+    """
+    Résultats de rechercher_modeles stockés sur disque.
+
+    Chaque entrée porte la version du moteur qui l'a produite : les entrées d'une autre
+    version sont ignorées et supprimées. Au-delà de taille_max octets, les entrées les
+    moins récemment utilisées sont évincées.
+    """
+
+    def __init__(self, chemin=CHEMIN_CACHE, taille_max=TAILLE_MAX, version=VERSION_MOTEUR):
+        self.chemin = chemin
+        self.taille_max = taille_max
+        self.version = version
+        with self._connexion() as connexion:
+            connexion.execute("""
+                CREATE TABLE IF NOT EXISTS analyses (
+                    cle TEXT PRIMARY KEY,
+                    version TEXT NOT NULL,
+                    donnees BLOB NOT NULL,
+                    taille INTEGER NOT NULL,
+                    acces REAL NOT NULL
+                )
+            """)
+
+    @contextmanager
+    def _connexion(self):
+        # Une connexion par opération : les sessions Streamlit s'exécutent dans des threads distincts
+        connexion = sqlite3.connect(self.chemin, timeout=30)
+        try:
+            with connexion:  # Validation de la transaction, ou annulation en cas d'erreur
+                yield connexion
+        finally:
+            connexion.close()
+
+    def lire(self, cle):
+        """
+        Résultat d'une analyse déjà effectuée, au format de rechercher_modeles (None si absent).
+        """
+        try:
+            with self._connexion() as connexion:
+                ligne = connexion.execute("SELECT version, donnees FROM analyses WHERE cle = ?", (cle,)).fetchone()
+                if ligne is None:
+                    return None
+                if ligne[0] != self.version:
+                    # Résultat produit par une autre version du moteur
+                    connexion.execute("DELETE FROM analyses WHERE cle = ?", (cle,))
+                    return None
+                connexion.execute("UPDATE analyses SET acces = ? WHERE cle = ?", (time.time(), cle))
+            stocke = pickle.loads(ligne[1])
+        except Exception:
+            # Base indisponible ou entrée illisible : l'analyse est simplement recalculée
+            return None
+
+        # Le classement est reconstruit à partir des modèles retenus, du meilleur au moins bon
+        classement = ClassementModeles(taille=stocke['taille_classement'])
+        for model_info in stocke['classement']:
+            classement.ajouter(model_info)
+        return {**stocke['recherche'], 'classement': classement}
+
+    def ecrire(self, cle, recherche):
+        """Stocke le résultat de rechercher_modeles, puis évince les entrées les plus anciennes"""
+        classement = recherche['classement']
+        stocke = {
+            'recherche': {cle_r: valeur for cle_r, valeur in recherche.items() if cle_r != 'classement'},
+            'classement': classement.meilleurs(),
+            'taille_classement': classement.taille
+        }
+        try:
+            donnees = pickle.dumps(stocke, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return False
+        if len(donnees) > self.taille_max:
+            return False
+
+        try:
+            with self._connexion() as connexion:
+                # Entrées des versions précédentes du moteur
+                connexion.execute("DELETE FROM analyses WHERE version != ?", (self.version,))
+                connexion.execute("INSERT OR REPLACE INTO analyses VALUES (?, ?, ?, ?, ?)",
+                                  (cle, self.version, donnees, len(donnees), time.time()))
+                total = connexion.execute("SELECT COALESCE(SUM(taille), 0) FROM analyses").fetchone()[0]
+                if total > self.taille_max:
+                    for cle_ancienne, taille in connexion.execute(
+                            "SELECT cle, taille FROM analyses WHERE cle != ? ORDER BY acces", (cle,)).fetchall():
+                        connexion.execute("DELETE FROM analyses WHERE cle = ?", (cle_ancienne,))
+                        total -= taille
+                        if total <= self.taille_max:
+                            break
+        except sqlite3.Error:
+            return False
+        return True
+
+    def vider(self):
+        """Supprime toutes les analyses stockées"""
+        with self._connexion() as connexion:
+            connexion.execute("DELETE FROM analyses")
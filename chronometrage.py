@@ -0,0 +1,87 @@
+import json
+import logging
+import time
+from contextlib import contextmanager, nullcontext
+
+# Chronométrage des étapes d'une analyse (lecture, recherche, ajustements, graphiques...)
+# Sans chronomètre (None), les fonctions d'instrumentation n'ajoutent aucun calcul.
+
+logger = logging.getLogger(__name__)
+# Journal propre au module : les mesures sont écrites sur la sortie d'erreur du serveur
+# même si l'application ne configure pas la journalisation (niveau WARNING par défaut)
+if not logger.handlers:
+    _gestionnaire = logging.StreamHandler()
+    _gestionnaire.setFormatter(logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s"))
+    logger.addHandler(_gestionnaire)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+class Chronometre:
+    """Durées cumulées et nombres d'appels de chaque étape nommée d'une analyse"""
+
+    def __init__(self):
+        self.durees = {}
+        self.appels = {}
+
+    @contextmanager
+    def etape(self, nom):
+        """Chronomètre le bloc exécuté dans le contexte et l'ajoute à l'étape nom"""
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.ajouter(nom, time.perf_counter() - debut)
+
+    def ajouter(self, nom, duree, appels=1):
+        """Ajoute une durée (en secondes) mesurée ailleurs à une étape"""
+        self.durees[nom] = self.durees.get(nom, 0.0) + duree
+        self.appels[nom] = self.appels.get(nom, 0) + appels
+
+    def fusionner(self, resume):
+        """Ajoute les mesures d'un autre chronomètre (voir resume), par exemple d'un processus de calcul"""
+        for nom, mesure in resume.items():
+            self.ajouter(nom, mesure['duree_s'], mesure['appels'])
+
+    def resume(self):
+        """Mesures par étape, dans l'ordre de première apparition : {'duree_s', 'appels'}"""
+        return {nom: {'duree_s': self.durees[nom], 'appels': self.appels[nom]} for nom in self.durees}
+
+    def dataframe(self):
+        """Tableau des étapes pour l'affichage (durée totale, appels, durée moyenne, NaN sans appel)"""
+        import pandas as pd
+        return pd.DataFrame([
+            {'Étape': nom, 'Durée (s)': mesure['duree_s'], 'Appels': mesure['appels'],
+             'Durée moyenne (ms)': (mesure['duree_s'] / mesure['appels'] * 1000
+                                    if mesure['appels'] else float('nan'))}
+            for nom, mesure in self.resume().items()
+        ])
+
+    def to_json(self, **contexte):
+        """Export JSON des mesures, complété d'informations de contexte (fichier, paramètres...)"""
+        return json.dumps({**contexte, 'etapes': self.resume()}, ensure_ascii=False, default=str)
+
+    def journaliser(self, **contexte):
+        """Écrit l'export JSON dans les journaux de l'application"""
+        logger.info("Performance IPMVP : %s", self.to_json(**contexte))
+
+
+def etape(chronometre, nom):
+    """Contexte chronométrant une étape, sans effet si chronometre vaut None"""
+    return chronometre.etape(nom) if chronometre is not None else nullcontext()
+
+def chronometrer_iteration(chronometre, nom, iterable):
+    """Parcourt un itérable en ajoutant la production de chaque élément à l'étape nom"""
+    if chronometre is None:
+        yield from iterable
+        return
+    iterateur = iter(iterable)
+    while True:
+        debut = time.perf_counter()
+        try:
+            element = next(iterateur)
+        except StopIteration:
+            chronometre.ajouter(nom, time.perf_counter() - debut, appels=0)
+            return
+        chronometre.ajouter(nom, time.perf_counter() - debut)
+        yield element
@@ -0,0 +1,268 @@
+import heapq
+import itertools
+
+import numpy as np
+import pandas as pd
+
+# Classement borné des modèles testés
+# Seuls les meilleurs modèles sont conservés : la mémoire et le coût du tri restent constants
+# quel que soit le nombre de combinaisons et de périodes explorées.
+# Les modèles retenus sont ensuite rangés en colonnes pour l'affichage et les statistiques.
+
+
+class ClassementModeles:
+    """
+    Classement des K meilleurs modèles par R², dédoublonné par (type de modèle, forme, variables).
+
+    Les modèles sont gardés dans un tas binaire dont la racine est le moins bon modèle
+    retenu. Pour une même clé, seul le meilleur R² est conservé ; à R² égal, le premier
+    modèle proposé est prioritaire.
+    """
+
+    def __init__(self, taille=15):
+        """
+        Parameters:
+        taille (int): Nombre maximum de modèles conservés
+        """
+        self.taille = taille
+        self.nb_proposes = 0
+        self._tas = []
+        self._modeles = {}
+        self._ordre = itertools.count()
+
+    @staticmethod
+    def cle(model_info):
+        """
+        Clé de dédoublonnage d'un modèle : type, forme (modèles à points de rupture 3P, 4P, 5P,
+        qui partagent un même type) et ensemble de variables
+        """
+        return (model_info['model_type'], model_info.get('forme', ''), tuple(sorted(model_info['features'])))
+
+    @staticmethod
+    def _score(r2):
+        return r2 if r2 == r2 else float('-inf')  # R² NaN classé en dernier
+
+    def ajouter(self, model_info):
+        """
+        Propose un modèle au classement.
+
+        Parameters:
+        model_info (dict): Informations du modèle (au minimum 'r2', 'model_type' et 'features')
+
+        Returns:
+        bool: True si le modèle fait partie du classement après l'insertion
+        """
+        self.nb_proposes += 1
+        cle = self.cle(model_info)
+        score = self._score(model_info['r2'])
+
+        existant = self._modeles.get(cle)
+        if existant is not None and score <= existant[0]:
+            return False
+
+        ordre = next(self._ordre)
+        if existant is None and len(self._modeles) >= self.taille:
+            self._nettoyer_racine()
+            r2_min, ordre_min, _ = self._tas[0]
+            if (score, -ordre) <= (r2_min, ordre_min):
+                return False
+            # Évincer le moins bon modèle retenu
+            _, _, cle_min = heapq.heappop(self._tas)
+            del self._modeles[cle_min]
+
+        self._modeles[cle] = (score, -ordre, model_info)
+        heapq.heappush(self._tas, (score, -ordre, cle))
+
+        # Les entrées remplacées restent dans le tas jusqu'à reconstruction
+        if len(self._tas) > 2 * self.taille + 16:
+            self._tas = [(s, o, c) for c, (s, o, _) in self._modeles.items()]
+            heapq.heapify(self._tas)
+        return True
+
+    def _nettoyer_racine(self):
+        """Retire de la racine du tas les entrées remplacées par un meilleur modèle"""
+        while self._tas:
+            score, ordre, cle = self._tas[0]
+            actuel = self._modeles.get(cle)
+            if actuel is not None and actuel[1] == ordre:
+                return
+            heapq.heappop(self._tas)
+
+    def meilleurs(self):
+        """Modèles retenus, triés par R² décroissant"""
+        retenus = sorted(self._modeles.values(), key=lambda m: (m[0], m[1]), reverse=True)
+        return [model_info for _, _, model_info in retenus]
+
+    def __len__(self):
+        return len(self._modeles)
+
+    def resultats(self, variables=None):
+        """Modèles retenus sous forme de stock en colonnes (voir ResultatsModeles)"""
+        return ResultatsModeles.depuis_modeles(self.meilleurs(), variables)
+
+
+class ResultatsModeles:
+    """
+    Stock en colonnes des modèles testés, adossé à un tableau structuré NumPy.
+
+    Chaque ligne contient les métriques d'un modèle ; les variables utilisées, leurs
+    coefficients et leurs valeurs t sont rangés dans des colonnes de largeur fixe (une case
+    par variable candidate), ce qui permet de trier, filtrer et agréger sans parcourir de
+    dictionnaires. Pour les modèles polynomiaux, seuls les termes de degré 1 sont stockés.
+    """
+
+    TYPES_AVEC_T = ("Linéaire", "Ridge", "Lasso")
+    SEUIL_T = 2  # |t| au-delà duquel une variable est considérée significative
+
+    def __init__(self, variables, capacite=64):
+        """
+        Parameters:
+        variables (list): Variables candidates (une colonne de masque et de coefficient par variable)
+        capacite (int): Nombre de lignes réservées initialement
+        """
+        self.variables = list(variables)
+        self.positions = {variable: i for i, variable in enumerate(self.variables)}
+        p = len(self.variables)
+        self.dtype = np.dtype([
+            ('model_type', 'U32'),
+            ('forme', 'U16'),
+            ('model_name', 'U80'),
+            ('period', 'U64'),
+            ('r2', 'f8'),
+            ('rmse', 'f8'),
+            ('cv_rmse', 'f8'),
+            ('mae', 'f8'),
+            ('bias', 'f8'),
+            ('intercept', 'f8'),
+            ('conformite', 'U16'),
+            ('classe', 'U8'),
+            ('masque', '?', (p,)),
+            ('coefficients', 'f8', (p,)),
+            ('t_values', 'f8', (p,)),
+            ('p_values', 'f8', (p,))
+        ])
+        self._donnees = np.zeros(max(capacite, 1), dtype=self.dtype)
+        self._n = 0
+
+    @classmethod
+    def depuis_modeles(cls, modeles, variables=None):
+        """
+        Construit le stock à partir de dictionnaires de modèles (format de evaluer_modele).
+
+        Parameters:
+        modeles (list): Informations des modèles
+        variables (list): Variables candidates (par défaut, celles rencontrées dans les modèles)
+        """
+        if variables is None:
+            variables = list(dict.fromkeys(feature for model_info in modeles for feature in model_info['features']))
+        resultats = cls(variables, capacite=len(modeles))
+        for model_info in modeles:
+            resultats.ajouter(model_info)
+        return resultats
+
+    def ajouter(self, model_info):
+        """Ajoute un modèle (dictionnaire au format de evaluer_modele) au stock"""
+        if self._n == len(self._donnees):
+            # Croissance géométrique : coût d'ajout amorti constant
+            agrandi = np.zeros(2 * len(self._donnees), dtype=self.dtype)
+            agrandi[:self._n] = self._donnees[:self._n]
+            self._donnees = agrandi
+
+        ligne = self._donnees[self._n]
+        for champ in ('model_type', 'forme', 'model_name', 'period', 'conformite', 'classe'):
+            ligne[champ] = str(model_info.get(champ, ''))
+        for champ in ('r2', 'rmse', 'cv_rmse', 'mae', 'bias', 'intercept'):
+            ligne[champ] = model_info.get(champ, np.nan)
+
+        coefficients = model_info.get('coefficients', {})
+        t_stats = model_info.get('t_stats') or {}
+        ligne['coefficients'] = np.nan
+        ligne['t_values'] = np.nan
+        ligne['p_values'] = np.nan
+        for feature in model_info['features']:
+            j = self.positions[feature]
+            ligne['masque'][j] = True
+            ligne['coefficients'][j] = coefficients.get(feature, np.nan)
+            stat = t_stats.get(feature)
+            if isinstance(stat, dict):
+                ligne['t_values'][j] = stat.get('t_value', np.nan)
+                ligne['p_values'][j] = stat.get('p_value', np.nan)
+        self._n += 1
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def tableau(self):
+        """Vue sur les lignes remplies du tableau structuré"""
+        return self._donnees[:self._n]
+
+    def conformes(self, classes=("good",)):
+        """Masque des modèles dont la classe de conformité IPMVP fait partie de classes"""
+        return np.isin(self.tableau['classe'], list(classes))
+
+    def statistiques_t(self):
+        """
+        Valeur |t| moyenne et part des variables significatives de chaque modèle.
+
+        Seuls les modèles linéaires, Ridge et Lasso sont concernés ; les autres, comme les
+        modèles sans valeur t exploitable, reçoivent NaN.
+
+        Returns:
+        tuple: (t moyen, part de variables significatives entre 0 et 1, nombre de valeurs t)
+        """
+        tableau = self.tableau
+        abs_t = np.abs(tableau['t_values'])
+        valides = tableau['masque'] & np.isfinite(abs_t)
+        valides &= np.isin(tableau['model_type'], self.TYPES_AVEC_T)[:, None]
+        nb = valides.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_moyen = np.where(nb > 0, np.where(valides, abs_t, 0.0).sum(axis=1) / nb, np.nan)
+            part = np.where(nb > 0, (valides & (abs_t > self.SEUIL_T)).sum(axis=1) / nb, np.nan)
+        return t_moyen, part, nb
+
+    def classement(self, k=None):
+        """
+        Indices des k meilleurs modèles par R² décroissant, dédoublonnés par (type, forme, variables).
+
+        À R² égal, le premier modèle ajouté est prioritaire.
+        """
+        tableau = self.tableau
+        if not len(tableau):
+            return np.array([], dtype=int)
+        r2 = np.where(np.isnan(tableau['r2']), -np.inf, tableau['r2'])
+        ordre = np.lexsort((np.arange(len(tableau)), -r2))
+
+        # Première occurrence (donc la meilleure) de chaque triplet (type, forme, masque de variables)
+        _, code_type = np.unique(np.char.add(np.char.add(tableau['model_type'], '|'), tableau['forme']),
+                                 return_inverse=True)
+        cles = np.column_stack([code_type, np.packbits(tableau['masque'], axis=1)])
+        _, premieres = np.unique(cles[ordre], axis=0, return_index=True)
+        retenus = ordre[np.sort(premieres)]
+        return retenus if k is None else retenus[:k]
+
+    def dataframe(self, k=None):
+        """
+        Modèles classés (voir classement) sous forme de DataFrame, avec les statistiques t agrégées.
+        """
+        indices = self.classement(k)
+        tableau = self.tableau[indices]
+        t_moyen, part, nb = (valeurs[indices] for valeurs in self.statistiques_t())
+        variables = np.array(self.variables, dtype=object)
+        return pd.DataFrame({
+            'model_type': tableau['model_type'],
+            'model_name': tableau['model_name'],
+            'period': tableau['period'],
+            'variables': [", ".join(variables[masque]) for masque in tableau['masque']],
+            'n_variables': tableau['masque'].sum(axis=1),
+            'r2': tableau['r2'],
+            'rmse': tableau['rmse'],
+            'cv_rmse': tableau['cv_rmse'],
+            'mae': tableau['mae'],
+            'bias': tableau['bias'],
+            'conformite': tableau['conformite'],
+            'classe': tableau['classe'],
+            't_moyen': t_moyen,
+            'part_significatives': part,
+            'nb_t': nb
+        })
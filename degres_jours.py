@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+# Degrés-jours unifiés (DJU, chauffage) et de froid (DJF, climatisation) sur une grille de bases
+# Toutes les bases sont calculées en une seule opération vectorisée : les températures
+# quotidiennes (n jours) sont comparées à la grille des bases (m bases) par diffusion NumPy.
+
+
+def nom_colonne(base, chauffage=True):
+    """Nom de la colonne des degrés-jours d'une base ('dju_base_18', 'djf_base_22.5'...)"""
+    return f"{'dju' if chauffage else 'djf'}_base_{float(base):g}"
+
+def degres_jours(temperatures, bases, chauffage=True):
+    """
+    Degrés-jours quotidiens pour chaque base de température.
+
+    Parameters:
+    temperatures (array-like): Températures moyennes quotidiennes (n jours)
+    bases (array-like): Températures de base (m bases)
+    chauffage (bool): DJU (base - température) si vrai, DJF (température - base) sinon
+
+    Returns:
+    numpy.ndarray: Matrice (n jours, m bases) ; NaN pour les jours sans température
+    """
+    t = np.asarray(temperatures, dtype='float64')[:, np.newaxis]
+    b = np.asarray(bases, dtype='float64')[np.newaxis, :]
+    return np.maximum(b - t if chauffage else t - b, 0.0)
+
+def degres_jours_mensuels(dates, temperatures, bases_dju=(), bases_djf=()):
+    """
+    Sommes mensuelles des DJU et DJF de toutes les bases, par une seule réduction groupée.
+
+    Parameters:
+    dates (array-like): Dates des observations quotidiennes
+    temperatures (array-like): Températures moyennes quotidiennes
+    bases_dju (array-like): Bases des DJU
+    bases_djf (array-like): Bases des DJF
+
+    Returns:
+    pandas.DataFrame: Une ligne par mois (index 'month', période mensuelle), une colonne par base
+    """
+    matrice = np.hstack([degres_jours(temperatures, bases_dju, chauffage=True),
+                         degres_jours(temperatures, bases_djf, chauffage=False)])
+    colonnes = ([nom_colonne(base, chauffage=True) for base in bases_dju]
+                + [nom_colonne(base, chauffage=False) for base in bases_djf])
+    mois = pd.PeriodIndex(pd.to_datetime(pd.Series(dates)).dt.to_period('M'), name='month')
+    return pd.DataFrame(matrice, columns=colonnes, index=mois).groupby(level='month').sum()
+
+def degres_jours_par_mois(dates, temperatures, bases, chauffage=True):
+    """
+    Degrés-jours mensuels de chaque base, par sommes cumulées des températures triées.
+
+    Dans un mois, les DJU d'une base b valent b * k - S(k), où k est le nombre de jours plus
+    froids que b et S(k) la somme de leurs températures : une fois les températures du mois
+    triées et cumulées, chaque base ne coûte qu'une recherche dichotomique, quel que soit le
+    nombre de jours. Les DJF s'en déduisent de la même façon.
+
+    Parameters:
+    dates (array-like): Dates des observations quotidiennes
+    temperatures (array-like): Températures moyennes quotidiennes
+    bases (array-like): Températures de base, triées ou non
+    chauffage (bool): DJU si vrai, DJF sinon
+
+    Returns:
+    pandas.DataFrame: Une ligne par mois (index 'month'), une colonne par base
+    """
+    t = np.asarray(temperatures, dtype='float64')
+    mois = pd.to_datetime(pd.Series(dates)).dt.to_period('M').to_numpy()
+    valides = ~np.isnan(t)
+    t, mois = t[valides], mois[valides]
+    bases = np.asarray(bases, dtype='float64')
+
+    codes, index_mois = pd.factorize(mois, sort=True)
+    # Températures triées par mois puis par valeur, et leurs sommes cumulées
+    ordre = np.lexsort((t, codes))
+    t_triees, codes_tries = t[ordre], codes[ordre]
+    cumul = np.concatenate([[0.0], np.cumsum(t_triees)])
+    bornes = np.searchsorted(codes_tries, np.arange(len(index_mois) + 1))
+
+    resultat = np.empty((len(index_mois), len(bases)))
+    for i, (debut, fin) in enumerate(zip(bornes[:-1], bornes[1:])):
+        # Nombre de jours plus froids que chaque base, et somme de leurs températures
+        k = np.searchsorted(t_triees[debut:fin], bases)
+        somme_froids = cumul[debut + k] - cumul[debut]
+        if chauffage:
+            resultat[i] = bases * k - somme_froids
+        else:
+            somme_chauds = cumul[fin] - cumul[debut] - somme_froids
+            resultat[i] = somme_chauds - bases * (fin - debut - k)
+
+    colonnes = [nom_colonne(base, chauffage) for base in bases]
+    return pd.DataFrame(resultat, columns=colonnes, index=pd.PeriodIndex(index_mois, name='month'))
+
+def meilleure_base(dates, temperatures, consommation_mensuelle, bases, chauffage=True):
+    """
+    Base de température dont les degrés-jours mensuels expliquent le mieux la consommation
+    (R² de la régression linéaire de la consommation sur les degrés-jours).
+
+    Parameters:
+    dates (array-like): Dates des observations quotidiennes
+    temperatures (array-like): Températures moyennes quotidiennes
+    consommation_mensuelle (pandas.Series): Consommation indexée par mois (période mensuelle)
+    bases (array-like): Grille des bases à évaluer (par exemple par pas de 0,5 °C)
+    chauffage (bool): DJU si vrai, DJF sinon
+
+    Returns:
+    tuple: (meilleure base, None si aucune base n'est exploitable ; R² de chaque base, pandas.Series)
+    """
+    bases = np.asarray(bases, dtype='float64')
+    degres = degres_jours_par_mois(dates, temperatures, bases, chauffage)
+    mois_communs = degres.index.intersection(consommation_mensuelle.index)
+    D = degres.loc[mois_communs].to_numpy()
+    y = consommation_mensuelle.loc[mois_communs].to_numpy(dtype='float64')
+
+    # R² d'une régression simple = carré de la corrélation, pour toutes les bases à la fois
+    ecarts_D = D - D.mean(axis=0)
+    ecarts_y = y - y.mean()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        r2 = (ecarts_D.T @ ecarts_y) ** 2 / ((ecarts_D ** 2).sum(axis=0) * (ecarts_y ** 2).sum())
+    scores = pd.Series(r2, index=pd.Index(bases, name='base'), name='r2')
+
+    # Au moins trois mois communs, et des degrés-jours non constants
+    if len(mois_communs) < 3 or scores.isna().all():
+        return None, scores
+    return float(scores.idxmax()), scores
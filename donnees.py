@@ -0,0 +1,364 @@
+import hashlib
+import io
+import os
+
+import pandas as pd
+
+from chronometrage import etape
+
+try:
+    import pyarrow  # noqa: F401  (lecture CSV en colonnes et copies Parquet)
+    PYARROW_DISPONIBLE = True
+except ImportError:
+    PYARROW_DISPONIBLE = False
+
+# Lecture et préparation des fichiers de consommation, indépendantes de Streamlit
+# Ce module est utilisé par l'application et par le mode en lot (lot_ipmvp.py).
+
+# Formats acceptés (extensions) : classeurs Excel et formats en colonnes
+FORMATS_EXCEL = ('xlsx', 'xls')
+FORMATS_COLONNES = ('csv', 'parquet', 'arrow', 'feather')
+FORMATS = FORMATS_EXCEL + FORMATS_COLONNES
+
+# Copies Parquet des fichiers déjà lus, indexées par le contenu du fichier d'origine
+REPERTOIRE_COPIES = os.environ.get('IPMVP_COPIES_COLONNES', 'copies_colonnes')
+TAILLE_MAX_COPIES = 256 * 2 ** 20  # Taille totale maximale des copies (octets)
+
+# Pas d'agrégation des relevés à pas de temps fin (15 min, horaire), en alias pandas
+AGREGATIONS = {'mensuel': 'MS', 'journalier': 'D'}
+
+# Nombre de lignes lues à la fois lors de l'agrégation des relevés à pas de temps fin
+TAILLE_BLOC = 200_000
+
+
+def extension(nom):
+    """Extension d'un nom de fichier, en minuscules et sans le point"""
+    return os.path.splitext(str(nom))[1].lower().lstrip('.')
+
+def empreinte_contenu(contenu):
+    """Empreinte SHA-256 (hexadécimale) du contenu d'un fichier"""
+    return hashlib.sha256(contenu).hexdigest()
+
+def _format_francais(debut):
+    """Vrai si l'en-tête d'un CSV utilise le séparateur ';' des exports au format français"""
+    lignes = debut.decode('utf-8', errors='ignore').splitlines()
+    entete = lignes[0] if lignes else ""
+    return entete.count(';') > entete.count(',')
+
+def _lire_csv(contenu):
+    """
+    Lecture d'un CSV par le lecteur en colonnes de pyarrow lorsqu'il est disponible.
+    Les exports au format français (séparateur ';', virgule décimale) passent par le lecteur C.
+    """
+    if _format_francais(contenu[:4096]):
+        return pd.read_csv(io.BytesIO(contenu), sep=';', decimal=',')
+    return pd.read_csv(io.BytesIO(contenu), engine='pyarrow' if PYARROW_DISPONIBLE else 'c')
+
+def _evincer_copies(repertoire=None, taille_max=None):
+    """
+    Supprime les copies Parquet les moins récemment utilisées tant que leur taille totale
+    dépasse taille_max (la date de modification d'une copie est mise à jour à chaque lecture).
+    """
+    repertoire = REPERTOIRE_COPIES if repertoire is None else repertoire
+    taille_max = TAILLE_MAX_COPIES if taille_max is None else taille_max
+    try:
+        copies = [entree for entree in os.scandir(repertoire)
+                  if entree.is_file() and entree.name.endswith('.parquet')]
+        etats = sorted(((entree.stat(), entree.path) for entree in copies), key=lambda e: e[0].st_mtime)
+    except OSError:
+        return
+    total = sum(etat.st_size for etat, _ in etats)
+    for etat, chemin in etats:
+        if total <= taille_max:
+            break
+        try:
+            os.remove(chemin)
+        except OSError:
+            continue  # Copie supprimée entre-temps par un autre processus
+        total -= etat.st_size
+
+def lire_donnees(contenu, nom, empreinte=None):
+    """
+    Lit un fichier de données de consommation (Excel, CSV, Parquet ou Arrow/Feather).
+
+    Les fichiers Excel et CSV lus une première fois sont convertis en une copie Parquet
+    (si pyarrow est installé), relue directement lors des imports suivants du même contenu.
+    Au-delà de TAILLE_MAX_COPIES octets, les copies les moins récemment utilisées sont supprimées.
+
+    Parameters:
+    contenu (bytes): Contenu du fichier
+    nom (str): Nom du fichier (son extension détermine le format)
+    empreinte (str): Empreinte du contenu si elle est déjà calculée (voir empreinte_contenu)
+
+    Returns:
+    pandas.DataFrame: Données lues
+    """
+    format_fichier = extension(nom)
+    if format_fichier not in FORMATS:
+        raise ValueError(f"Format de fichier non pris en charge : {format_fichier or nom}")
+
+    if format_fichier == 'parquet':
+        return pd.read_parquet(io.BytesIO(contenu))
+    if format_fichier in ('arrow', 'feather'):
+        return pd.read_feather(io.BytesIO(contenu))
+
+    copie = os.path.join(REPERTOIRE_COPIES, (empreinte or empreinte_contenu(contenu)) + '.parquet')
+    if PYARROW_DISPONIBLE and os.path.exists(copie):
+        try:
+            df = pd.read_parquet(copie)
+            os.utime(copie)  # Copie récemment utilisée : évincée en dernier
+            return df
+        except Exception:
+            pass  # Copie illisible : le fichier d'origine est relu
+
+    df = _lire_csv(contenu) if format_fichier == 'csv' else pd.read_excel(io.BytesIO(contenu))
+
+    if PYARROW_DISPONIBLE:
+        try:
+            os.makedirs(REPERTOIRE_COPIES, exist_ok=True)
+            temporaire = f"{copie}.{os.getpid()}.tmp"
+            df.to_parquet(temporaire, index=False)
+            os.replace(temporaire, copie)
+            _evincer_copies()
+        except Exception:
+            # Colonnes de types mélangés non convertibles, répertoire en lecture seule... :
+            # la copie est facultative
+            pass
+    return df
+
+def typer_colonnes(df, date_col, conso_col):
+    """
+    Types explicites des colonnes de date (datetime64) et de consommation (float64).
+
+    Les valeurs non convertibles de la consommation deviennent NaN ; une colonne de date
+    non convertible est laissée telle quelle (l'application le signale ensuite).
+
+    Returns:
+    pandas.DataFrame: Les mêmes données, colonnes converties
+    """
+    if date_col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[date_col]):
+        try:
+            df[date_col] = pd.to_datetime(df[date_col])
+        except (ValueError, TypeError):
+            pass
+    if conso_col in df.columns and df[conso_col].dtype != 'float64':
+        df[conso_col] = pd.to_numeric(df[conso_col], errors='coerce').astype('float64')
+    return df
+
+def lire_blocs(source, nom, taille_bloc=TAILLE_BLOC):
+    """
+    Lit un fichier de données par blocs de lignes, sans le charger entièrement.
+
+    Les CSV et les fichiers Parquet (avec pyarrow) sont lus par blocs ; les classeurs Excel
+    et les fichiers Arrow/Feather, qui ne se lisent pas par morceaux, forment un seul bloc.
+
+    Parameters:
+    source (bytes ou str): Contenu du fichier, ou chemin du fichier sur le disque
+    nom (str): Nom du fichier (son extension détermine le format)
+    taille_bloc (int): Nombre de lignes par bloc
+
+    Returns:
+    generator: Blocs successifs (pandas.DataFrame)
+    """
+    format_fichier = extension(nom)
+    if format_fichier not in FORMATS:
+        raise ValueError(f"Format de fichier non pris en charge : {format_fichier or nom}")
+    fichier = io.BytesIO(source) if isinstance(source, bytes) else source
+
+    if format_fichier == 'csv':
+        if isinstance(source, bytes):
+            debut = source[:4096]
+        else:
+            with open(source, 'rb') as f:
+                debut = f.read(4096)
+        options = {'sep': ';', 'decimal': ','} if _format_francais(debut) else {}
+        with pd.read_csv(fichier, chunksize=taille_bloc, **options) as lecteur:
+            yield from lecteur
+    elif format_fichier == 'parquet' and PYARROW_DISPONIBLE:
+        import pyarrow.parquet as pq
+        for lot in pq.ParquetFile(fichier).iter_batches(batch_size=taille_bloc):
+            yield lot.to_pandas()
+    elif format_fichier == 'parquet':
+        yield pd.read_parquet(fichier)
+    elif format_fichier in ('arrow', 'feather'):
+        yield pd.read_feather(fichier)
+    else:
+        yield pd.read_excel(fichier)
+
+def agreger_intervalles(source, nom, pas='MS', date_col=None, conso_col=None, taille_bloc=TAILLE_BLOC):
+    """
+    Agrège à la lecture des relevés à pas de temps fin (15 min, horaire) en totaux journaliers
+    ou mensuels, bloc par bloc : seuls les agrégats sont conservés en mémoire.
+
+    La consommation est sommée sur chaque pas ; les autres colonnes numériques (températures,
+    occupation...) sont moyennées. Les pas sans aucune mesure de consommation valent NaN.
+
+    Parameters:
+    source (bytes ou str): Contenu du fichier, ou chemin du fichier sur le disque
+    nom (str): Nom du fichier (son extension détermine le format)
+    pas (str): Pas d'agrégation pandas ('MS' mensuel, 'D' journalier, voir AGREGATIONS)
+    date_col (str): Colonne des horodatages (détectée sur le premier bloc si None)
+    conso_col (str): Colonne de consommation (détectée sur le premier bloc si None)
+    taille_bloc (int): Nombre de lignes lues à la fois
+
+    Returns:
+    tuple: (données agrégées, colonne de date, colonne de consommation)
+    """
+    sommes = None
+    comptes = None
+    for bloc in lire_blocs(source, nom, taille_bloc):
+        if sommes is None and (date_col is None or conso_col is None):
+            date_detectee, conso_detectee = detecter_colonnes(bloc)
+            date_col = date_col or date_detectee
+            conso_col = conso_col or conso_detectee
+            if date_col is None or conso_col is None:
+                raise ValueError("Colonnes de date ou de consommation non détectées")
+
+        bloc = typer_colonnes(bloc, date_col, conso_col)
+        dates = pd.to_datetime(bloc[date_col], errors='coerce')
+        valeurs = bloc.drop(columns=[date_col]).apply(pd.to_numeric, errors='coerce')
+        # Début du pas (jour ou premier jour du mois) de chaque relevé
+        debut_pas = dates.dt.floor('D') if pas == 'D' else dates.dt.to_period('M').dt.to_timestamp()
+        groupes = valeurs.groupby(debut_pas.rename(date_col))
+
+        # Sommes et effectifs partiels : un pas à cheval sur deux blocs est complété au bloc suivant
+        sommes_bloc, comptes_bloc = groupes.sum(), groupes.count()
+        sommes = sommes_bloc if sommes is None else sommes.add(sommes_bloc, fill_value=0)
+        comptes = comptes_bloc if comptes is None else comptes.add(comptes_bloc, fill_value=0)
+
+    if sommes is None:
+        raise ValueError("Fichier vide")
+
+    # Colonnes sans aucune valeur numérique (commentaires, identifiants...) écartées
+    colonnes = [col for col in sommes.columns if comptes[col].sum() > 0]
+    agregats = (sommes[colonnes] / comptes[colonnes]).where(comptes[colonnes] > 0)
+    agregats[conso_col] = sommes[conso_col].where(comptes[conso_col] > 0)
+    return agregats.sort_index().reset_index(), date_col, conso_col
+
+
+# Fonction pour détecter automatiquement les colonnes de date et de consommation
+def detecter_colonnes(df):
+    # Initialiser les résultats
+    date_col_guess = None
+    conso_col_guess = None
+    
+    if df is None or df.empty:
+        return date_col_guess, conso_col_guess
+    
+    # 1. Détecter la colonne de date
+    date_keywords = ['date', 'temps', 'période', 'period', 'time', 'jour', 'day', 'mois', 'month', 'année', 'year']
+    
+    # Essayer d'abord de trouver une colonne de type datetime
+    datetime_cols = df.select_dtypes(include=['datetime64']).columns.tolist()
+    if datetime_cols:
+        date_col_guess = datetime_cols[0]
+    else:
+        # Chercher par mots-clés dans les noms de colonnes
+        for keyword in date_keywords:
+            potential_cols = [col for col in df.columns if keyword.lower() in col.lower()]
+            if potential_cols:
+                # Essayer de convertir en datetime
+                for col in potential_cols:
+                    try:
+                        pd.to_datetime(df[col])
+                        date_col_guess = col
+                        break
+                    except:
+                        continue
+                if date_col_guess:
+                    break
+    
+    # 2. Détecter la colonne de consommation
+    conso_keywords = ['consommation', 'conso', 'énergie', 'energy', 'kwh', 'mwh', 'wh', 
+                      'électricité', 'electricity', 'gaz', 'gas', 'chaleur', 'heat', 
+                      'puissance', 'power', 'compteur', 'meter']
+    
+    # Exclure la colonne de date si elle a été trouvée
+    cols_to_check = [col for col in df.columns if col != date_col_guess]
+    
+    # Chercher par mots-clés dans les noms de colonnes
+    for keyword in conso_keywords:
+        potential_cols = [col for col in cols_to_check if keyword.lower() in col.lower()]
+        if potential_cols:
+            # Vérifier que ce sont des valeurs numériques
+            for col in potential_cols:
+                try:
+                    if pd.to_numeric(df[col], errors='coerce').notna().sum() > 0.8 * len(df):
+                        conso_col_guess = col
+                        break
+                except:
+                    continue
+            if conso_col_guess:
+                break
+    
+    # Si aucune correspondance par mot-clé, essayer de trouver une colonne numérique
+    if not conso_col_guess:
+        numeric_cols = [col for col in cols_to_check if 
+                        pd.api.types.is_numeric_dtype(df[col]) or 
+                        pd.to_numeric(df[col], errors='coerce').notna().sum() > 0.8 * len(df)]
+        if numeric_cols:
+            # Sélectionner la première colonne numérique non-index qui n'est pas une date
+            for col in numeric_cols:
+                if not (col.lower().startswith('id') or col.lower().startswith('index')):
+                    conso_col_guess = col
+                    break
+            if not conso_col_guess and numeric_cols:
+                conso_col_guess = numeric_cols[0]
+    
+    return date_col_guess, conso_col_guess
+
+def variables_candidates(df, date_col, conso_col):
+    """
+    Colonnes utilisables comme variables explicatives : toutes les colonnes numériques
+    (au moins 80 % de valeurs convertibles) autres que la date et la consommation.
+
+    Parameters:
+    df (pandas.DataFrame): Données importées
+    date_col (str): Colonne de date
+    conso_col (str): Colonne de consommation
+
+    Returns:
+    list: Noms des colonnes candidates, dans l'ordre du fichier
+    """
+    return [col for col in df.columns
+            if col not in [date_col, conso_col]
+            and pd.to_numeric(df[col], errors='coerce').notna().sum() > 0.8 * len(df)]
+
+def charger_fichier(contenu, nom, empreinte, memoire, chronometre=None, pas=None):
+    """
+    Lit un fichier importé et détecte ses colonnes de date et de consommation, une seule
+    fois par contenu : le résultat est conservé dans memoire (la session Streamlit dans
+    l'application), indexé par l'empreinte du contenu et le pas d'agrégation.
+
+    Parameters:
+    contenu (bytes): Contenu du fichier
+    nom (str): Nom du fichier (son extension détermine le format)
+    empreinte (str): Empreinte du contenu (voir empreinte_contenu)
+    memoire (dict): Stockage conservé d'une exécution à l'autre (st.session_state...)
+    chronometre (Chronometre): Mesure des étapes de lecture et de détection
+    pas (str): Pas d'agrégation des relevés à pas de temps fin ('MS', 'D'), None pour lire tel quel
+
+    Returns:
+    tuple: (copie des données, colonne de date détectée, colonne de consommation détectée)
+    """
+    cle = f"{empreinte}:{pas}"
+    charge = memoire.get('fichier_charge')
+    if charge is None or charge['empreinte'] != cle:
+        if pas:
+            # Relevés à pas de temps fin : agrégés bloc par bloc, la série brute n'est jamais chargée
+            with etape(chronometre, "lecture et agrégation des relevés"):
+                df, date_col, conso_col = agreger_intervalles(contenu, nom, pas=pas)
+        else:
+            with etape(chronometre, "lecture du fichier"):
+                df = lire_donnees(contenu, nom, empreinte)
+            with etape(chronometre, "détection des colonnes"):
+                date_col, conso_col = detecter_colonnes(df)
+
+        # Types explicites des colonnes détectées (dates et consommations en float64)
+        df = typer_colonnes(df, date_col, conso_col)
+
+        charge = {'empreinte': cle, 'df': df, 'date_col': date_col, 'conso_col': conso_col}
+        memoire['fichier_charge'] = charge
+
+    # Copie : l'analyse convertit et trie les données sans modifier la version conservée
+    return charge['df'].copy(), charge['date_col'], charge['conso_col']
@@ -0,0 +1,224 @@
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from donnees import AGREGATIONS, FORMATS, agreger_intervalles, detecter_colonnes, lire_donnees, typer_colonnes, variables_candidates
+from moteur_ipmvp import periodes_glissantes, rechercher_modeles, types_modeles_a_tester
+
+# Mode en lot : recherche de la meilleure période et du meilleur modèle IPMVP pour de
+# nombreux fichiers de données (Excel, CSV, Parquet, Arrow), sans interface. Exemple :
+#   python lot_ipmvp.py donnees/sites/ "archives/*.xlsx" --sortie resultats_ipmvp.csv --processus 8
+
+EXTENSIONS = tuple(f".{format_fichier}" for format_fichier in FORMATS)
+
+# Types de modèles acceptés en ligne de commande (voir types_modeles_a_tester)
+TYPES_MODELES = {
+    'auto': "Automatique (meilleur modèle)",
+    'lineaire': "Linéaire",
+    'ridge': "Ridge",
+    'lasso': "Lasso",
+    'polynomiale': "Polynomiale",
+    'rupture': "Points de rupture"
+}
+
+COLONNES_SORTIE = [
+    'fichier', 'signature', 'parametres', 'statut', 'message',
+    'colonne_date', 'colonne_conso', 'variables', 'periode', 'debut', 'fin', 'nb_points',
+    'model_type', 'model_name', 'features', 'r2', 'rmse', 'cv_rmse', 'mae', 'bias',
+    'conformite', 'intercept', 'coefficients'
+]
+
+
+def lister_fichiers(entrees):
+    """
+    Fichiers de données désignés par une liste de répertoires, de motifs glob ou de fichiers.
+
+    Returns:
+    list: Chemins absolus, triés et sans doublons
+    """
+    fichiers = set()
+    for entree in entrees:
+        if os.path.isdir(entree):
+            candidats = [os.path.join(entree, nom) for nom in os.listdir(entree)]
+        else:
+            candidats = glob.glob(entree, recursive=True)
+        for chemin in candidats:
+            # Fichiers temporaires d'Excel (~$classeur.xlsx) ignorés
+            if (os.path.isfile(chemin) and chemin.lower().endswith(EXTENSIONS)
+                    and not os.path.basename(chemin).startswith('~$')):
+                fichiers.add(os.path.abspath(chemin))
+    return sorted(fichiers)
+
+def signature_fichier(chemin):
+    """Taille et date de modification d'un fichier : un changement invalide son résultat"""
+    etat = os.stat(chemin)
+    return f"{etat.st_size}:{etat.st_mtime_ns}"
+
+def lire_resultats(sortie):
+    """Résultats déjà consolidés, indexés par fichier (dernière ligne retenue)"""
+    if not os.path.exists(sortie):
+        return {}
+    with open(sortie, newline='', encoding='utf-8') as f:
+        return {ligne['fichier']: ligne for ligne in csv.DictReader(f)}
+
+def ecrire_resultats(sortie, resultats):
+    """Réécrit le fichier consolidé, une ligne par fichier analysé"""
+    temporaire = sortie + '.tmp'
+    with open(temporaire, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=COLONNES_SORTIE)
+        writer.writeheader()
+        for fichier in sorted(resultats):
+            writer.writerow(resultats[fichier])
+    os.replace(temporaire, sortie)
+
+def analyser_fichier(chemin, options):
+    """
+    Analyse un fichier : détection des colonnes, puis recherche de la meilleure période
+    glissante et du meilleur modèle. Exécutée dans un processus du pool.
+
+    Parameters:
+    chemin (str): Fichier de données (Excel, CSV, Parquet ou Arrow)
+    options (dict): Paramètres de la recherche (voir main)
+
+    Returns:
+    dict: Ligne du fichier consolidé (COLONNES_SORTIE)
+    """
+    ligne = {'fichier': chemin, 'signature': signature_fichier(chemin),
+             'parametres': json.dumps(options, sort_keys=True, ensure_ascii=False)}
+    try:
+        if options['agregation']:
+            # Relevés à pas de temps fin, lus par blocs depuis le disque et agrégés
+            df, date_col, conso_col = agreger_intervalles(chemin, chemin, pas=AGREGATIONS[options['agregation']])
+        else:
+            with open(chemin, 'rb') as f:
+                df = lire_donnees(f.read(), chemin)
+            date_col, conso_col = detecter_colonnes(df)
+        if not date_col or not conso_col:
+            return {**ligne, 'statut': 'erreur', 'message': "Colonnes de date ou de consommation non détectées"}
+
+        df = typer_colonnes(df, date_col, conso_col)
+        df[date_col] = pd.to_datetime(df[date_col])
+        df = df.sort_values(by=date_col)
+        variables = options['variables'] or variables_candidates(df, date_col, conso_col)
+        manquantes = [v for v in variables if v not in df.columns]
+        if manquantes:
+            return {**ligne, 'statut': 'erreur', 'colonne_date': date_col, 'colonne_conso': conso_col,
+                    'message': f"Variables absentes : {', '.join(map(str, manquantes))}"}
+
+        ligne.update({'colonne_date': date_col, 'colonne_conso': conso_col,
+                      'variables': json.dumps(list(map(str, variables)), ensure_ascii=False)})
+        periodes = periodes_glissantes(df[date_col], mois=options['mois'])
+        if not periodes:
+            return {**ligne, 'statut': 'erreur', 'message': f"Moins de {options['mois']} mois de données"}
+
+        recherche = rechercher_modeles(
+            df[variables].apply(pd.to_numeric, errors='coerce'), pd.to_numeric(df[conso_col], errors='coerce'),
+            types_modeles_a_tester(TYPES_MODELES[options['modele']]), options['max_features'],
+            dates=df[date_col], periodes=periodes, recherche_bb=options['recherche_bb']
+        )
+    except Exception as e:
+        return {**ligne, 'statut': 'erreur', 'message': str(e)}
+
+    meilleur = recherche['meilleur']
+    if meilleur is None:
+        return {**ligne, 'statut': 'aucun modèle', 'message': "Aucun modèle valide sur les périodes analysées"}
+
+    model_info = meilleur['model_info']
+    ligne.update({
+        'statut': 'ok',
+        'periode': meilleur['period'],
+        'debut': meilleur['debut'].strftime('%Y-%m-%d'),
+        'fin': meilleur['fin'].strftime('%Y-%m-%d'),
+        'nb_points': meilleur['hi'] - meilleur['lo'],
+        'model_type': model_info['model_type'],
+        'model_name': model_info['model_name'],
+        'features': json.dumps(list(map(str, model_info['features'])), ensure_ascii=False),
+        'r2': model_info['r2'],
+        'rmse': model_info['rmse'],
+        'cv_rmse': model_info['cv_rmse'],
+        'mae': model_info['mae'],
+        'bias': model_info['bias'],
+        'conformite': model_info['conformite'],
+        'intercept': model_info['intercept'],
+        'coefficients': json.dumps({str(k): float(v) for k, v in model_info['coefficients'].items()},
+                                   ensure_ascii=False)
+    })
+    return ligne
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Recherche en lot des modèles IPMVP (meilleure période glissante et meilleur modèle) "
+                    "pour un ensemble de fichiers de données (Excel, CSV, Parquet, Arrow)."
+    )
+    parser.add_argument('entrees', nargs='+', help="Répertoires, motifs glob ou fichiers de données à analyser")
+    parser.add_argument('--sortie', default='resultats_ipmvp.csv', help="Fichier CSV consolidé des résultats")
+    parser.add_argument('--modele', choices=sorted(TYPES_MODELES), default='auto', help="Type de modèle à tester")
+    parser.add_argument('--max-features', type=int, default=2, help="Nombre maximum de variables par modèle")
+    parser.add_argument('--mois', type=int, default=12, help="Durée des périodes glissantes en mois")
+    parser.add_argument('--variables', nargs='*', default=None,
+                        help="Variables explicatives (par défaut, toutes les colonnes numériques)")
+    parser.add_argument('--recherche-bb', action='store_true', help="Recherche branch-and-bound")
+    parser.add_argument('--agregation', choices=sorted(AGREGATIONS), default=None,
+                        help="Agrège des relevés à pas de temps fin (15 min, horaire) en totaux journaliers ou mensuels")
+    parser.add_argument('--processus', type=int, default=None,
+                        help="Nombre de processus (par défaut, nombre de cœurs)")
+    parser.add_argument('--forcer', action='store_true', help="Réanalyser les fichiers listés, même déjà à jour")
+    args = parser.parse_args(argv)
+
+    options = {
+        'modele': args.modele,
+        'max_features': args.max_features,
+        'mois': args.mois,
+        'variables': args.variables,
+        'recherche_bb': args.recherche_bb,
+        'agregation': args.agregation
+    }
+    parametres = json.dumps(options, sort_keys=True, ensure_ascii=False)
+
+    # Le fichier consolidé, lui-même un CSV, peut se trouver dans un répertoire analysé
+    fichiers = [chemin for chemin in lister_fichiers(args.entrees) if chemin != os.path.abspath(args.sortie)]
+    if not fichiers:
+        print("Aucun fichier de données trouvé.", file=sys.stderr)
+        return 1
+
+    # Reprise : un fichier est à jour si sa signature et les paramètres n'ont pas changé
+    # et que son analyse n'a pas échoué (une erreur peut être passagère). Les lignes des
+    # fichiers hors de cette exécution sont conservées, y compris avec --forcer
+    resultats = lire_resultats(args.sortie)
+    a_analyser = [
+        chemin for chemin in fichiers
+        if args.forcer
+        or chemin not in resultats
+        or resultats[chemin]['signature'] != signature_fichier(chemin)
+        or resultats[chemin]['parametres'] != parametres
+        or resultats[chemin]['statut'] == 'erreur'
+    ]
+    print(f"{len(fichiers)} fichiers, {len(fichiers) - len(a_analyser)} déjà à jour, {len(a_analyser)} à analyser")
+
+    with ProcessPoolExecutor(max_workers=args.processus or os.cpu_count()) as executeur:
+        futures = {executeur.submit(analyser_fichier, chemin, options): chemin for chemin in a_analyser}
+        for i, future in enumerate(as_completed(futures), start=1):
+            try:
+                ligne = future.result()
+            except Exception as e:
+                # Processus de calcul interrompu (BrokenProcessPool...) : les autres résultats
+                # sont conservés, le fichier sera réanalysé à la prochaine exécution
+                chemin = futures[future]
+                ligne = {'fichier': chemin, 'signature': signature_fichier(chemin), 'parametres': parametres,
+                         'statut': 'erreur', 'message': f"{type(e).__name__} : {e}"}
+            resultats[ligne['fichier']] = ligne
+            print(f"[{i}/{len(a_analyser)}] {ligne['statut']} : {ligne['fichier']}")
+            # Fichier consolidé réécrit après chaque analyse : une interruption ne perd rien
+            ecrire_resultats(args.sortie, resultats)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,695 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import combinations
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import scipy.stats as stats
+from sklearn.linear_model import Ridge, Lasso
+from sklearn.metrics import r2_score, mean_absolute_error
+
+from chronometrage import Chronometre, chronometrer_iteration, etape
+from classement import ClassementModeles
+from regularisation import LassoChemin, RidgeGCV, supports_chemin_lasso
+from moteur_regression import (BanquePolynomiale, FenetresGlissantes, MatriceGram, evaluer_lot_polynomial,
+                               extraire_resultat, meilleurs_sous_ensembles)
+from points_rupture import FORMES, ajuster_points_rupture
+
+# Évaluation des modèles candidats et moteur de recherche IPMVP, indépendants de Streamlit
+# Ce module est utilisé par les applications, les outils en lot et les processus de calcul parallèle.
+
+
+# Fonction pour calculer les valeurs t-stat pour les coefficients
+def calculate_t_stats(X, y, model, coefs):
+    """
+    Calcule les valeurs t-stat pour les coefficients de régression.
+
+    La matrice de variance est obtenue à partir de la factorisation QR de [1, X] (constante
+    incluse), sans inverser XᵀX ; les p-values sont calculées sur tout le tableau à la fois.
+    Les modèles linéaires évalués par lot disposent déjà de ces valeurs (voir extraire_resultat).
+
+    Parameters:
+    X (pandas.DataFrame): Variables explicatives
+    y (pandas.Series): Variable cible
+    model: Modèle de régression ajusté
+    coefs (dict): Dictionnaire des coefficients
+
+    Returns:
+    dict: Dictionnaire des valeurs t-stat et p-values pour chaque variable
+    """
+    # Ne s'applique qu'aux modèles linéaires standards
+    if not hasattr(model, 'coef_'):
+        # Pour les modèles non standards comme les polynomiaux via Pipeline
+        return {feature: None for feature in coefs.keys()}
+
+    # Résidus du modèle ajusté
+    residuals = np.asarray(y, dtype=float) - model.predict(X)
+
+    # Degrés de liberté et MSE
+    n = len(y)
+    p = len(model.coef_)
+    df = n - p - 1
+    if df <= 0:  # Éviter division par zéro ou valeurs négatives
+        return {feature: None for feature in coefs.keys()}
+
+    mse = np.sum(residuals ** 2) / df
+
+    try:
+        # [1, X] = Q·R, donc (ZᵀZ)⁻¹ = R⁻¹·R⁻ᵀ : sa diagonale est la somme des carrés des lignes de R⁻¹
+        valeurs = np.asarray(X, dtype=float)
+        Z = np.column_stack([np.ones(n), valeurs - valeurs.mean(axis=0)])
+        R = np.linalg.qr(Z, mode='r')
+        diag = np.abs(np.diagonal(R))
+        if diag.min() <= 1e-10 * diag.max():
+            raise np.linalg.LinAlgError("Variables colinéaires")
+        R_inv = np.linalg.solve(R, np.eye(len(R)))
+
+        # Erreurs standard
+        se = np.sqrt((R_inv[1:] ** 2).sum(axis=1) * mse)
+
+        # Calcul des valeurs t et des p-values
+        t_stats = np.asarray(model.coef_, dtype=float) / se
+        p_values = 2 * stats.t.sf(np.abs(t_stats), df)
+
+        # Créer un dictionnaire des valeurs t et p-values
+        result = {}
+        for i, feature in enumerate(X.columns):
+            result[feature] = {
+                't_value': t_stats[i],
+                'p_value': p_values[i],
+                'significant': p_values[i] < 0.05  # Significatif au niveau 5%
+            }
+
+        return result
+    except Exception:
+        # En cas d'erreur, retourner None pour toutes les variables
+        return {feature: None for feature in X.columns}
+
+# Fonction pour évaluer la conformité IPMVP
+def evaluer_conformite(r2, cv_rmse):
+    if r2 >= 0.75 and cv_rmse <= 0.15:
+        return "Excellente", "good"
+    elif r2 >= 0.5 and cv_rmse <= 0.25:
+        return "Acceptable", "medium"
+    else:
+        return "Insuffisante", "bad"
+
+def types_modeles_a_tester(model_type, alpha_ridge=None, alpha_lasso=None, poly_degree=2):
+    """
+    Liste des types de modèles à tester pour le choix fait dans l'interface.
+    Un alpha Ridge à None est choisi par GCV sur le chemin Ridge complet, à l'échelle des
+    variables standardisées (il n'est pas comparable à un alpha fixé) ; un alpha Lasso
+    à None remplace les ajustements par combinaison par un chemin Lasso par période.
+    Les modèles à points de rupture (3P, 4P, 5P) ne portent que sur une variable.
+
+    Returns:
+    list: Tuples (type, nom affiché, paramètres)
+    """
+    if model_type == "Automatique (meilleur modèle)":
+        return [
+            ("Linéaire", "Régression linéaire", {}),
+            ("Ridge", "Régression Ridge (α GCV, variables standardisées)", {'alpha': None}),
+            ("Lasso", "Régression Lasso (chemin α)", {'alpha': None}),
+            ("Polynomiale", "Régression polynomiale (degré 2)", {'degree': 2}),
+            *types_points_rupture()
+        ]
+    if model_type == "Ridge":
+        if alpha_ridge is None:
+            return [("Ridge", "Régression Ridge (α GCV, variables standardisées)", {'alpha': None})]
+        return [("Ridge", f"Régression Ridge (α={alpha_ridge})", {'alpha': alpha_ridge})]
+    if model_type == "Lasso":
+        if alpha_lasso is None:
+            return [("Lasso", "Régression Lasso (chemin α)", {'alpha': None})]
+        return [("Lasso", f"Régression Lasso (α={alpha_lasso})", {'alpha': alpha_lasso})]
+    if model_type == "Polynomiale":
+        return [("Polynomiale", f"Régression polynomiale (degré {poly_degree})", {'degree': poly_degree})]
+    if model_type == "Points de rupture":
+        return types_points_rupture()
+    return [("Linéaire", "Régression linéaire", {})]
+
+def types_points_rupture():
+    """Modèles à points de rupture (ASHRAE) : 3P chauffage et climatisation, 4P, 5P"""
+    return [("Point de rupture", f"Modèle {forme} (point de rupture)", {'forme': forme}) for forme in FORMES]
+
+def degre_polynomial(types_modeles):
+    """Degré des modèles polynomiaux à tester (None si aucun), pour dimensionner la BanquePolynomiale"""
+    degres = [params.get('degree', 2) for m_type, _, params in types_modeles if m_type == "Polynomiale"]
+    return max(degres) if degres else None
+
+def creer_modele(m_type, params):
+    """Crée l'estimateur d'un type de modèle (None pour les modèles linéaires et polynomiaux, résolus par Gram)"""
+    if m_type == "Ridge":
+        if params.get('alpha') is None:
+            return RidgeGCV()
+        return Ridge(alpha=params['alpha'])
+    if m_type == "Lasso":
+        if params.get('alpha') is None:
+            return LassoChemin()
+        return Lasso(alpha=params['alpha'])
+    return None
+
+def lasso_sur_chemin(types_modeles):
+    """Indique si le Lasso est évalué par chemin (une fois par période) plutôt que par combinaison"""
+    return any(m_type == "Lasso" and params.get('alpha') is None for m_type, _, params in types_modeles)
+
+def types_par_combinaison(types_modeles):
+    """Types de modèles ajustés séparément sur chaque combinaison de variables"""
+    return [(m_type, m_name, params) for m_type, m_name, params in types_modeles
+            if not (m_type == "Lasso" and params.get('alpha') is None)]
+
+def evaluer_modele(X_subset, y, combo, m_type, m_name, period_name, params=None, resultat_gram=None,
+                   modele_ajuste=None, chronometre=None):
+    """
+    Ajuste un modèle candidat et calcule ses métriques IPMVP.
+
+    Parameters:
+    X_subset (pandas.DataFrame): Variables de la combinaison
+    y (pandas.Series): Consommation
+    combo (tuple): Combinaison de variables
+    m_type (str): Type de modèle ("Linéaire", "Ridge", "Lasso", "Polynomiale", "Point de rupture")
+    m_name (str): Nom affiché du modèle
+    period_name (str): Nom de la période analysée
+    params (dict): Paramètres du modèle (alpha, degré, forme du modèle à points de rupture)
+    resultat_gram (dict): Résultat déjà calculé par la matrice de Gram (modèles linéaires et polynomiaux)
+                          ou par la recherche sur grille (modèles à points de rupture)
+    modele_ajuste: Modèle déjà ajusté, évalué sans nouvel ajustement (supports du chemin Lasso)
+    chronometre (Chronometre): Mesure des étapes d'ajustement et de calcul des valeurs t
+
+    Returns:
+    tuple: (informations du modèle, modèle ajusté)
+    """
+    with etape(chronometre, "ajustement des modèles"):
+        if m_type in ["Linéaire", "Polynomiale", "Point de rupture"]:
+            if resultat_gram is None and m_type == "Point de rupture":
+                if len(combo) != 1:
+                    raise ValueError("Les modèles à points de rupture ne portent que sur une variable")
+                resultat_gram = ajuster_points_rupture(X_subset[combo[0]], y, (params or {}).get('forme', '3P chauffage'))
+                if resultat_gram is None:
+                    raise ValueError("Pas assez d'observations de part et d'autre des points de rupture")
+            elif resultat_gram is None and m_type == "Linéaire":
+                resultat_gram = MatriceGram(X_subset, y).ajuster(combo)
+            elif resultat_gram is None:
+                degre = (params or {}).get('degree', 2)
+                banque = BanquePolynomiale(X_subset[list(combo)], degre)
+                lot = evaluer_lot_polynomial(MatriceGram(banque.donnees, y), [combo], degre, banque.centres)
+                resultat_gram = extraire_resultat(lot, 0)
+            model = resultat_gram['model']
+            y_pred = model.predict(X_subset)
+            r2 = resultat_gram['r2']
+            rmse = resultat_gram['rmse']
+            mae = np.mean(np.abs(y - y_pred))
+            cv_rmse = resultat_gram['cv_rmse']
+            bias = resultat_gram['bias']
+        else:
+            if modele_ajuste is None:
+                model = creer_modele(m_type, params or {})
+                model.fit(X_subset, y)
+            else:
+                model = modele_ajuste
+            y_pred = model.predict(X_subset)
+            r2 = r2_score(y, y_pred)
+
+            # RMSE corrigé selon IPMVP
+            n = len(y)
+            p = len(combo)
+            ssr = np.sum((y - y_pred) ** 2)
+            df_res = n - p - 1 if (n - p - 1) > 0 else 1
+            rmse = math.sqrt(ssr / df_res)
+            mae = mean_absolute_error(y, y_pred)
+            cv_rmse = rmse / np.mean(y) if np.mean(y) != 0 else float('inf')
+            bias = np.mean(y_pred - y) / np.mean(y) * 100
+
+        # Récupération des coefficients selon le type de modèle
+        if m_type in ["Polynomiale", "Point de rupture"]:
+            coefs = {terme: coef for terme, coef in zip(model.termes_, model.coef_)}
+            intercept = model.intercept_
+        else:
+            coefs = {feature: coef for feature, coef in zip(combo, model.coef_)}
+            intercept = model.intercept_
+
+    # Calcul des valeurs t de Student
+    if m_type == "Linéaire":
+        t_stats = resultat_gram['t_stats']
+    elif m_type in ["Ridge", "Lasso"]:
+        with etape(chronometre, "t de Student"):
+            t_stats = calculate_t_stats(X_subset, y, model, coefs)
+    else:
+        t_stats = {feature: None for feature in combo}
+
+    # Statut de conformité IPMVP
+    conformite, classe = evaluer_conformite(r2, cv_rmse)
+
+    model_info = {
+        'features': list(combo),
+        'r2': r2,
+        'rmse': rmse,
+        'cv_rmse': cv_rmse,
+        'mae': mae,
+        'bias': bias,
+        'coefficients': coefs,
+        'intercept': intercept,
+        'conformite': conformite,
+        'classe': classe,
+        'model_type': m_type,
+        'forme': (params or {}).get('forme', '') if m_type == "Point de rupture" else '',
+        'model_name': m_name,
+        'period': period_name,
+        't_stats': t_stats
+    }
+    return model_info, model
+
+def evaluer_chemin_lasso(X, y, max_features, period_name):
+    """
+    Évalue les supports successifs du chemin Lasso d'une période.
+
+    Le chemin est calculé une seule fois sur toutes les variables candidates ; chaque ensemble
+    de variables actives d'au plus max_features variables est ensuite soumis aux critères IPMVP.
+
+    Parameters:
+    X (pandas.DataFrame): Variables explicatives candidates
+    y (pandas.Series): Consommation
+    max_features (int): Nombre maximum de variables par modèle
+    period_name (str): Nom de la période analysée
+
+    Returns:
+    list: Tuples (informations du modèle, modèle ajusté)
+    """
+    resultats = []
+    if X.shape[1] == 0:
+        return resultats
+    for support, modele in supports_chemin_lasso(X, y, max_features):
+        try:
+            resultats.append(evaluer_modele(X[list(support)], y, support, "Lasso",
+                                            f"Régression Lasso (chemin, α={modele.alpha_:.3g}, variables standardisées)",
+                                            period_name, modele_ajuste=modele))
+        except Exception:
+            continue
+    return resultats
+
+
+def _est_eligible(model_info, criteres):
+    """Indique si un modèle satisfait les critères pour devenir le meilleur modèle (None : aucun critère)"""
+    if not criteres:
+        return True
+    return (model_info['r2'] > criteres.get('r2_min', -np.inf)
+            and abs(model_info['cv_rmse']) < criteres.get('cv_rmse_max', np.inf)
+            and abs(model_info['bias']) < criteres.get('biais_max', np.inf))
+
+def _evaluer_combinaisons(X, y, gram, combos, types_modeles, nom, centres, classement, criteres=None,
+                          chronometre=None):
+    """
+    Évalue toutes les combinaisons × types de modèles (ajustés par combinaison) d'une fenêtre.
+
+    Les modèles linéaires et polynomiaux d'une même taille sont résolus par lot à partir de la
+    matrice de Gram ; chaque modèle est proposé au classement.
+
+    Parameters:
+    X (pandas.DataFrame): Colonnes de la fenêtre (banque polynomiale le cas échéant)
+    y (pandas.Series): Consommation de la fenêtre
+    gram (MatriceGram): Produits croisés de la fenêtre, sur les colonnes de X
+    combos (list): Combinaisons de variables à évaluer
+    types_modeles (list): Types de modèles (voir types_par_combinaison)
+    nom (str): Nom de la période
+    centres (dict): Centres de la banque polynomiale (modèles polynomiaux)
+    classement (ClassementModeles): Classement auquel proposer les modèles
+    criteres (dict): Critères d'éligibilité du meilleur modèle (voir rechercher_modeles)
+    chronometre (Chronometre): Mesure des étapes de résolution, d'ajustement et de calcul des valeurs t
+
+    Returns:
+    tuple: (informations du modèle, modèle) du meilleur modèle éligible, ou None
+    """
+    meilleur = None
+
+    # Regrouper les combinaisons par taille pour la résolution vectorisée des modèles linéaires
+    par_taille = {}
+    for combo in combos:
+        par_taille.setdefault(len(combo), []).append(combo)
+
+    for combos_n in par_taille.values():
+        with etape(chronometre, "résolution par lot (Gram)"):
+            lot_lineaire = None
+            if any(m_type == "Linéaire" for m_type, _, _ in types_modeles):
+                lot_lineaire = gram.evaluer_lot(combos_n)
+            lots_polynomiaux = {
+                params.get('degree', 2): evaluer_lot_polynomial(gram, combos_n, params.get('degree', 2), centres)
+                for m_type, _, params in types_modeles if m_type == "Polynomiale"
+            }
+
+        for i_combo, combo in enumerate(combos_n):
+            X_subset = X[list(combo)]
+            for m_type, m_name, params in types_modeles:
+                # Modèles à points de rupture : combinaisons d'une seule variable
+                if m_type == "Point de rupture" and len(combo) != 1:
+                    continue
+                try:
+                    if m_type == "Linéaire":
+                        resultat_gram = extraire_resultat(lot_lineaire, i_combo)
+                    elif m_type == "Polynomiale":
+                        resultat_gram = extraire_resultat(lots_polynomiaux[params.get('degree', 2)], i_combo)
+                    else:
+                        resultat_gram = None
+                    model_info, model = evaluer_modele(X_subset, y, combo, m_type, m_name,
+                                                       nom, params, resultat_gram, chronometre=chronometre)
+                except Exception:
+                    continue
+                classement.ajouter(model_info)
+                if _est_eligible(model_info, criteres) and (meilleur is None or model_info['r2'] > meilleur[0]['r2']):
+                    meilleur = (model_info, model)
+
+    return meilleur
+
+
+#####################################
+# CALCUL PARALLÈLE
+#####################################
+
+# Données partagées attachées une seule fois par processus de calcul
+_DONNEES_PARTAGEES = {}
+
+def _initialiser_processus(nom_memoire, forme, colonnes):
+    """Attache le tableau [X, y] en mémoire partagée dans un processus de calcul"""
+    memoire = shared_memory.SharedMemory(name=nom_memoire)
+    _DONNEES_PARTAGEES['memoire'] = memoire
+    _DONNEES_PARTAGEES['donnees'] = np.ndarray(forme, dtype=np.float64, buffer=memoire.buf)
+    _DONNEES_PARTAGEES['colonnes'] = colonnes
+
+def _evaluer_tache(tache):
+    """
+    Évalue un lot de (combinaisons × types de modèles) sur une fenêtre.
+
+    Seuls le meilleur modèle, le classement local et les mesures de durée du lot sont
+    renvoyés au processus principal, pour limiter les échanges.
+    """
+    donnees = _DONNEES_PARTAGEES['donnees'][tache['lo']:tache['hi']]
+    colonnes = _DONNEES_PARTAGEES['colonnes']
+    X = pd.DataFrame(donnees[:, :-1], columns=colonnes)
+    y = pd.Series(donnees[:, -1])
+    gram = MatriceGram.depuis_produits(tache['G'], colonnes, tache['decalage'])
+
+    classement = ClassementModeles(taille=tache['taille_classement'])
+    chronometre = Chronometre() if tache['chronometrer'] else None
+    meilleur = _evaluer_combinaisons(X, y, gram, tache['combos'], tache['types_modeles'], tache['nom'],
+                                     tache['centres'], classement, tache['criteres'], chronometre)
+
+    mesures = chronometre.resume() if chronometre is not None else None
+    return tache['id_tache'], tache['id_fenetre'], meilleur, classement.meilleurs(), len(tache['combos']), mesures
+
+def rechercher_en_parallele(X, y, fenetres, types_modeles, max_features, classement,
+                            recherche_bb=False, max_workers=None, progression=None, taille_lot=256,
+                            banque=None, criteres=None, chronometre=None):
+    """
+    Répartit l'espace (fenêtre × combinaison × type de modèle) sur un pool de processus.
+
+    Les données numériques [X, y] sont copiées une seule fois en mémoire partagée ; chaque
+    tâche ne transporte que ses bornes de fenêtre, sa matrice de Gram et ses combinaisons.
+
+    Parameters:
+    X (pandas.DataFrame): Variables explicatives numériques (toutes les lignes), ou colonnes
+                          de la banque polynomiale si banque est fournie
+    y (pandas.Series): Consommation numérique (toutes les lignes)
+    fenetres (list): Tuples (nom, lo, hi, gram) des fenêtres valides (positions de lignes),
+                     les matrices de Gram portant sur les colonnes de X
+    types_modeles (list): Types de modèles (voir types_modeles_a_tester)
+    max_features (int): Nombre maximum de variables par combinaison
+    classement (ClassementModeles): Classement dans lequel fusionner les résultats
+    recherche_bb (bool): Ne tester que le meilleur sous-ensemble de chaque taille (branch-and-bound)
+    max_workers (int): Nombre de processus (par défaut, nombre de cœurs)
+    progression (callable): Fonction appelée avec la fraction de combinaisons évaluées
+    taille_lot (int): Nombre de combinaisons par tâche
+    banque (BanquePolynomiale): Banque dont X est l'expansion (requise pour les modèles polynomiaux)
+    criteres (dict): Critères d'éligibilité du meilleur modèle (voir rechercher_modeles)
+    chronometre (Chronometre): Mesure des étapes, y compris celles des processus de calcul
+
+    Returns:
+    tuple: (meilleur modèle {'fenetre', 'model', 'model_info'} ou None, statistiques branch-and-bound)
+    """
+    if banque is None and degre_polynomial(types_modeles):
+        raise ValueError("Les modèles polynomiaux nécessitent la banque de termes (paramètre banque)")
+    colonnes = list(X.columns)
+    candidats = banque.features if banque is not None else colonnes
+    centres = banque.centres if banque is not None else None
+    donnees = np.ascontiguousarray(np.column_stack([np.asarray(X, dtype=float).reshape(len(y), -1),
+                                                    np.asarray(y, dtype=float)]))
+    stats_bb = {'evalues': 0, 'elagues': 0, 'total': 0}
+    meilleur = None
+    types_combinaisons = types_par_combinaison(types_modeles)
+    # Modèles à ajouter au classement, indexés par (fenêtre, tâche ; -1 pour le chemin Lasso)
+    ajouts = {}
+
+    # Découpage en tâches : une fenêtre, un lot de combinaisons, tous les types de modèles
+    taches = []
+    for id_fenetre, (nom, lo, hi, gram) in enumerate(fenetres):
+        # Le chemin Lasso est calculé une fois par fenêtre, directement dans le processus principal
+        if lasso_sur_chemin(types_modeles):
+            with etape(chronometre, "chemin Lasso"):
+                chemin = evaluer_chemin_lasso(X.iloc[lo:hi][candidats], y.iloc[lo:hi], max_features, nom)
+            ajouts[(id_fenetre, -1)] = [model_info for model_info, _ in chemin]
+            for model_info, model in chemin:
+                if not _est_eligible(model_info, criteres):
+                    continue
+                score = (model_info['r2'], -len(taches))
+                if meilleur is None or score > meilleur['score']:
+                    meilleur = {'fenetre': id_fenetre, 'model_info': model_info,
+                                'model': model, 'score': score}
+        if not types_combinaisons:
+            continue
+
+        if recherche_bb:
+            with etape(chronometre, "branch-and-bound"):
+                meilleurs_bb, stats_fenetre = meilleurs_sous_ensembles(gram, candidats, max_features)
+            for cle in stats_bb:
+                stats_bb[cle] += stats_fenetre[cle]
+            combos = [meilleurs_bb[n] for n in sorted(meilleurs_bb)]
+        else:
+            combos = [combo for n in range(1, max_features + 1) for combo in combinations(candidats, n)]
+
+        for debut in range(0, len(combos), taille_lot):
+            taches.append({
+                'id_tache': len(taches),
+                'id_fenetre': id_fenetre,
+                'nom': nom,
+                'lo': lo,
+                'hi': hi,
+                'G': gram.G,
+                'decalage': gram.decalage,
+                'combos': combos[debut:debut + taille_lot],
+                'types_modeles': types_combinaisons,
+                'centres': centres,
+                'criteres': criteres,
+                'chronometrer': chronometre is not None,
+                'taille_classement': classement.taille
+            })
+
+    total = sum(len(tache['combos']) for tache in taches)
+    if not taches:
+        _ajouter_dans_l_ordre(classement, ajouts)
+        return meilleur, stats_bb
+
+    memoire = shared_memory.SharedMemory(create=True, size=max(donnees.nbytes, 1))
+    try:
+        np.ndarray(donnees.shape, dtype=np.float64, buffer=memoire.buf)[:] = donnees
+
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(),
+                                 initializer=_initialiser_processus,
+                                 initargs=(memoire.name, donnees.shape, colonnes)) as executeur:
+            futures = [executeur.submit(_evaluer_tache, tache) for tache in taches]
+            evalues = 0
+            for future in as_completed(futures):
+                id_tache, id_fenetre, meilleur_tache, classement_tache, nb_combos, mesures = future.result()
+
+                # Fusion dans les structures du processus principal
+                ajouts[(id_fenetre, id_tache)] = classement_tache
+                if chronometre is not None:
+                    # Durées cumulées sur tous les processus (supérieures à la durée écoulée)
+                    chronometre.fusionner(mesures)
+
+                # À R² égal, la tâche la plus précoce l'emporte, comme en calcul séquentiel
+                if meilleur_tache is not None:
+                    score = (meilleur_tache[0]['r2'], -id_tache)
+                    if meilleur is None or score > meilleur['score']:
+                        meilleur = {'fenetre': id_fenetre, 'model_info': meilleur_tache[0],
+                                    'model': meilleur_tache[1], 'score': score}
+
+                evalues += nb_combos
+                if progression:
+                    progression(evalues / total)
+    finally:
+        memoire.close()
+        memoire.unlink()
+
+    _ajouter_dans_l_ordre(classement, ajouts)
+    return meilleur, stats_bb
+
+def _ajouter_dans_l_ordre(classement, ajouts):
+    """
+    Ajoute au classement les modèles reçus des tâches dans l'ordre du calcul séquentiel
+    (fenêtre par fenêtre, chemin Lasso puis lots de combinaisons), et non dans l'ordre
+    d'arrivée : à R² égal, le classement retient le premier modèle proposé.
+    """
+    for cle in sorted(ajouts):
+        for model_info in ajouts[cle]:
+            classement.ajouter(model_info)
+
+
+#####################################
+# MOTEUR DE RECHERCHE
+#####################################
+
+def periodes_glissantes(dates, mois=12):
+    """
+    Périodes de `mois` mois consécutifs, décalées d'un mois, couvrant les dates disponibles.
+
+    Parameters:
+    dates (pandas.Series): Dates des observations
+    mois (int): Durée de chaque période en mois
+
+    Returns:
+    list: Tuples (nom, début, fin)
+    """
+    periodes = []
+    min_date = dates.min()
+    max_date = dates.max()
+    current_date = min_date
+
+    while current_date + pd.DateOffset(months=mois - 1) <= max_date:
+        end_date = current_date + pd.DateOffset(months=mois - 1)
+        period_name = f"{current_date.strftime('%b %Y')} - {end_date.strftime('%b %Y')}"
+        periodes.append((period_name, current_date, end_date))
+        current_date = current_date + pd.DateOffset(months=1)
+    return periodes
+
+def _rechercher_fenetre(X, y, gram, candidats, types_modeles, max_features, nom, centres,
+                        classement, recherche_bb, stats_bb, criteres, chronometre=None):
+    """Recherche séquentielle sur une fenêtre : chemin Lasso, puis combinaisons de variables"""
+    meilleur = None
+
+    # Lasso : un seul chemin à démarrage à chaud sur toutes les variables de la fenêtre
+    if lasso_sur_chemin(types_modeles):
+        with etape(chronometre, "chemin Lasso"):
+            chemin = evaluer_chemin_lasso(X[candidats], y, max_features, nom)
+        for model_info, model in chemin:
+            classement.ajouter(model_info)
+            if _est_eligible(model_info, criteres) and (meilleur is None or model_info['r2'] > meilleur[0]['r2']):
+                meilleur = (model_info, model)
+
+    types_combinaisons = types_par_combinaison(types_modeles)
+    if not types_combinaisons:
+        return meilleur
+
+    if recherche_bb:
+        # Meilleur sous-ensemble exact de chaque taille pour cette fenêtre
+        with etape(chronometre, "branch-and-bound"):
+            meilleurs_bb, stats_fenetre = meilleurs_sous_ensembles(gram, candidats, max_features)
+        for cle in stats_bb:
+            stats_bb[cle] += stats_fenetre[cle]
+        combos = [meilleurs_bb[n] for n in sorted(meilleurs_bb)]
+    else:
+        combos = [combo for n in range(1, max_features + 1) for combo in combinations(candidats, n)]
+
+    meilleur_combinaisons = _evaluer_combinaisons(X, y, gram, combos, types_combinaisons, nom, centres,
+                                                  classement, criteres, chronometre)
+    if meilleur_combinaisons is not None and (meilleur is None or meilleur_combinaisons[0]['r2'] > meilleur[0]['r2']):
+        meilleur = meilleur_combinaisons
+    return meilleur
+
+def rechercher_modeles(X, y, types_modeles, max_features, dates=None, periodes=None,
+                       recherche_bb=False, parallele=False, taille_classement=15,
+                       criteres=None, progression=None, min_points=10, max_workers=None, chronometre=None):
+    """
+    Recherche du meilleur modèle IPMVP, sans interface : données, variables, types de modèles
+    et périodes en entrée, classement des modèles en sortie.
+
+    Sans périodes, toutes les lignes forment une seule période nommée 'selected'. Avec des
+    périodes, les produits croisés sont mis à jour de période en période (FenetresGlissantes).
+
+    Parameters:
+    X (pandas.DataFrame): Variables explicatives candidates (numériques)
+    y (pandas.Series): Consommation (numérique)
+    types_modeles (list): Types de modèles (voir types_modeles_a_tester)
+    max_features (int): Nombre maximum de variables par modèle
+    dates (pandas.Series): Dates des observations, triées (requises avec periodes)
+    periodes (list): Tuples (nom, début, fin) des périodes à analyser (voir periodes_glissantes)
+    recherche_bb (bool): Ne tester que le meilleur sous-ensemble de chaque taille (branch-and-bound)
+    parallele (bool): Répartir les calculs sur un pool de processus
+    taille_classement (int): Nombre de modèles conservés dans le classement
+    criteres (dict): Critères d'éligibilité du meilleur modèle ('r2_min', 'cv_rmse_max',
+                     'biais_max' en %) ; tous les modèles restent proposés au classement
+    progression (callable): Fonction appelée avec (fraction, message) pendant la recherche
+    min_points (int): Nombre minimum d'observations d'une période glissante
+    max_workers (int): Nombre de processus du calcul parallèle (par défaut, nombre de cœurs)
+    chronometre (Chronometre): Mesure des durées et nombres d'appels de chaque étape de la recherche
+
+    Returns:
+    dict: 'meilleur' (None, ou dict avec 'model_info', 'model', 'period', 'debut', 'fin',
+          'lo' et 'hi', positions des lignes de la période), 'classement' (ClassementModeles),
+          'stats_bb' et 'nb_periodes' (périodes effectivement analysées)
+    """
+    candidats = list(X.columns)
+    max_features = min(max_features, len(candidats))
+    classement = ClassementModeles(taille=taille_classement)
+    stats_bb = {'evalues': 0, 'elagues': 0, 'total': 0}
+
+    # Carrés et produits croisés des variables calculés une seule fois si des polynômes sont testés
+    degre = degre_polynomial(types_modeles)
+    with etape(chronometre, "banque polynomiale"):
+        banque = BanquePolynomiale(X, degre) if degre else None
+    X_gram = banque.donnees if banque is not None else X
+    centres = banque.centres if banque is not None else None
+
+    if periodes is None:
+        donnees = np.column_stack([np.asarray(X_gram, dtype=float).reshape(len(y), -1),
+                                   np.asarray(y, dtype=float)])
+        with etape(chronometre, "fenêtres (produits croisés)"):
+            gram = MatriceGram(X_gram, y) if len(y) and np.isfinite(donnees).all() else None
+        fenetres = [('selected', None, None, 0, len(y), gram)]
+        nb_total = 1
+    else:
+        fenetres = (
+            (nom, debut, fin, lo, hi, gram)
+            for nom, debut, fin, lo, hi, gram in chronometrer_iteration(
+                chronometre, "fenêtres (produits croisés)", FenetresGlissantes(dates, X_gram, y).parcourir(periodes)
+            )
+            if hi - lo >= min_points
+        )
+        nb_total = len(periodes)
+
+    meilleur = None
+    nb_periodes = 0
+    if parallele:
+        if progression:
+            progression(0.0, f"Analyse parallèle de {nb_total} périodes...")
+        valides = [fenetre for fenetre in fenetres if fenetre[5] is not None]
+        nb_periodes = len(valides)
+        meilleur_parallele, stats_bb = rechercher_en_parallele(
+            X_gram, y, [(nom, lo, hi, gram) for nom, _, _, lo, hi, gram in valides],
+            types_modeles, max_features, classement, recherche_bb=recherche_bb,
+            max_workers=max_workers, banque=banque, criteres=criteres, chronometre=chronometre,
+            progression=(lambda fraction: progression(fraction, None)) if progression else None
+        )
+        if meilleur_parallele is not None:
+            nom, debut, fin, lo, hi, _ = valides[meilleur_parallele['fenetre']]
+            meilleur = {'model_info': meilleur_parallele['model_info'], 'model': meilleur_parallele['model'],
+                        'period': nom, 'debut': debut, 'fin': fin, 'lo': lo, 'hi': hi}
+    else:
+        for idx, (nom, debut, fin, lo, hi, gram) in enumerate(fenetres):
+            if progression:
+                progression(idx / nb_total, f"Analyse de la période {nom} ({idx + 1}/{nb_total})")
+
+            # Période contenant des valeurs manquantes, infinies ou non numériques
+            if gram is None:
+                continue
+            nb_periodes += 1
+
+            meilleur_fenetre = _rechercher_fenetre(
+                X_gram.iloc[lo:hi], y.iloc[lo:hi], gram, candidats, types_modeles, max_features, nom,
+                centres, classement, recherche_bb, stats_bb, criteres, chronometre
+            )
+            if meilleur_fenetre is not None and (meilleur is None or meilleur_fenetre[0]['r2'] > meilleur['model_info']['r2']):
+                meilleur = {'model_info': meilleur_fenetre[0], 'model': meilleur_fenetre[1],
+                            'period': nom, 'debut': debut, 'fin': fin, 'lo': lo, 'hi': hi}
+        if progression:
+            progression(1.0, None)
+
+    return {'meilleur': meilleur, 'classement': classement, 'stats_bb': stats_bb, 'nb_periodes': nb_periodes}
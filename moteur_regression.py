@@ -0,0 +1,552 @@
+from functools import lru_cache
+from itertools import combinations_with_replacement, product
+from math import comb
+
+import numpy as np
+import pandas as pd
+import scipy.stats as stats
+
+# Moteur de régression par matrice de Gram
+# La matrice des produits croisés augmentée [1, X, y]ᵀ[1, X, y] est construite une seule
+# fois par période : chaque combinaison de variables est ensuite résolue à partir du
+# sous-bloc correspondant, sans repasser sur les lignes des données.
+
+
+class ModeleLineaireGram:
+    """Modèle linéaire ajusté par le moteur Gram (interface compatible scikit-learn)"""
+
+    def __init__(self, coef, intercept, features):
+        self.coef_ = np.asarray(coef, dtype=float)
+        self.intercept_ = float(intercept)
+        self.feature_names_in_ = np.array(list(features), dtype=object)
+
+    def predict(self, X):
+        if hasattr(X, 'columns'):
+            X = X[list(self.feature_names_in_)]
+        return np.asarray(X, dtype=float) @ self.coef_ + self.intercept_
+
+
+@lru_cache(maxsize=4096)
+def termes_polynomiaux(features, degre=2):
+    """
+    Termes d'une expansion polynomiale sans constante, dans l'ordre de PolynomialFeatures.
+
+    Parameters:
+    features (tuple): Variables de départ
+    degre (int): Degré maximum des monômes
+
+    Returns:
+    tuple: (noms des termes, monômes sous forme de tuples de positions dans features)
+    """
+    monomes = tuple(monome for d in range(1, degre + 1)
+                    for monome in combinations_with_replacement(range(len(features)), d))
+    noms = []
+    for monome in monomes:
+        facteurs = []
+        for position in sorted(set(monome)):
+            exposant = monome.count(position)
+            facteurs.append(features[position] if exposant == 1 else f"{features[position]}^{exposant}")
+        noms.append(" ".join(facteurs))
+    return tuple(noms), monomes
+
+
+def _developper(valeurs, monomes, centre):
+    """
+    Calcule les colonnes des monômes à partir d'un tableau (n, p).
+
+    Les monômes de degré 1 sont les variables brutes ; ceux de degré supérieur sont
+    calculés sur les variables centrées, ce qui évite que x et x² soient quasi colinéaires
+    dans les produits croisés. Avec la constante, les deux bases engendrent les mêmes
+    polynômes : seules les valeurs des coefficients diffèrent.
+    """
+    valeurs = np.asarray(valeurs, dtype=float).reshape(len(valeurs), -1)
+    centrees = valeurs - np.asarray(centre, dtype=float)
+    if not monomes:
+        return np.empty((len(valeurs), 0))
+    return np.column_stack([valeurs[:, monome[0]] if len(monome) == 1 else centrees[:, list(monome)].prod(axis=1)
+                            for monome in monomes])
+
+
+def _coefficients_bruts(coef, intercept, monomes, centre):
+    """Réexprime des coefficients de la base centrée (voir _developper) sur les monômes bruts"""
+    positions = {monome: i for i, monome in enumerate(monomes)}
+    bruts = np.zeros(len(monomes))
+    constante = float(intercept)
+    for c, monome in zip(coef, monomes):
+        if len(monome) == 1:
+            bruts[positions[monome]] += c
+            continue
+        # Développement de Π(x_k - c_k) : chaque facteur fournit soit x_k, soit -c_k
+        for choix in product((True, False), repeat=len(monome)):
+            terme = c
+            gardees = []
+            for position, garde in zip(monome, choix):
+                if garde:
+                    gardees.append(position)
+                else:
+                    terme *= -centre[position]
+            if gardees:
+                bruts[positions[tuple(gardees)]] += terme
+            else:
+                constante += terme
+    return bruts, constante
+
+
+class ModelePolynomial:
+    """
+    Modèle polynomial ajusté par le moteur Gram, appliqué directement aux variables de départ.
+
+    coef_ et intercept_ sont exprimés sur les monômes bruts, dans l'ordre de termes_
+    (identique à PolynomialFeatures) ; les prédictions utilisent la base centrée, plus stable.
+    """
+
+    def __init__(self, coef, intercept, features, degre=2, centre=None):
+        """
+        Parameters:
+        coef (array-like): Coefficients des termes dans la base centrée de la banque
+        intercept (float): Constante dans la base centrée
+        features (list): Variables de départ
+        degre (int): Degré du polynôme
+        centre (array-like): Centre de chaque variable (par défaut, zéro)
+        """
+        self.degre = degre
+        self.feature_names_in_ = np.array(list(features), dtype=object)
+        self.termes_, self._monomes = termes_polynomiaux(tuple(features), degre)
+        self._centre = np.zeros(len(features)) if centre is None else np.asarray(centre, dtype=float)
+        self._coef_centre = np.asarray(coef, dtype=float)
+        self._intercept_centre = float(intercept)
+        coef_, intercept_ = _coefficients_bruts(self._coef_centre, self._intercept_centre,
+                                                self._monomes, self._centre)
+        self.coef_ = coef_
+        self.intercept_ = float(intercept_)
+
+    def predict(self, X):
+        if hasattr(X, 'columns'):
+            X = X[list(self.feature_names_in_)]
+        return _developper(X, self._monomes, self._centre) @ self._coef_centre + self._intercept_centre
+
+
+class BanquePolynomiale:
+    """
+    Expansion polynomiale complète de toutes les variables candidates, calculée une seule fois.
+
+    Les termes de degré 1 sont les variables de départ, sous leur nom : la banque remplace
+    donc le tableau des variables partout où une matrice de Gram est construite. Le polynôme
+    d'une combinaison n'est alors qu'un ensemble de colonnes de la banque, résolu comme un
+    modèle linéaire (voir evaluer_lot_polynomial). Les termes de degré supérieur sont des
+    produits de variables centrées sur leur moyenne.
+    """
+
+    def __init__(self, X, degre=2):
+        """
+        Parameters:
+        X (pandas.DataFrame): Variables explicatives candidates
+        degre (int): Degré maximum des monômes
+        """
+        self.features = list(X.columns)
+        self.degre = degre
+        valeurs = np.asarray(X, dtype=float).reshape(len(X), -1)
+        finies = np.where(np.isfinite(valeurs), valeurs, np.nan)
+        with np.errstate(invalid='ignore'):
+            centre = np.nanmean(finies, axis=0) if len(valeurs) else np.zeros(len(self.features))
+        centre = np.nan_to_num(centre)
+        self.centres = dict(zip(self.features, centre))
+        noms, monomes = termes_polynomiaux(tuple(self.features), degre)
+        self.donnees = pd.DataFrame(_developper(valeurs, monomes, centre), index=X.index, columns=list(noms))
+
+    def termes(self, features):
+        """Noms des colonnes de la banque formant le polynôme d'une combinaison"""
+        return list(termes_polynomiaux(tuple(features), self.degre)[0])
+
+
+class MatriceGram:
+    """
+    Matrice des produits croisés augmentée d'une période de données.
+
+    Les colonnes sont décalées de leur moyenne avant le calcul des produits croisés, ce qui
+    limite les pertes de précision sur les grandes consommations sans changer la solution
+    (le décalage est réintégré dans la constante du modèle).
+    """
+
+    def __init__(self, X, y, decalage=None):
+        """
+        Parameters:
+        X (pandas.DataFrame): Variables explicatives candidates
+        y (pandas.Series): Variable cible
+        decalage (array-like): Décalage appliqué à [X, y] (par défaut, les moyennes des colonnes)
+        """
+        self.features = list(X.columns)
+        self.positions = {feature: i + 1 for i, feature in enumerate(self.features)}
+
+        donnees = np.column_stack([np.asarray(X, dtype=float).reshape(len(y), -1),
+                                   np.asarray(y, dtype=float)])
+        if decalage is None:
+            decalage = donnees.mean(axis=0) if len(donnees) else np.zeros(donnees.shape[1])
+        self.decalage = np.asarray(decalage, dtype=float)
+
+        Z = np.column_stack([np.ones(len(donnees)), donnees - self.decalage])
+        self.G = Z.T @ Z
+
+    @classmethod
+    def depuis_produits(cls, G, features, decalage):
+        """Reconstruit une matrice de Gram à partir de produits croisés déjà calculés"""
+        gram = cls.__new__(cls)
+        gram.features = list(features)
+        gram.positions = {feature: i + 1 for i, feature in enumerate(gram.features)}
+        gram.decalage = np.asarray(decalage, dtype=float)
+        gram.G = np.array(G, dtype=float)
+        return gram
+
+    @property
+    def n(self):
+        """Nombre d'observations de la période"""
+        return int(round(self.G[0, 0]))
+
+    def _indices(self, features):
+        return [0] + [self.positions[feature] for feature in features]
+
+    def ajuster(self, features):
+        """
+        Ajuste le modèle linéaire (avec constante) sur une combinaison de variables.
+
+        Parameters:
+        features (list): Variables de la combinaison
+
+        Returns:
+        dict: Coefficients, constante, SSR, R², RMSE (corrigé IPMVP), CV(RMSE), biais (%) et modèle
+        """
+        return extraire_resultat(self.evaluer_lot([list(features)]), 0)
+
+    def ssr(self, features):
+        """Somme des carrés des résidus du modèle linéaire sur une combinaison de variables"""
+        idx = self._indices(features)
+        A = self.G[np.ix_(idx, idx)]
+        b = self.G[idx, -1]
+        beta = np.linalg.lstsq(A, b, rcond=None)[0]
+        return max(self.G[-1, -1] - np.dot(b, beta), 0.0)
+
+    def evaluer_lot(self, combinaisons, correction_ddl=True):
+        """
+        Évalue en un seul appel vectorisé toutes les combinaisons d'une même taille k.
+
+        Les sous-blocs (k+1, k+1) de chaque combinaison sont empilés dans un tableau
+        (n_combinaisons, k+1, k+1) et résolus par un unique appel à np.linalg.solve.
+
+        Parameters:
+        combinaisons (list): Combinaisons de variables, toutes de même taille
+        correction_ddl (bool): RMSE divisé par n - p - 1 (IPMVP) plutôt que par n
+
+        Returns:
+        dict: Tableaux 'r2', 'rmse', 'cv_rmse', 'nmbe', 'ssr', 'coefficients', 'erreurs_types',
+              't_values', 'p_values' (n_combinaisons, k) et 'intercept', ainsi que la liste 'features'
+        """
+        combinaisons = [tuple(c) for c in combinaisons]
+        k = len(combinaisons[0]) if combinaisons else 0
+        idx = np.array([self._indices(c) for c in combinaisons], dtype=int).reshape(len(combinaisons), k + 1)
+
+        A = self.G[idx[:, :, None], idx[:, None, :]]
+        b = self.G[idx, -1]
+        beta, diag_inverse = _resoudre_lot(A, b)
+
+        n = self.G[0, 0]
+        somme_y = self.G[0, -1]
+        yty = self.G[-1, -1]
+
+        ssr = np.maximum(yty - np.einsum('ij,ij->i', b, beta), 0.0)
+        sst = yty - somme_y ** 2 / n
+        if sst > 0:
+            r2 = 1 - ssr / sst
+        else:
+            r2 = np.where(ssr == 0, 1.0, 0.0)
+
+        if correction_ddl:
+            # RMSE corrigé selon IPMVP
+            df_res = n - k - 1 if (n - k - 1) > 0 else 1
+        else:
+            df_res = n
+        rmse = np.sqrt(ssr / df_res)
+        moyenne_y = somme_y / n + self.decalage[-1]
+
+        # Somme des prédictions = première ligne du système normal
+        somme_pred = np.einsum('ij,ij->i', A[:, 0, :], beta)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cv_rmse = rmse / moyenne_y if moyenne_y != 0 else np.full(len(rmse), np.inf)
+            nmbe = (somme_pred - somme_y) / n / moyenne_y if moyenne_y != 0 else np.full(len(rmse), np.inf)
+
+        # Réintégrer le décalage dans la constante
+        coefficients = beta[:, 1:]
+
+        # Statistiques t de Student tirées de la factorisation : Var(β) = σ²·diag(A⁻¹),
+        # avec σ² = SSR / (n - k - 1) ; le décalage ne modifie pas les pentes ni leur variance
+        ddl = n - k - 1
+        if ddl > 0:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                erreurs_types = np.sqrt(np.maximum(diag_inverse[:, 1:], 0.0) * (ssr / ddl)[:, None])
+                t_values = coefficients / erreurs_types
+            p_values = 2 * stats.t.sf(np.abs(t_values), ddl)
+        else:
+            erreurs_types = t_values = p_values = np.full(coefficients.shape, np.nan)
+        decalage_x = self.decalage[idx[:, 1:] - 1]
+        intercept = beta[:, 0] + self.decalage[-1] - np.einsum('ij,ij->i', coefficients, decalage_x)
+
+        return {
+            'features': combinaisons,
+            'r2': r2,
+            'rmse': rmse,
+            'cv_rmse': cv_rmse,
+            'nmbe': nmbe,
+            'ssr': ssr,
+            'coefficients': coefficients,
+            'intercept': intercept,
+            'erreurs_types': erreurs_types,
+            't_values': t_values,
+            'p_values': p_values
+        }
+
+
+class FenetresGlissantes:
+    """
+    Statistiques suffisantes (XᵀX, Xᵀy, yᵀy, Σy) de fenêtres glissantes sur une série datée.
+
+    Deux fenêtres consécutives partagent la plupart de leurs lignes : les produits croisés
+    sont mis à jour en ajoutant les lignes qui entrent et en retirant celles qui sortent,
+    au lieu de refiltrer et recalculer chaque période.
+    """
+
+    # Recalcul complet périodique pour borner l'accumulation des erreurs d'arrondi
+    RECALAGE = 50
+
+    def __init__(self, dates, X, y):
+        """
+        Parameters:
+        dates (pandas.Series): Dates des observations, triées par ordre croissant
+        X (pandas.DataFrame): Variables explicatives (numériques, NaN autorisés)
+        y (pandas.Series): Variable cible (numérique, NaN autorisés)
+        """
+        self.features = list(X.columns)
+        self.dates = np.asarray(pd.to_datetime(dates), dtype='datetime64[ns]')
+
+        donnees = np.column_stack([np.asarray(X, dtype=float).reshape(len(y), -1),
+                                   np.asarray(y, dtype=float)])
+        # Lignes avec valeurs manquantes ou infinies : comptées, mais exclues des produits
+        self.invalides = ~np.isfinite(donnees).all(axis=1)
+        valides = donnees[~self.invalides]
+        self.decalage = valides.mean(axis=0) if len(valides) else np.zeros(donnees.shape[1])
+
+        self.Z = np.column_stack([np.ones(len(donnees)), donnees - self.decalage])
+        self.Z[self.invalides] = 0.0
+
+    def bornes(self, debut, fin):
+        """Positions [lo, hi) des lignes dont la date est comprise entre debut et fin (inclus)"""
+        lo = int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(debut), 'ns'), side='left'))
+        hi = int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(fin), 'ns'), side='right'))
+        return lo, hi
+
+    def parcourir(self, fenetres):
+        """
+        Parcourt des fenêtres ordonnées (début et fin croissants) en mettant à jour les produits.
+
+        Parameters:
+        fenetres (list): Tuples (nom, début, fin)
+
+        Yields:
+        tuple: (nom, début, fin, lo, hi, gram), où gram vaut None si la fenêtre contient
+               des valeurs manquantes ou infinies
+        """
+        G = np.zeros((self.Z.shape[1], self.Z.shape[1]))
+        n_invalides = 0
+        lo_prec, hi_prec = 0, 0
+
+        for i, (nom, debut, fin) in enumerate(fenetres):
+            lo, hi = self.bornes(debut, fin)
+
+            if i % self.RECALAGE == 0 or lo < lo_prec or hi < hi_prec or lo >= hi_prec:
+                # Recalcul complet (première fenêtre, recalage ou fenêtres disjointes)
+                G = self.Z[lo:hi].T @ self.Z[lo:hi]
+                n_invalides = int(self.invalides[lo:hi].sum())
+            else:
+                # Ajouter les lignes entrantes, retirer les lignes sortantes
+                entrantes = self.Z[hi_prec:hi]
+                sortantes = self.Z[lo_prec:lo]
+                G += entrantes.T @ entrantes - sortantes.T @ sortantes
+                n_invalides += int(self.invalides[hi_prec:hi].sum()) - int(self.invalides[lo_prec:lo].sum())
+
+            lo_prec, hi_prec = lo, hi
+
+            gram = None
+            if n_invalides == 0 and hi > lo:
+                gram = MatriceGram.depuis_produits(G, self.features, self.decalage)
+            yield nom, debut, fin, lo, hi, gram
+
+
+def meilleurs_sous_ensembles(gram, candidats, max_features):
+    """
+    Recherche par séparation et évaluation (leaps-and-bounds) du meilleur sous-ensemble
+    de variables pour chaque taille de 1 à max_features.
+
+    La SSR ne peut que diminuer quand on ajoute des variables : la SSR du modèle contenant
+    le nœud courant et toutes les variables restantes minore donc celle de tout le
+    sous-arbre. Si ce minorant n'améliore aucune des tailles atteignables, le sous-arbre
+    entier est élagué sans être évalué. Le résultat reste le meilleur sous-ensemble exact.
+
+    Parameters:
+    gram (MatriceGram): Produits croisés de la période
+    candidats (list): Variables candidates
+    max_features (int): Nombre maximum de variables
+
+    Returns:
+    tuple: ({taille: combinaison}, {'evalues': ..., 'elagues': ..., 'total': ...}), chaque
+           combinaison étant rendue dans l'ordre des candidats (celui des termes de la banque)
+    """
+    ordre = {variable: i for i, variable in enumerate(candidats)}
+    max_features = min(max_features, len(candidats))
+    total = sum(comb(len(candidats), k) for k in range(1, max_features + 1))
+    meilleure_ssr = {k: np.inf for k in range(1, max_features + 1)}
+    meilleurs = {}
+    stats = {'evalues': 0, 'elagues': 0, 'total': total}
+
+    # Meilleures variables en premier : les sous-arbres tardifs ne contiennent plus que des
+    # variables faibles, dont le minorant a le plus de chances de permettre l'élagage
+    candidats = sorted(candidats, key=lambda v: gram.ssr([v]))
+
+    def explorer(courant, restants):
+        for i, variable in enumerate(restants):
+            noeud = courant + (variable,)
+            suite = restants[i + 1:]
+            taille = len(noeud)
+
+            ssr = gram.ssr(noeud)
+            stats['evalues'] += 1
+            if ssr < meilleure_ssr[taille]:
+                meilleure_ssr[taille] = ssr
+                meilleurs[taille] = noeud
+
+            profondeur = min(max_features - taille, len(suite))
+            if profondeur <= 0:
+                continue
+
+            minorant = gram.ssr(noeud + tuple(suite))
+            if all(minorant >= meilleure_ssr[k] for k in range(taille + 1, taille + profondeur + 1)):
+                stats['elagues'] += sum(comb(len(suite), j) for j in range(1, profondeur + 1))
+                continue
+            explorer(noeud, suite)
+
+    explorer((), candidats)
+    # Remettre chaque combinaison dans l'ordre des candidats : les noms des interactions de la
+    # BanquePolynomiale n'existent que dans cet ordre
+    meilleurs = {taille: tuple(sorted(noeud, key=ordre.__getitem__)) for taille, noeud in meilleurs.items()}
+    return meilleurs, stats
+
+
+def _resoudre_lot(A, b, tolerance=1e-10):
+    """
+    Résout les systèmes normaux empilés A·β = b, avec repli pseudo-inverse si colinéarité.
+
+    Chaque bloc est contrôlé séparément : A est ramené à diagonale unité (matrice de
+    corrélation lorsque les colonnes sont centrées), et le bloc est déclaré colinéaire si sa
+    plus petite valeur propre ne dépasse pas tolerance fois la plus grande. Une variable
+    constante ou un doublon exact n'affecte donc que les combinaisons qui le contiennent.
+
+    Returns:
+    tuple: (β, diagonale de A⁻¹) ; la diagonale donne les variances des coefficients
+    """
+    diag_A = np.diagonal(A, axis1=1, axis2=2)
+    nulles = diag_A <= tolerance * diag_A.max(axis=1, keepdims=True)
+    echelle = np.sqrt(np.where(nulles, 1.0, diag_A))
+    valeurs_propres = np.linalg.eigvalsh(A / echelle[:, :, None] / echelle[:, None, :])
+    mal_conditionne = nulles.any(axis=1) | (valeurs_propres[:, 0] <= tolerance * valeurs_propres[:, -1])
+
+    beta = np.empty(b.shape)
+    diag_inverse = np.empty(b.shape)
+    ok = np.flatnonzero(~mal_conditionne)
+    if len(ok):
+        try:
+            L = np.linalg.cholesky(A[ok])
+        except np.linalg.LinAlgError:
+            # Cas limite non détecté par les valeurs propres : factoriser bloc par bloc
+            factorisables = []
+            for i in ok:
+                try:
+                    np.linalg.cholesky(A[i])
+                    factorisables.append(i)
+                except np.linalg.LinAlgError:
+                    mal_conditionne[i] = True
+            ok = np.array(factorisables, dtype=int)
+            L = np.linalg.cholesky(A[ok]) if len(ok) else None
+    if len(ok):
+        # A = L·Lᵀ : β = L⁻ᵀ·L⁻¹·b et diag(A⁻¹) = somme des carrés des colonnes de L⁻¹
+        L_inv = np.linalg.inv(L)
+        beta[ok] = np.einsum('nji,nj->ni', L_inv, np.einsum('nij,nj->ni', L_inv, b[ok]))
+        diag_inverse[ok] = (L_inv ** 2).sum(axis=1)
+    if mal_conditionne.any():
+        # Variables colinéaires : solution de norme minimale, comme scikit-learn
+        A_pinv = np.linalg.pinv(A[mal_conditionne], rcond=1e-10)
+        beta[mal_conditionne] = (A_pinv @ b[mal_conditionne][..., None])[..., 0]
+        # Coefficients non identifiables : variances indéfinies
+        diag_inverse[mal_conditionne] = np.nan
+    return beta, diag_inverse
+
+
+def evaluer_lot_polynomial(gram, combinaisons, degre, centres, correction_ddl=True):
+    """
+    Évalue les polynômes de combinaisons de même taille sur une matrice de Gram construite
+    à partir d'une BanquePolynomiale (les produits croisés des termes sont déjà calculés).
+
+    Parameters:
+    gram (MatriceGram): Produits croisés des colonnes de la banque
+    combinaisons (list): Combinaisons de variables de départ, toutes de même taille
+    degre (int): Degré du polynôme (celui de la banque au plus)
+    centres (dict): Centres des variables de la banque (BanquePolynomiale.centres)
+    correction_ddl (bool): RMSE divisé par n - (nombre de termes) - 1 plutôt que par n
+
+    Returns:
+    dict: Lot au format de MatriceGram.evaluer_lot, complété des combinaisons de départ
+    """
+    combinaisons = [tuple(c) for c in combinaisons]
+    lot = gram.evaluer_lot([termes_polynomiaux(c, degre)[0] for c in combinaisons], correction_ddl)
+    lot['combinaisons'] = combinaisons
+    lot['degre'] = degre
+    lot['centres'] = [np.array([centres[feature] for feature in c]) for c in combinaisons]
+    return lot
+
+
+def extraire_resultat(lot, i):
+    """
+    Extrait le résultat d'une combinaison d'un lot évalué par MatriceGram.evaluer_lot
+    (ou evaluer_lot_polynomial).
+
+    Returns:
+    dict: Métriques au format de l'application (biais en %), valeurs t de Student et modèle ajusté
+    """
+    if 'degre' in lot:
+        model = ModelePolynomial(lot['coefficients'][i], lot['intercept'][i], lot['combinaisons'][i],
+                                 lot['degre'], lot['centres'][i])
+    else:
+        model = ModeleLineaireGram(lot['coefficients'][i], lot['intercept'][i], lot['features'][i])
+    coef = model.coef_
+    intercept = model.intercept_
+
+    # Significativité des coefficients (modèles linéaires ; les coefficients polynomiaux du lot
+    # sont exprimés dans la base centrée de la banque)
+    if 'degre' in lot:
+        t_stats = {terme: None for terme in model.termes_}
+    else:
+        t_stats = {
+            feature: {
+                't_value': lot['t_values'][i, j],
+                'p_value': lot['p_values'][i, j],
+                'significant': lot['p_values'][i, j] < 0.05  # Significatif au niveau 5%
+            }
+            for j, feature in enumerate(lot['features'][i])
+        }
+    return {
+        'ssr': lot['ssr'][i],
+        'r2': lot['r2'][i],
+        'rmse': lot['rmse'][i],
+        'cv_rmse': lot['cv_rmse'][i],
+        'bias': lot['nmbe'][i] * 100,
+        'coefficients': coef,
+        'intercept': intercept,
+        't_stats': t_stats,
+        'model': model
+    }
@@ -1,27 +1,79 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
 import numpy as np
 import pandas as pd
 import statsmodels.api as sm
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import PolynomialFeatures
 from sklearn.metrics import r2_score, mean_squared_error
 import matplotlib.pyplot as plt
 import seaborn as sns
-import streamlit as st
+from moteur_regression import (BanquePolynomiale, MatriceGram, evaluer_lot_polynomial, extraire_resultat,
+                               meilleurs_sous_ensembles)
+from points_rupture import FORMES, ajuster_points_rupture
 
-# Cache pour éviter de recalculer les modèles déjà évalués
-@st.cache_data
-def evaluer_combinaison(X, y, features, _type="linear"):
-    """Évalue une combinaison de variables et retourne les métriques (mis en cache)"""
-    X_subset = X[features]
+class CacheLRU:
+    """Cache borné : au-delà de `taille` entrées, les moins récemment utilisées sont évincées"""
+    
+    def __init__(self, taille=4096):
+        self.taille = taille
+        self._entrees = OrderedDict()
+        self._verrou = threading.Lock()  # Sessions Streamlit exécutées dans des threads distincts
+    
+    def get(self, cle):
+        with self._verrou:
+            if cle not in self._entrees:
+                return None
+            self._entrees.move_to_end(cle)
+            return self._entrees[cle]
+    
+    def ajouter(self, cle, valeur):
+        with self._verrou:
+            self._entrees[cle] = valeur
+            self._entrees.move_to_end(cle)
+            while len(self._entrees) > self.taille:
+                self._entrees.popitem(last=False)
+    
+    def vider(self):
+        with self._verrou:
+            self._entrees.clear()
     
+    def __len__(self):
+        return len(self._entrees)
+
+# Cache des combinaisons évaluées : (empreinte des données, variables, type) -> résultat compact
+_CACHE_COMBINAISONS = CacheLRU(taille=4096)
+
+# Cache des recherches complètes : (empreinte des données, nombre de variables, méthode) -> meilleur
+# modèle. Streamlit réexécute la page à chaque interaction : une même recherche n'est faite qu'une fois
+_CACHE_RECHERCHES = CacheLRU(taille=64)
+
+def empreinte_donnees(X, y):
+    """
+    Empreinte du contenu de (X, y), à calculer une seule fois par jeu de données : elle
+    remplace le hachage complet de X et y à chaque appel de evaluer_combinaison.
+    """
+    empreinte = hashlib.sha1()
+    empreinte.update(repr([str(col) for col in X.columns]).encode())
+    empreinte.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+    empreinte.update(pd.util.hash_pandas_object(pd.Series(y), index=False).to_numpy().tobytes())
+    return empreinte.hexdigest()
+
+def vider_cache_combinaisons():
+    """Vide les caches des combinaisons évaluées et des recherches complètes"""
+    _CACHE_COMBINAISONS.vider()
+    _CACHE_RECHERCHES.vider()
+
+def _evaluer_combinaison(X_subset, y, features, _type):
+    """Ajuste une combinaison ; seuls les métriques et le modèle (coefficients) sont conservés"""
     if _type == "poly":
-        poly = PolynomialFeatures(degree=2, include_bias=False)
-        X_subset = poly.fit_transform(X_subset)
-        model = LinearRegression()
+        # Termes de degré 2 calculés une fois, puis résolus par la matrice de Gram
+        banque = BanquePolynomiale(X_subset, 2)
+        lot = evaluer_lot_polynomial(MatriceGram(banque.donnees, y), [features], 2, banque.centres)
     else:
-        model = LinearRegression()
+        lot = MatriceGram(X_subset, y).evaluer_lot([features])
+    model = extraire_resultat(lot, 0)['model']
     
-    model.fit(X_subset, y)
     y_pred = model.predict(X_subset)
     
     r2 = r2_score(y, y_pred)
@@ -36,10 +88,35 @@ def evaluer_combinaison(X, y, features, _type="linear"):
         'cv': cv,
         'bias': bias,
         'model': model,
-        'conforme': conforme,
-        'y_pred': y_pred
+        'conforme': conforme
     }
 
+def evaluer_combinaison(X, y, features, _type="linear", empreinte=None):
+    """
+    Évalue une combinaison de variables et retourne les métriques (mis en cache).
+    
+    Le cache est indexé par l'empreinte des données, les variables et le type de modèle ;
+    il ne conserve pas les prédictions, recalculées à partir des coefficients.
+    
+    Parameters:
+    X (pandas.DataFrame): Variables explicatives
+    y (pandas.Series): Consommation
+    features (list): Variables de la combinaison
+    _type (str): "linear" ou "poly" (polynôme de degré 2)
+    empreinte (str): Empreinte de (X, y) (voir empreinte_donnees), calculée si absente
+    """
+    if empreinte is None:
+        empreinte = empreinte_donnees(X, y)
+    cle = (empreinte, tuple(features), _type)
+    X_subset = X[list(features)]
+    
+    resultat = _CACHE_COMBINAISONS.get(cle)
+    if resultat is None:
+        resultat = _evaluer_combinaison(X_subset, y, list(features), _type)
+        _CACHE_COMBINAISONS.ajouter(cle, resultat)
+    
+    return {**resultat, 'y_pred': resultat['model'].predict(X_subset)}
+
 class OptimizedModelIPMVP:
     def __init__(self):
         self.best_model = None
@@ -52,9 +129,48 @@ class OptimizedModelIPMVP:
         self.best_coefficients = None
         self.best_intercept = None
         self.best_y_pred = None
+        self.stats_recherche = None
     
-    def trouver_meilleur_modele(self, X, y, max_features=4, progress_callback=None):
-        """Version optimisée qui utilise le cache et prioritise les modèles prometteurs"""
+    def trouver_meilleur_modele(self, X, y, max_features=4, progress_callback=None, methode="exhaustive"):
+        """
+        Version optimisée qui utilise le cache et prioritise les modèles prometteurs.
+        
+        methode="branch_and_bound" ne teste que le meilleur sous-ensemble de chaque taille,
+        trouvé par séparation et évaluation ; le nombre de combinaisons élaguées est
+        disponible dans self.stats_recherche.
+        
+        Le résultat d'une recherche partant d'un modèle vierge est mis en cache, indexé par
+        l'empreinte des données : la même recherche sur les mêmes données n'est pas refaite.
+        """
+        empreinte = empreinte_donnees(X, y)
+        cle = (empreinte, min(max_features, len(X.columns)), methode)
+        vierge = self.best_model is None and self.best_r2 == 0
+        
+        resultat = _CACHE_RECHERCHES.get(cle) if vierge else None
+        if resultat is not None:
+            self.stats_recherche = resultat['stats_recherche']
+            if resultat['model'] is not None:
+                self._update_best_model({**resultat, 'y_pred': resultat['model'].predict(X)},
+                                        resultat['features'], resultat['model_type'], X, y)
+            if progress_callback:
+                progress_callback(1.0)
+            return self.best_model is not None
+        
+        trouve = self._rechercher(X, y, max_features, progress_callback, methode, empreinte)
+        if vierge:
+            _CACHE_RECHERCHES.ajouter(cle, {
+                'r2': self.best_r2,
+                'cv': self.best_cv,
+                'bias': self.best_bias,
+                'model': self.best_model,
+                'features': self.best_features,
+                'model_type': self.best_model_type,
+                'stats_recherche': self.stats_recherche
+            })
+        return trouve
+    
+    def _rechercher(self, X, y, max_features, progress_callback, methode, empreinte):
+        """Recherche du meilleur modèle (voir trouver_meilleur_modele), sans cache"""
         # Recherche rapide: commencer par vérifier la colonne DJU seule
         dju_colonne = None
         for col in X.columns:
@@ -64,7 +180,7 @@ class OptimizedModelIPMVP:
         
         if dju_colonne:
             # Tester le modèle DJU d'abord (le plus susceptible d'être conforme)
-            result = evaluer_combinaison(X, y, [dju_colonne])
+            result = evaluer_combinaison(X, y, [dju_colonne], empreinte=empreinte)
             if result['conforme']:
                 self._update_best_model(result, [dju_colonne], "Linéaire (E = a×DJU + c)", X, y)
                 # Si on trouve un modèle DJU conforme, terminer rapidement
@@ -78,30 +194,83 @@ class OptimizedModelIPMVP:
         models_tested = 0
         total_models = sum(len(list(combinations(X.columns, i))) for i in range(1, max_features + 1))
         
-        # Tester les combinaisons de variables une par une
+        # Matrice de Gram construite une seule fois pour toutes les combinaisons, sur la banque
+        # des termes de degré 2 : les polynômes sont résolus comme les modèles linéaires
+        banque = BanquePolynomiale(X, 2)
+        gram = MatriceGram(banque.donnees, y)
+        
+        if methode == "branch_and_bound":
+            # Meilleur sous-ensemble exact de chaque taille, sans énumérer les sous-arbres élagués
+            meilleurs, self.stats_recherche = meilleurs_sous_ensembles(gram, list(X.columns), max_features)
+            total_models = max(len(meilleurs), 1)
+        
+        # Tester les combinaisons de variables, par lots de même taille
         for n_features in range(1, max_features + 1):
-            feature_combos = list(combinations(X.columns, n_features))
-            for i, feature_subset in enumerate(feature_combos):
-                feature_subset = list(feature_subset)
-                
-                # Mettre à jour la progression
-                models_tested += 1
-                if progress_callback:
-                    progress_callback(models_tested / total_models)
-                
-                # Évaluer le modèle linéaire
-                result = evaluer_combinaison(X, y, feature_subset)
-                if result['conforme'] and result['r2'] > self.best_r2:
-                    self._update_best_model(result, feature_subset, "Linéaire", X, y)
-                
-                # Évaluer le modèle polynomial (uniquement pour 1-2 variables)
-                if n_features <= 2:
-                    result = evaluer_combinaison(X, y, feature_subset, _type="poly")
-                    if result['conforme'] and result['r2'] > self.best_r2:
-                        self._update_best_model(result, feature_subset, "Polynomiale (degré 2)", X, y)
+            if methode == "branch_and_bound":
+                feature_combos = [meilleurs[n_features]] if n_features in meilleurs else []
+            else:
+                feature_combos = list(combinations(X.columns, n_features))
+            if not feature_combos:
+                continue
+            
+            # Évaluer tous les modèles linéaires de cette taille en un seul appel vectorisé
+            lot = gram.evaluer_lot(feature_combos, correction_ddl=False)
+            conformes = (lot['r2'] > 0.75) & (np.abs(lot['cv_rmse']) < 0.2) & (np.abs(lot['nmbe']) < 0.01)
+            if conformes.any():
+                i = int(np.argmax(np.where(conformes, lot['r2'], -np.inf)))
+                if lot['r2'][i] > self.best_r2:
+                    self._update_best_model(self._resultat_lot(lot, i, X), list(feature_combos[i]), "Linéaire", X, y)
+            
+            # Évaluer les modèles polynomiaux (uniquement pour 1-2 variables), eux aussi par lot
+            if n_features <= 2:
+                lot = evaluer_lot_polynomial(gram, feature_combos, 2, banque.centres, correction_ddl=False)
+                conformes = (lot['r2'] > 0.75) & (np.abs(lot['cv_rmse']) < 0.2) & (np.abs(lot['nmbe']) < 0.01)
+                if conformes.any():
+                    i = int(np.argmax(np.where(conformes, lot['r2'], -np.inf)))
+                    if lot['r2'][i] > self.best_r2:
+                        self._update_best_model(self._resultat_lot(lot, i, X), list(feature_combos[i]), "Polynomiale (degré 2)", X, y)
+            
+            # Modèles à points de rupture (3P, 4P, 5P) sur chaque variable seule, par recherche sur grille
+            if n_features == 1:
+                for (feature,) in feature_combos:
+                    for forme in FORMES:
+                        resultat = ajuster_points_rupture(X[feature], y, forme)
+                        if resultat is None:
+                            continue
+                        conforme = resultat['r2'] > 0.75 and abs(resultat['cv_rmse']) < 0.2 and abs(resultat['bias'] / 100) < 0.01
+                        if conforme and resultat['r2'] > self.best_r2:
+                            self._update_best_model(self._resultat_rupture(resultat, X), [feature], f"Point de rupture ({forme})", X, y)
+            
+            # Mettre à jour la progression
+            models_tested += len(feature_combos)
+            if progress_callback:
+                progress_callback(models_tested / total_models)
         
         return self.best_model is not None
     
+    def _resultat_lot(self, lot, i, X):
+        """Convertit une ligne d'un lot vectorisé au format de evaluer_combinaison"""
+        model = extraire_resultat(lot, i)['model']
+        return {
+            'r2': lot['r2'][i],
+            'cv': lot['cv_rmse'][i],
+            'bias': lot['nmbe'][i],
+            'model': model,
+            'conforme': True,
+            'y_pred': model.predict(X)
+        }
+    
+    def _resultat_rupture(self, resultat, X):
+        """Convertit le résultat de ajuster_points_rupture au format de evaluer_combinaison"""
+        return {
+            'r2': resultat['r2'],
+            'cv': resultat['cv_rmse'],
+            'bias': resultat['bias'] / 100,
+            'model': resultat['model'],
+            'conforme': True,
+            'y_pred': resultat['model'].predict(X)
+        }
+    
     def _update_best_model(self, result, features, model_type, X, y):
         """Met à jour le meilleur modèle avec les résultats"""
         self.best_r2 = result['r2']
@@ -125,12 +294,15 @@ class OptimizedModelIPMVP:
             return
         
         formula = f"{self.best_intercept:.4f}"
-        for i, coef in enumerate(self.best_coefficients):
-            feature_name = self.best_features[i]
+        for feature_name, coef in zip(self._termes(), self.best_coefficients):
             formula += f" + {coef:.4f} × ({feature_name})"
             
         self.best_formula = formula
     
+    def _termes(self):
+        """Noms des termes du meilleur modèle (monômes pour un modèle polynomial)"""
+        return list(getattr(self.best_model, 'termes_', self.best_features))
+    
     def generer_rapport(self, y_original=None):
         """Génère un rapport sur le meilleur modèle"""
         if self.best_model is None:
@@ -163,10 +335,6 @@ class OptimizedModelIPMVP:
         
         # Calculer les prédictions
         X_subset = X[self.best_features]
-        if "Polynomiale" in self.best_model_type:
-            poly = PolynomialFeatures(degree=2, include_bias=False)
-            X_subset = poly.fit_transform(X_subset)
-        
         y_pred = self.best_model.predict(X_subset)
         
         # Créer un DataFrame pour l'analyse
@@ -216,7 +384,7 @@ class OptimizedModelIPMVP:
         # Importance des variables
         if len(self.best_features) > 0:
             coefs = pd.DataFrame({
-                'Variable': self.best_features,
+                'Variable': self._termes(),
                 'Coefficient': np.abs(self.best_coefficients)
             })
             coefs = coefs.sort_values('Coefficient', ascending=False)
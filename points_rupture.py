@@ -0,0 +1,178 @@
+import numpy as np
+
+# Modèles à points de rupture (change-point, ASHRAE Guideline 14) sur une variable explicative
+#   3P chauffage     : E = c + a × max(0, Tc - T)
+#   3P climatisation : E = c + b × max(0, T - Tc)
+#   4P               : E = c + a × max(0, Tc - T) + b × max(0, T - Tc)
+#   5P               : E = c + a × max(0, Tc1 - T) + b × max(0, T - Tc2), Tc1 < Tc2
+# Les points de rupture sont recherchés sur une grille : les sommes nécessaires aux équations
+# normales de chaque candidat sont tirées des sommes cumulées des données triées, sans
+# réajustement par candidat.
+
+FORMES = ('3P chauffage', '3P climatisation', '4P', '5P')
+
+# Paramètres estimés en plus de la constante (pentes et points de rupture), pour la correction
+# des degrés de liberté du RMSE
+NB_PARAMETRES = {'3P chauffage': 2, '3P climatisation': 2, '4P': 3, '5P': 4}
+
+NB_CANDIDATS = 30  # Points de rupture candidats sur l'étendue de la variable
+MIN_POINTS = 3  # Nombre minimum d'observations de chaque côté d'un point de rupture
+
+
+class ModelePointsRupture:
+    """
+    Modèle à points de rupture ajusté (interface compatible scikit-learn).
+
+    coef_ contient les pentes dans l'ordre de termes_ ; points_rupture_ les températures
+    de rupture (une pour les modèles 3P et 4P, deux pour le modèle 5P).
+    """
+
+    def __init__(self, forme, feature, points_rupture, coef, intercept):
+        self.forme = forme
+        self.feature_names_in_ = np.array([feature], dtype=object)
+        self.points_rupture_ = tuple(float(point) for point in points_rupture)
+        self.coef_ = np.asarray(coef, dtype=float)
+        self.intercept_ = float(intercept)
+        self.termes_ = termes_rupture(feature, forme, self.points_rupture_)
+
+    def predict(self, X):
+        if hasattr(X, 'columns'):
+            X = X[list(self.feature_names_in_)]
+        x = np.asarray(X, dtype=float).reshape(-1)
+        return _regresseurs(x, self.forme, self.points_rupture_) @ self.coef_ + self.intercept_
+
+
+def termes_rupture(feature, forme, points_rupture):
+    """Noms des termes d'un modèle à points de rupture ('max(0, 15.5 - T)'...)"""
+    bas, haut = points_rupture[0], points_rupture[-1]
+    chauffage = f"max(0, {bas:.4g} - {feature})"
+    climatisation = f"max(0, {feature} - {haut:.4g})"
+    if forme == '3P chauffage':
+        return [chauffage]
+    if forme == '3P climatisation':
+        return [climatisation]
+    return [chauffage, climatisation]
+
+def _regresseurs(x, forme, points_rupture):
+    """Colonnes des termes du modèle (voir termes_rupture) pour les valeurs x"""
+    bas, haut = points_rupture[0], points_rupture[-1]
+    colonnes = []
+    if forme != '3P climatisation':
+        colonnes.append(np.maximum(bas - x, 0.0))
+    if forme != '3P chauffage':
+        colonnes.append(np.maximum(x - haut, 0.0))
+    return np.column_stack(colonnes)
+
+def _sommes_cumulees(valeurs):
+    """Sommes cumulées précédées de zéro : la somme des k premières valeurs est l'élément k"""
+    return np.concatenate([[0.0], np.cumsum(valeurs)])
+
+def ajuster_points_rupture(x, y, forme, feature=None, nb_candidats=NB_CANDIDATS, min_points=MIN_POINTS):
+    """
+    Ajuste un modèle à points de rupture par recherche sur grille.
+
+    Pour un point de rupture Tc laissant k observations sous Tc (données triées), le terme de
+    chauffage h = max(0, Tc - x) vérifie Σh = Tc·k - Σx, Σh² = Tc²·k - 2Tc·Σx + Σx² et
+    Σhy = Tc·Σy - Σxy, sommes prises sur les k premières observations : tous les candidats
+    sont résolus ensemble à partir des sommes cumulées de x, x², y et xy. Le terme de
+    climatisation se traite de même sur les observations au-dessus du point de rupture, et
+    les deux termes, à supports disjoints, ne se croisent pas.
+
+    Parameters:
+    x (array-like): Variable explicative (température, DJU...)
+    y (array-like): Consommation
+    forme (str): Forme du modèle (voir FORMES)
+    feature (str): Nom de la variable (par défaut, celui de la série x)
+    nb_candidats (int): Nombre de points de rupture candidats
+    min_points (int): Nombre minimum d'observations par segment
+
+    Returns:
+    dict: Métriques au format de extraire_resultat (biais en %), modèle ajusté ; None si les
+          données ne permettent aucun point de rupture
+    """
+    feature = getattr(x, 'name', None) if feature is None else feature
+    x = np.asarray(x, dtype=float).reshape(-1)
+    y = np.asarray(y, dtype=float).reshape(-1)
+    n = len(x)
+    if forme not in FORMES or n < 3 * min_points or not np.isfinite(x).all() or not np.isfinite(y).all():
+        return None
+
+    # Données centrées (meilleure précision des sommes), triées selon x
+    moyenne_x, moyenne_y = x.mean(), y.mean()
+    ordre = np.argsort(x)
+    xs, ys = x[ordre] - moyenne_x, y[ordre] - moyenne_y
+    S1, S2 = _sommes_cumulees(xs), _sommes_cumulees(xs ** 2)
+    Sy, Sxy = _sommes_cumulees(ys), _sommes_cumulees(xs * ys)
+
+    candidats = np.unique(np.linspace(xs[min_points - 1], xs[n - min_points], nb_candidats))
+    k = np.searchsorted(xs, candidats)  # Observations strictement sous chaque candidat
+    valides = (k >= min_points) & (n - k >= min_points)
+    candidats, k = candidats[valides], k[valides]
+    if len(candidats) == 0:
+        return None
+
+    # Sommes du terme de chauffage (sous le point) et du terme de climatisation (au-dessus)
+    sommes_ch = (candidats * k - S1[k],
+                 candidats ** 2 * k - 2 * candidats * S1[k] + S2[k],
+                 candidats * Sy[k] - Sxy[k])
+    au_dessus = n - k
+    S1_h, S2_h, Sy_h, Sxy_h = S1[n] - S1[k], S2[n] - S2[k], Sy[n] - Sy[k], Sxy[n] - Sxy[k]
+    sommes_cl = (S1_h - candidats * au_dessus,
+                 S2_h - 2 * candidats * S1_h + candidats ** 2 * au_dessus,
+                 Sxy_h - candidats * Sy_h)
+
+    # Couples (point bas, point haut) de chaque candidat
+    if forme == '5P':
+        bas, haut = np.triu_indices(len(candidats), 1)
+        # Au moins min_points observations dans la zone neutre
+        garde = k[haut] - k[bas] >= min_points
+        bas, haut = bas[garde], haut[garde]
+    else:
+        bas = haut = np.arange(len(candidats))
+    if len(bas) == 0:
+        return None
+
+    termes = []
+    if forme != '3P climatisation':
+        termes.append(tuple(somme[bas] for somme in sommes_ch))
+    if forme != '3P chauffage':
+        termes.append(tuple(somme[haut] for somme in sommes_cl))
+
+    # Équations normales de [1, termes] de tous les candidats : (m, p + 1, p + 1)
+    p = len(termes)
+    G = np.zeros((len(bas), p + 1, p + 1))
+    b = np.zeros((len(bas), p + 1))
+    G[:, 0, 0] = n
+    b[:, 0] = Sy[n]
+    for i, (somme, somme_carres, somme_y) in enumerate(termes, start=1):
+        G[:, 0, i] = G[:, i, 0] = somme
+        G[:, i, i] = somme_carres
+        b[:, i] = somme_y
+    # Termes de chauffage et de climatisation à supports disjoints : G[:, 1, 2] = 0
+    beta = (np.linalg.pinv(G) @ b[:, :, np.newaxis])[:, :, 0]
+    ssr = (ys ** 2).sum() - (beta * b).sum(axis=1)
+
+    meilleur = int(np.argmin(ssr))
+    points = (candidats[bas[meilleur]] + moyenne_x, candidats[haut[meilleur]] + moyenne_x)
+    if forme != '5P':
+        points = points[:1]
+    model = ModelePointsRupture(forme, feature, points, beta[meilleur, 1:], beta[meilleur, 0] + moyenne_y)
+
+    # Métriques IPMVP du modèle retenu (RMSE corrigé des paramètres estimés, points de rupture compris)
+    y_pred = _regresseurs(x, forme, model.points_rupture_) @ model.coef_ + model.intercept_
+    residus = y - y_pred
+    ssr_modele = float(residus @ residus)
+    sst = float(((y - moyenne_y) ** 2).sum())
+    ddl = max(n - NB_PARAMETRES[forme] - 1, 1)
+    rmse = np.sqrt(ssr_modele / ddl)
+    return {
+        'ssr': ssr_modele,
+        'r2': 1 - ssr_modele / sst if sst > 0 else 0.0,
+        'rmse': rmse,
+        'cv_rmse': rmse / moyenne_y if moyenne_y != 0 else np.inf,
+        'bias': np.mean(y_pred - y) / moyenne_y * 100 if moyenne_y != 0 else np.inf,
+        'coefficients': model.coef_,
+        'intercept': model.intercept_,
+        't_stats': {terme: None for terme in model.termes_},
+        'model': model
+    }
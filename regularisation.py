@@ -0,0 +1,215 @@
+import numpy as np
+from sklearn.linear_model import lasso_path
+
+from moteur_regression import ModeleLineaireGram
+
+# Régressions régularisées évaluées sur une grille complète de paramètres alpha
+# Les estimateurs exposent l'interface scikit-learn (fit, predict, coef_, intercept_), ainsi que
+# l'alpha retenu dans alpha_, pour être utilisés à la place de Ridge/Lasso dans la recherche.
+
+ALPHAS_RIDGE = np.logspace(-4, 4, 81)
+N_ALPHAS_LASSO = 50
+
+
+def _standardiser(X, y):
+    """Centre-réduit X et centre y ; les colonnes constantes ne sont pas réduites"""
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    moyennes_x = X.mean(axis=0)
+    ecarts_x = X.std(axis=0)
+    ecarts_x[ecarts_x == 0] = 1.0
+    moyenne_y = y.mean()
+    return (X - moyennes_x) / ecarts_x, y - moyenne_y, moyennes_x, ecarts_x, moyenne_y
+
+
+def chemin_ridge(X, y, alphas=ALPHAS_RIDGE):
+    """
+    Calcule le chemin Ridge complet à partir d'une seule SVD de la matrice standardisée.
+
+    Avec Xs = U·diag(s)·Vᵀ, les coefficients pour chaque alpha valent V·diag(s / (s² + α))·Uᵀy :
+    coefficients, SSR et score de validation croisée généralisée (GCV) sont obtenus pour
+    toute la grille par de simples opérations vectorisées.
+
+    Parameters:
+    X (array-like): Variables explicatives (n, p)
+    y (array-like): Variable cible (n,)
+    alphas (array-like): Grille des paramètres de régularisation
+
+    Returns:
+    dict: Tableaux par alpha : 'alphas', 'coefficients' (n_alphas, p), 'intercept', 'ssr',
+          'r2', 'ddl' (degrés de liberté effectifs) et 'gcv', ainsi que 'indice_optimal'
+    """
+    alphas = np.asarray(alphas, dtype=float)
+    Xs, yc, moyennes_x, ecarts_x, moyenne_y = _standardiser(X, y)
+    n = len(yc)
+
+    U, s, Vt = np.linalg.svd(Xs, full_matrices=False)
+    Uty = U.T @ yc
+
+    # Facteurs de rétrécissement s² / (s² + α) pour chaque alpha de la grille
+    facteurs = s ** 2 / (s ** 2 + alphas[:, None])
+    coef_std = (facteurs / np.where(s > 0, s, 1.0) * Uty) @ Vt
+    coefficients = coef_std / ecarts_x
+    intercept = moyenne_y - coefficients @ moyennes_x
+
+    # SSR sans repasser sur les lignes : ||yc||² - Σ (2f - f²)(Uᵀy)²
+    sst = np.dot(yc, yc)
+    ssr = np.maximum(sst - ((2 * facteurs - facteurs ** 2) * Uty ** 2).sum(axis=1), 0.0)
+    r2 = 1 - ssr / sst if sst > 0 else np.where(ssr == 0, 1.0, 0.0)
+
+    # Validation croisée généralisée (la constante compte pour un degré de liberté)
+    ddl = facteurs.sum(axis=1) + 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gcv = np.where(ddl < n, (ssr / n) / (1 - ddl / n) ** 2, np.inf)
+
+    return {
+        'alphas': alphas,
+        'coefficients': coefficients,
+        'intercept': intercept,
+        'ssr': ssr,
+        'r2': r2,
+        'ddl': ddl,
+        'gcv': gcv,
+        'indice_optimal': int(np.argmin(gcv))
+    }
+
+
+class RidgeGCV:
+    """
+    Régression Ridge dont l'alpha est choisi par GCV sur le chemin calculé en une SVD.
+
+    La pénalité porte sur les variables standardisées : alpha_ n'est pas à l'échelle de
+    l'alpha de sklearn.linear_model.Ridge sur les variables brutes, et ne s'y convertit pas
+    en un seul nombre dès que les variables ont des écarts-types différents.
+    """
+
+    def __init__(self, alphas=ALPHAS_RIDGE):
+        self.alphas = alphas
+
+    def fit(self, X, y):
+        self.chemin_ = chemin_ridge(X, y, self.alphas)
+        i = self.chemin_['indice_optimal']
+        self.alpha_ = float(self.chemin_['alphas'][i])
+        self.coef_ = self.chemin_['coefficients'][i]
+        self.intercept_ = float(self.chemin_['intercept'][i])
+        return self
+
+    def predict(self, X):
+        return np.asarray(X, dtype=float) @ self.coef_ + self.intercept_
+
+
+def chemin_lasso(X, y, alphas=None, n_alphas=N_ALPHAS_LASSO, eps=1e-3):
+    """
+    Calcule le chemin Lasso complet par descente de coordonnées à démarrage à chaud.
+
+    Les alphas sont parcourus par valeurs décroissantes : chaque solution sert de point de
+    départ à la suivante, et la matrice de Gram des variables standardisées n'est calculée
+    qu'une fois pour tout le chemin.
+
+    Parameters:
+    X (array-like): Variables explicatives (n, p)
+    y (array-like): Variable cible (n,)
+    alphas (array-like): Grille des paramètres de régularisation (par défaut, n_alphas valeurs
+                         géométriques de alpha_max à eps·alpha_max)
+    n_alphas (int): Nombre d'alphas de la grille par défaut
+    eps (float): Rapport entre le plus petit et le plus grand alpha de la grille par défaut
+
+    Returns:
+    dict: Tableaux par alpha (décroissant) : 'alphas', 'coefficients' (n_alphas, p), 'intercept',
+          'ssr', 'r2', 'supports' (variables actives), 'ddl' et 'gcv', ainsi que 'indice_optimal'
+    """
+    Xs, yc, moyennes_x, ecarts_x, moyenne_y = _standardiser(X, y)
+    n = len(yc)
+    G = Xs.T @ Xs
+    Xy = Xs.T @ yc
+
+    if alphas is None:
+        # Au-delà de alpha_max, tous les coefficients sont nuls
+        alpha_max = np.abs(Xy).max() / n if Xy.size else 0.0
+        if alpha_max <= 0:
+            alpha_max = 1.0
+        alphas = alpha_max * np.logspace(0, np.log10(eps), n_alphas)
+    alphas = np.sort(np.asarray(alphas, dtype=float))[::-1]
+
+    alphas, coef_std, _ = lasso_path(Xs, yc, alphas=alphas, precompute=G, Xy=Xy)
+    coef_std = coef_std.T
+    coefficients = coef_std / ecarts_x
+    intercept = moyenne_y - coefficients @ moyennes_x
+
+    # SSR à partir des produits croisés : ||yc||² - 2·bᵀXᵀy + bᵀXᵀX·b
+    sst = np.dot(yc, yc)
+    ssr = np.maximum(sst - 2 * coef_std @ Xy + np.einsum('ai,ij,aj->a', coef_std, G, coef_std), 0.0)
+    r2 = 1 - ssr / sst if sst > 0 else np.where(ssr == 0, 1.0, 0.0)
+
+    # Le nombre de variables actives estime les degrés de liberté du Lasso
+    supports = coef_std != 0
+    ddl = supports.sum(axis=1) + 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gcv = np.where(ddl < n, (ssr / n) / (1 - ddl / n) ** 2, np.inf)
+
+    return {
+        'alphas': alphas,
+        'coefficients': coefficients,
+        'intercept': intercept,
+        'ssr': ssr,
+        'r2': r2,
+        'supports': supports,
+        'ddl': ddl,
+        'gcv': gcv,
+        'indice_optimal': int(np.argmin(gcv))
+    }
+
+
+class ModeleLasso(ModeleLineaireGram):
+    """Modèle Lasso extrait d'un chemin, restreint à ses variables actives"""
+
+    def __init__(self, coef, intercept, features, alpha):
+        super().__init__(coef, intercept, features)
+        self.alpha_ = float(alpha)
+
+
+def supports_chemin_lasso(X, y, max_features, alphas=None):
+    """
+    Variables actives successives le long du chemin Lasso.
+
+    Chaque support distinct d'au plus max_features variables est associé au plus petit alpha
+    qui le produit, c'est-à-dire au modèle le moins contraint de ce support.
+
+    Parameters:
+    X (pandas.DataFrame): Variables explicatives candidates
+    y (pandas.Series): Variable cible
+    max_features (int): Nombre maximum de variables actives
+    alphas (array-like): Grille des paramètres de régularisation (voir chemin_lasso)
+
+    Returns:
+    list: Tuples (support, ModeleLasso) dans l'ordre d'apparition sur le chemin
+    """
+    features = list(X.columns)
+    chemin = chemin_lasso(X, y, alphas)
+    modeles = {}
+    for i, alpha in enumerate(chemin['alphas']):
+        actives = np.flatnonzero(chemin['supports'][i])
+        if len(actives) == 0 or len(actives) > max_features:
+            continue
+        support = tuple(features[j] for j in actives)
+        modeles[support] = ModeleLasso(chemin['coefficients'][i, actives], chemin['intercept'][i],
+                                       support, alpha)
+    return list(modeles.items())
+
+
+class LassoChemin:
+    """Régression Lasso dont l'alpha est choisi par GCV sur un chemin à démarrage à chaud"""
+
+    def __init__(self, alphas=None):
+        self.alphas = alphas
+
+    def fit(self, X, y):
+        self.chemin_ = chemin_lasso(X, y, self.alphas)
+        i = self.chemin_['indice_optimal']
+        self.alpha_ = float(self.chemin_['alphas'][i])
+        self.coef_ = self.chemin_['coefficients'][i]
+        self.intercept_ = float(self.chemin_['intercept'][i])
+        return self
+
+    def predict(self, X):
+        return np.asarray(X, dtype=float) @ self.coef_ + self.intercept_
@@ -0,0 +1,142 @@
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+# Stockage local des observations météo quotidiennes brutes
+# Les observations sont indexées par la localisation résolue par le service météo et par la date :
+# seules les dates absentes sont demandées au service, et les agrégats mensuels (DJU, DJF pour
+# n'importe quelle base) sont recalculés hors ligne à partir des observations stockées.
+
+CHEMIN_METEO = os.environ.get('IPMVP_METEO', 'meteo.sqlite')
+
+# Grandeurs quotidiennes stockées
+ELEMENTS = ('temp_max', 'temp_min', 'temp_mean', 'humidity', 'precip', 'sunshine_hours', 'cloud_cover')
+
+
+def plages_contigues(dates):
+    """
+    Regroupe des dates journalières en plages continues.
+
+    Parameters:
+    dates (pandas.DatetimeIndex): Dates triées
+
+    Returns:
+    list: Plages (début, fin) au format 'YYYY-MM-DD'
+    """
+    if len(dates) == 0:
+        return []
+    # Une nouvelle plage commence à chaque saut de plus d'un jour
+    groupes = (pd.Series(dates).diff() != pd.Timedelta(days=1)).cumsum()
+    return [(plage.iloc[0].strftime('%Y-%m-%d'), plage.iloc[-1].strftime('%Y-%m-%d'))
+            for _, plage in pd.Series(dates).groupby(groupes.to_numpy())]
+
+
+class StockageMeteo:
+    """
+    Observations météo quotidiennes stockées dans une base SQLite partagée par les sessions.
+
+    Les dates à partir d'aujourd'hui (prévisions, journée en cours) ne sont jamais stockées :
+    elles sont redemandées au service à chaque fois jusqu'à devenir des observations.
+    """
+
+    def __init__(self, chemin=CHEMIN_METEO):
+        self.chemin = chemin
+        with self._connexion() as connexion:
+            connexion.execute("""
+                CREATE TABLE IF NOT EXISTS localisations (
+                    requete TEXT PRIMARY KEY,
+                    adresse TEXT NOT NULL
+                )
+            """)
+            connexion.execute(f"""
+                CREATE TABLE IF NOT EXISTS observations (
+                    adresse TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    {", ".join(f"{element} REAL" for element in ELEMENTS)},
+                    enregistrement REAL NOT NULL,
+                    PRIMARY KEY (adresse, date)
+                )
+            """)
+
+    @contextmanager
+    def _connexion(self):
+        # Une connexion par opération : les sessions Streamlit s'exécutent dans des threads distincts
+        connexion = sqlite3.connect(self.chemin, timeout=30)
+        try:
+            with connexion:  # Validation de la transaction, ou annulation en cas d'erreur
+                yield connexion
+        finally:
+            connexion.close()
+
+    def adresse_resolue(self, requete):
+        """Localisation résolue par le service lors d'une précédente demande (None si inconnue)"""
+        with self._connexion() as connexion:
+            ligne = connexion.execute("SELECT adresse FROM localisations WHERE requete = ?", (requete,)).fetchone()
+        return ligne[0] if ligne else None
+
+    def plages_manquantes(self, adresse, debut, fin):
+        """
+        Plages de dates de [debut, fin] sans observation stockée pour une localisation.
+
+        Parameters:
+        adresse (str): Localisation résolue
+        debut (str): Date de début au format 'YYYY-MM-DD'
+        fin (str): Date de fin au format 'YYYY-MM-DD'
+
+        Returns:
+        list: Plages (début, fin) à demander au service, dans l'ordre chronologique
+        """
+        with self._connexion() as connexion:
+            stockees = {date for (date,) in connexion.execute(
+                "SELECT date FROM observations WHERE adresse = ? AND date BETWEEN ? AND ?", (adresse, debut, fin))}
+        dates = pd.date_range(debut, fin, freq='D')
+        return plages_contigues(dates[~dates.strftime('%Y-%m-%d').isin(stockees)])
+
+    def enregistrer(self, requete, adresse, observations):
+        """
+        Stocke des observations quotidiennes et la localisation résolue de la requête.
+
+        Parameters:
+        requete (str): Localisation telle que demandée ("Paris,FR", "48.85,2.35"...)
+        adresse (str): Localisation résolue par le service
+        observations (pandas.DataFrame): Colonne 'date' et colonnes ELEMENTS
+        """
+        aujourdhui = pd.Timestamp.today().strftime('%Y-%m-%d')
+        dates = pd.to_datetime(observations['date']).dt.strftime('%Y-%m-%d')
+        passees = (dates < aujourdhui).to_numpy()
+        # Valeurs manquantes (None, NaN) stockées en NULL
+        valeurs = observations[passees].reindex(columns=list(ELEMENTS)).astype('float64').astype(object)
+        valeurs = valeurs.where(valeurs.notna(), None)
+        maintenant = time.time()
+        lignes = [(adresse, date, *elements, maintenant)
+                  for date, elements in zip(dates[passees], valeurs.itertuples(index=False))]
+        with self._connexion() as connexion:
+            connexion.execute("INSERT OR REPLACE INTO localisations VALUES (?, ?)", (requete, adresse))
+            connexion.executemany(
+                f"INSERT OR REPLACE INTO observations VALUES ({', '.join('?' * (len(ELEMENTS) + 3))})", lignes
+            )
+
+    def lire(self, adresse, debut, fin):
+        """
+        Observations quotidiennes stockées d'une localisation sur [debut, fin].
+
+        Returns:
+        pandas.DataFrame: Colonne 'date' (datetime64) et colonnes ELEMENTS, triées par date
+        """
+        with self._connexion() as connexion:
+            observations = pd.read_sql_query(
+                f"SELECT date, {', '.join(ELEMENTS)} FROM observations "
+                "WHERE adresse = ? AND date BETWEEN ? AND ? ORDER BY date",
+                connexion, params=(adresse, debut, fin)
+            )
+        observations['date'] = pd.to_datetime(observations['date'])
+        return observations
+
+    def vider(self):
+        """Supprime toutes les observations stockées"""
+        with self._connexion() as connexion:
+            connexion.execute("DELETE FROM observations")
+            connexion.execute("DELETE FROM localisations")
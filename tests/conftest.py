@@ -0,0 +1,21 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Les modules du moteur sont à la racine du dépôt
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def donnees_regression():
+    """Cinq variables candidates, dont trois explicatives, et une consommation bruitée"""
+    rng = np.random.default_rng(42)
+    n = 60
+    X = pd.DataFrame(rng.normal(size=(n, 5)) * [5.0, 2.0, 1.0, 3.0, 0.5] + [15.0, 100.0, 0.0, 8.0, 2.0],
+                     columns=['dju', 'occupation', 'bruit', 'djf', 'jours'])
+    y = pd.Series(1000 + 12 * X['dju'] + 3 * X['occupation'] - 7 * X['djf'] + rng.normal(scale=4.0, size=n),
+                  name='consommation')
+    return X, y
@@ -0,0 +1,35 @@
+import json
+
+import pytest
+
+import benchmark_ipmvp
+from benchmark_ipmvp import bench_recherche, donnees_synthetiques, nb_sous_ensembles
+
+CONFIG = {'mois': 14, 'frequence': 'MS', 'variables': 4, 'max_features': 3, 'modeles': ['lineaire'],
+          'recherche_bb': False, 'parallele': False}
+
+
+def test_sous_ensembles_evalues_en_branch_and_bound():
+    dates, X, y = donnees_synthetiques(CONFIG['mois'], CONFIG['variables'], CONFIG['frequence'])
+    exhaustive = bench_recherche(dates, X, y, CONFIG)
+    assert exhaustive['fenetres'] == 3
+    assert exhaustive['sous_ensembles'] == 3 * nb_sous_ensembles(4, 3)
+    bb = bench_recherche(dates, X, y, {**CONFIG, 'recherche_bb': True})
+    assert 0 < bb['sous_ensembles'] < exhaustive['sous_ensembles']
+    assert 'pic_rss_processus_calcul_mo' not in bb
+
+
+def test_main_enregistre_et_compare(tmp_path, capsys):
+    pytest.importorskip("statsmodels")  # cas trouver_meilleur_modele
+    resultats = tmp_path / "mesures.jsonl"
+    arguments = ['--mois', '14', '--frequence', 'MS', '--variables', '3', '--max-features', '2',
+                 '--modeles', 'lineaire', '--repetitions', '1', '--resultats', str(resultats)]
+    assert benchmark_ipmvp.main(arguments) == 0
+    mesures = [json.loads(ligne) for ligne in resultats.read_text(encoding='utf-8').splitlines()]
+    assert [mesure['cas'] for mesure in mesures] == list(benchmark_ipmvp.CAS)
+    assert all(mesure['mesures']['duree_s'] > 0 for mesure in mesures)
+
+    capsys.readouterr()
+    assert benchmark_ipmvp.main(arguments + ['--cas', 'degres_jours']) == 0
+    assert "la durée de la mesure précédente" in capsys.readouterr().out
+    assert len(resultats.read_text(encoding='utf-8').splitlines()) == len(benchmark_ipmvp.CAS) + 1
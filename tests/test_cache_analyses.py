@@ -0,0 +1,61 @@
+import sqlite3
+
+import pytest
+
+import cache_analyses
+from cache_analyses import CacheAnalyses, cle_analyse
+from donnees import empreinte_contenu
+from moteur_ipmvp import rechercher_modeles, types_modeles_a_tester
+
+
+@pytest.fixture
+def recherche(donnees_regression):
+    X, y = donnees_regression
+    resultat = rechercher_modeles(X, y, types_modeles_a_tester("Linéaire"), 2)
+    del resultat['meilleur']['model']  # Seules les données sérialisables sont utiles au test
+    return resultat
+
+
+def test_cle_analyse():
+    classeur, modifie = empreinte_contenu(b"classeur"), empreinte_contenu(b"classeur modifie")
+    assert cle_analyse(classeur, {'mois': 12}) == cle_analyse(classeur, {'mois': 12})
+    assert cle_analyse(classeur, {'mois': 12}) != cle_analyse(classeur, {'mois': 24})
+    assert cle_analyse(classeur, {'mois': 12}) != cle_analyse(modifie, {'mois': 12})
+
+
+def test_ecrire_puis_lire(tmp_path, recherche):
+    cache = CacheAnalyses(chemin=str(tmp_path / "cache.sqlite"))
+    assert cache.lire("absente") is None
+    assert cache.ecrire("cle", recherche)
+
+    relu = cache.lire("cle")
+    assert relu['meilleur']['model_info']['r2'] == recherche['meilleur']['model_info']['r2']
+    assert [m['r2'] for m in relu['classement'].meilleurs()] == [m['r2'] for m in recherche['classement'].meilleurs()]
+    assert relu['classement'].taille == recherche['classement'].taille
+
+
+def test_autre_version_du_moteur_ignoree(tmp_path, recherche):
+    chemin = str(tmp_path / "cache.sqlite")
+    CacheAnalyses(chemin=chemin, version="ancienne").ecrire("cle", recherche)
+    assert CacheAnalyses(chemin=chemin, version="nouvelle").lire("cle") is None
+    assert CacheAnalyses(chemin=chemin, version="ancienne").lire("cle") is None  # Entrée supprimée
+
+
+def test_eviction_des_moins_recents(tmp_path, recherche):
+    chemin = str(tmp_path / "cache.sqlite")
+    cache = CacheAnalyses(chemin=chemin)
+    cache.ecrire("a", recherche)
+    with sqlite3.connect(chemin) as connexion:
+        taille = connexion.execute("SELECT taille FROM analyses WHERE cle = 'a'").fetchone()[0]
+
+    # Place pour une seule entrée : écrire b évince a
+    cache.taille_max = int(1.5 * taille)
+    cache.ecrire("b", recherche)
+    assert cache.lire("a") is None
+    assert cache.lire("b") is not None
+
+
+def test_version_couvre_lecture_et_degres_jours():
+    # Une modification de la lecture, de l'agrégation ou des degrés-jours change les résultats
+    assert {'donnees.py', 'degres_jours.py', 'moteur_ipmvp.py'} <= set(cache_analyses.MODULES_MOTEUR)
+    assert len(cache_analyses.VERSION_MOTEUR) == 16
@@ -0,0 +1,70 @@
+import json
+
+from chronometrage import Chronometre, chronometrer_iteration, etape
+from moteur_ipmvp import rechercher_modeles, types_modeles_a_tester
+
+
+def test_etapes_et_fusion():
+    chronometre = Chronometre()
+    for _ in range(3):
+        with etape(chronometre, "lecture"):
+            pass
+    with etape(None, "ignorée"):
+        pass
+    autre = Chronometre()
+    autre.ajouter("lecture", 2.0, appels=4)
+    chronometre.fusionner(autre.resume())
+
+    resume = chronometre.resume()
+    assert list(resume) == ["lecture"]
+    assert resume["lecture"]['appels'] == 7
+    assert resume["lecture"]['duree_s'] >= 2.0
+    assert json.loads(chronometre.to_json(fichier="site.xlsx"))['fichier'] == "site.xlsx"
+
+
+def test_chronometrer_iteration():
+    chronometre = Chronometre()
+    assert list(chronometrer_iteration(chronometre, "fenêtres", range(4))) == [0, 1, 2, 3]
+    assert chronometre.appels["fenêtres"] == 4
+    assert list(chronometrer_iteration(None, "fenêtres", range(2))) == [0, 1]
+
+
+def test_recherche_chronometree(donnees_regression):
+    X, y = donnees_regression
+    chronometre = Chronometre()
+    rechercher_modeles(X, y, types_modeles_a_tester("Ridge"), 2, chronometre=chronometre)
+    etapes = chronometre.resume()
+    assert etapes["ajustement des modèles"]['appels'] == 5 + 10
+    assert etapes["t de Student"]['appels'] == 5 + 10
+
+
+def test_iteration_vide_sans_division_par_zero(donnees_regression):
+    X, y = donnees_regression
+    chronometre = Chronometre()
+    rechercher_modeles(X, y, types_modeles_a_tester("Linéaire"), 2, periodes=[],
+                       chronometre=chronometre)
+    tableau = chronometre.dataframe()
+    assert len(tableau) > 0
+    vides = tableau[tableau['Appels'] == 0]
+    assert len(vides) > 0
+    assert vides['Durée moyenne (ms)'].isna().all()
+
+
+def test_journaliser_visible_par_defaut():
+    import logging
+
+    import chronometrage
+    assert chronometrage.logger.isEnabledFor(logging.INFO)
+    assert chronometrage.logger.handlers
+    enregistrements = []
+    gestionnaire = logging.Handler()
+    gestionnaire.emit = enregistrements.append
+    chronometrage.logger.addHandler(gestionnaire)
+    try:
+        chronometre = Chronometre()
+        chronometre.ajouter("lecture", 0.5)
+        chronometre.journaliser(fichier="site.xlsx")
+    finally:
+        chronometrage.logger.removeHandler(gestionnaire)
+    message = enregistrements[0].getMessage()
+    assert json.loads(message.split("Performance IPMVP : ", 1)[1])['fichier'] == "site.xlsx"
@@ -0,0 +1,81 @@
+import numpy as np
+
+from classement import ClassementModeles, ResultatsModeles
+
+
+def _modele(r2, features, model_type="Linéaire", **autres):
+    return {'r2': r2, 'features': list(features), 'model_type': model_type, **autres}
+
+
+def test_classement_borne_garde_les_meilleurs():
+    rng = np.random.default_rng(0)
+    valeurs = rng.uniform(size=200)
+    classement = ClassementModeles(taille=15)
+    for i, r2 in enumerate(valeurs):
+        classement.ajouter(_modele(r2, [f"x{i}"]))
+
+    assert len(classement) == 15
+    assert classement.nb_proposes == 200
+    np.testing.assert_array_equal([m['r2'] for m in classement.meilleurs()], np.sort(valeurs)[::-1][:15])
+
+
+def test_classement_dedoublonne_type_et_variables():
+    classement = ClassementModeles(taille=5)
+    classement.ajouter(_modele(0.6, ['a', 'b'], period='p1'))
+    classement.ajouter(_modele(0.8, ['b', 'a'], period='p2'))  # Même clé, meilleur R² : remplace
+    classement.ajouter(_modele(0.7, ['a', 'b'], period='p3'))  # Même clé, moins bon : ignoré
+    classement.ajouter(_modele(0.5, ['a', 'b'], model_type="Ridge"))
+
+    meilleurs = classement.meilleurs()
+    assert [(m['model_type'], m.get('period')) for m in meilleurs] == [("Linéaire", 'p2'), ("Ridge", None)]
+
+
+def test_classement_egalite_et_nan():
+    classement = ClassementModeles(taille=2)
+    classement.ajouter(_modele(float('nan'), ['c']))
+    classement.ajouter(_modele(0.5, ['a']))
+    classement.ajouter(_modele(0.5, ['b']))  # À R² égal, le premier proposé reste devant
+    assert [m['features'] for m in classement.meilleurs()] == [['a'], ['b']]
+
+
+def test_resultats_modeles_en_colonnes():
+    t_stats = {'a': {'t_value': 3.0, 'p_value': 0.01}, 'b': {'t_value': -1.0, 'p_value': 0.3}}
+    modeles = [
+        _modele(0.7, ['a', 'b'], coefficients={'a': 2.0, 'b': -1.0}, t_stats=t_stats, classe='good'),
+        _modele(0.9, ['a', 'b'], coefficients={'a': 2.5, 'b': -0.5}, t_stats=t_stats, classe='medium'),
+        _modele(0.8, ['c'], model_type="Polynomiale", coefficients={'c': 1.0, 'c^2': 0.1}, classe='good'),
+    ]
+    resultats = ResultatsModeles.depuis_modeles(modeles * 30)  # Croissance au-delà de la capacité
+    assert len(resultats) == 90
+    assert resultats.variables == ['a', 'b', 'c']
+    np.testing.assert_array_equal(resultats.tableau['masque'][2], [False, False, True])
+    assert resultats.conformes()[:3].tolist() == [True, False, True]
+
+    t_moyen, part, nb = resultats.statistiques_t()
+    assert (t_moyen[0], part[0], nb[0]) == (2.0, 0.5, 2)
+    assert np.isnan(t_moyen[2]) and nb[2] == 0  # Pas de valeur t pour les polynômes
+
+    # Un modèle par (type, variables), meilleur R² en premier
+    np.testing.assert_array_equal(resultats.classement(), [1, 2])
+    df = resultats.dataframe()
+    assert df['variables'].tolist() == ['a, b', 'c']
+    assert df['r2'].tolist() == [0.9, 0.8]
+
+
+def test_formes_de_points_de_rupture_distinctes():
+    formes = ('3P chauffage', '3P climatisation', '4P', '5P')
+    modeles = [_modele(0.9 - 0.01 * i, ['temperature'], model_type="Point de rupture", forme=forme,
+                       model_name=f"Modèle {forme} (point de rupture)") for i, forme in enumerate(formes)]
+    classement = ClassementModeles(taille=10)
+    for model_info in modeles:
+        classement.ajouter(model_info)
+    assert [m['forme'] for m in classement.meilleurs()] == list(formes)
+
+    resultats = classement.resultats()
+    assert len(resultats.classement()) == 4
+    assert resultats.tableau['model_type'][0] == "Point de rupture"
+
+    # Type de modèle plus long que l'ancienne largeur de colonne : conservé en entier
+    long = "Régression par morceaux pondérée"
+    resultats.ajouter(_modele(0.5, ['temperature'], model_type=long))
+    assert resultats.tableau['model_type'][-1] == long
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from degres_jours import degres_jours, degres_jours_mensuels, degres_jours_par_mois, meilleure_base, nom_colonne
+
+
+@pytest.fixture
+def temperatures():
+    rng = np.random.default_rng(1)
+    dates = pd.date_range('2021-01-01', '2022-12-31', freq='D')
+    t = 12 - 9 * np.cos(2 * np.pi * dates.dayofyear.to_numpy() / 365.25) + rng.normal(scale=3, size=len(dates))
+    t[[10, 400]] = np.nan
+    return dates, t
+
+
+def test_degres_jours_quotidiens():
+    matrice = degres_jours([10.0, 20.0, np.nan], [18, 15], chauffage=True)
+    np.testing.assert_array_equal(matrice[:2], [[8.0, 5.0], [0.0, 0.0]])
+    assert np.isnan(matrice[2]).all()
+    np.testing.assert_array_equal(degres_jours([25.0], [22, 24], chauffage=False), [[3.0, 1.0]])
+    assert (nom_colonne(18), nom_colonne(22.5, chauffage=False)) == ('dju_base_18', 'djf_base_22.5')
+
+
+def test_degres_jours_mensuels_egal_boucle(temperatures):
+    dates, t = temperatures
+    mensuels = degres_jours_mensuels(dates, t, bases_dju=[16, 18], bases_djf=[22])
+
+    serie = pd.Series(t, index=dates)
+    for base in (16, 18):
+        attendu = (base - serie).clip(lower=0).groupby(dates.to_period('M')).sum()
+        np.testing.assert_allclose(mensuels[nom_colonne(base)], attendu)
+    attendu = (serie - 22).clip(lower=0).groupby(dates.to_period('M')).sum()
+    np.testing.assert_allclose(mensuels['djf_base_22'], attendu)
+    assert len(mensuels) == 24
+
+
+@pytest.mark.parametrize('chauffage', [True, False])
+def test_sommes_cumulees_egal_diffusion(temperatures, chauffage):
+    dates, t = temperatures
+    bases = np.arange(10.0, 26.0, 0.5)
+    par_mois = degres_jours_par_mois(dates, t, bases[::-1], chauffage=chauffage)
+    diffusion = degres_jours_mensuels(dates, t, **{'bases_dju' if chauffage else 'bases_djf': bases[::-1]})
+    pd.testing.assert_frame_equal(par_mois, diffusion, check_exact=False, rtol=1e-10, atol=1e-9)
+
+
+def test_meilleure_base_retrouve_la_base_du_batiment(temperatures):
+    dates, t = temperatures
+    mensuels = degres_jours_mensuels(dates, t, bases_dju=[17.5])
+    consommation = 2000 + 35 * mensuels['dju_base_17.5']
+
+    base, scores = meilleure_base(dates, t, consommation, np.arange(14.0, 21.0, 0.5))
+    assert base == 17.5
+    assert scores[17.5] == pytest.approx(1.0)
+
+    # Moins de trois mois communs : aucune base exploitable
+    base, _ = meilleure_base(dates, t, consommation.iloc[:2], np.arange(14.0, 21.0, 0.5))
+    assert base is None
@@ -0,0 +1,111 @@
+import io
+import os
+
+import pandas as pd
+import pytest
+
+import donnees
+from chronometrage import Chronometre
+from donnees import charger_fichier, detecter_colonnes, empreinte_contenu, lire_donnees
+
+
+@pytest.fixture
+def releves():
+    return pd.DataFrame({
+        'Date': pd.date_range('2021-01-01', periods=24, freq='MS'),
+        'Consommation kWh': [1000.5 + 10 * i for i in range(24)],
+        'DJU': [300.0 - 10 * i for i in range(24)]
+    })
+
+
+@pytest.fixture
+def copies(tmp_path, monkeypatch):
+    repertoire = tmp_path / "copies"
+    monkeypatch.setattr(donnees, 'REPERTOIRE_COPIES', str(repertoire))
+    return repertoire
+
+
+def test_lire_csv_et_format_francais(releves, copies):
+    anglais = releves.to_csv(index=False).encode()
+    francais = releves.to_csv(index=False, sep=';', decimal=',').encode()
+    for contenu in (anglais, francais):
+        df = lire_donnees(contenu, "releves.csv")
+        assert df['Consommation kWh'].tolist() == releves['Consommation kWh'].tolist()
+        assert detecter_colonnes(df) == ('Date', 'Consommation kWh')
+
+
+def test_lire_parquet_et_arrow(releves):
+    tampon = io.BytesIO()
+    releves.to_feather(tampon)
+    pd.testing.assert_frame_equal(lire_donnees(tampon.getvalue(), "releves.arrow"), releves)
+    with pytest.raises(ValueError):
+        lire_donnees(b"", "releves.txt")
+
+
+def test_copies_parquet_relues_et_bornees(releves, copies, monkeypatch):
+    pytest.importorskip("pyarrow")
+    contenus = [releves.assign(DJU=releves['DJU'] + i).to_csv(index=False).encode() for i in range(3)]
+
+    lire_donnees(contenus[0], "site.csv")
+    (copie,) = os.listdir(copies)
+    taille = os.path.getsize(copies / copie)
+    # La copie est relue à l'import suivant du même contenu, sans relire le CSV
+    monkeypatch.setattr(donnees, '_lire_csv', lambda contenu: pytest.fail("CSV relu"))
+    assert lire_donnees(contenus[0], "site.csv")['DJU'].tolist() == releves['DJU'].tolist()
+    monkeypatch.undo()
+    monkeypatch.setattr(donnees, 'REPERTOIRE_COPIES', str(copies))
+
+    # Place pour deux copies : la moins récemment utilisée est supprimée
+    monkeypatch.setattr(donnees, 'TAILLE_MAX_COPIES', int(2.5 * taille))
+    lire_donnees(contenus[1], "site.csv")
+    os.utime(copies / copie, (0, 0))
+    lire_donnees(contenus[2], "site.csv")
+    assert len(os.listdir(copies)) == 2
+    assert copie not in os.listdir(copies)
+
+
+def test_charger_fichier_une_fois_par_contenu(releves, copies, monkeypatch):
+    contenu = releves.to_csv(index=False).encode()
+    empreinte = empreinte_contenu(contenu)
+    session = {}
+    chronometre = Chronometre()
+    df, date_col, conso_col = charger_fichier(contenu, "site.csv", empreinte, session, chronometre)
+    assert (date_col, conso_col) == ('Date', 'Consommation kWh')
+    df['DJU'] = 0.0  # La version conservée n'est pas modifiée
+
+    # Même contenu : données reprises de la session, sans relecture ni nouvelle empreinte
+    monkeypatch.setattr(donnees, 'lire_donnees', lambda *args: pytest.fail("fichier relu"))
+    monkeypatch.setattr(donnees, 'empreinte_contenu', lambda contenu: pytest.fail("empreinte recalculée"))
+    df, _, _ = charger_fichier(contenu, "site.csv", empreinte, session, chronometre)
+    assert df['DJU'].tolist() == releves['DJU'].tolist()
+    assert chronometre.appels["lecture du fichier"] == 1
+    monkeypatch.undo()
+    monkeypatch.setattr(donnees, 'REPERTOIRE_COPIES', str(copies))
+
+    # Autre contenu : relu
+    autre = releves.assign(DJU=releves['DJU'] + 1).to_csv(index=False).encode()
+    df, _, _ = charger_fichier(autre, "site.csv", empreinte_contenu(autre), session, chronometre)
+    assert df['DJU'].tolist() == (releves['DJU'] + 1).tolist()
+    assert chronometre.appels["lecture du fichier"] == 2
+
+
+@pytest.mark.parametrize('pas', ['MS', 'D'])
+def test_agreger_intervalles_par_blocs(pas):
+    horodatages = pd.date_range('2022-01-30', '2022-03-02 23:45', freq='15min')
+    releves = pd.DataFrame({
+        'Date': horodatages,
+        'Puissance kWh': (horodatages.hour + 1).astype(float),
+        'Température': horodatages.day.astype(float)
+    })
+    releves.loc[5, 'Puissance kWh'] = float('nan')
+    contenu = releves.to_csv(index=False).encode()
+
+    # Petits blocs : des jours et des mois sont à cheval sur plusieurs blocs
+    agregats, date_col, conso_col = donnees.agreger_intervalles(contenu, "releves.csv", pas=pas, taille_bloc=1000)
+    assert (date_col, conso_col) == ('Date', 'Puissance kWh')
+
+    groupes = releves.set_index('Date').resample(pas)
+    attendu = pd.DataFrame({'Puissance kWh': groupes['Puissance kWh'].sum(),
+                            'Température': groupes['Température'].mean()})
+    pd.testing.assert_frame_equal(agregats.set_index('Date')[attendu.columns], attendu,
+                                  check_freq=False, check_names=False)
@@ -0,0 +1,114 @@
+import csv
+import multiprocessing
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import lot_ipmvp
+
+
+def _ecrire_site(chemin, graine):
+    rng = np.random.default_rng(graine)
+    dates = pd.date_range('2020-01-01', periods=30, freq='MS')
+    dju = rng.uniform(0, 400, size=30)
+    pd.DataFrame({
+        'Date': dates.strftime('%Y-%m-%d'),
+        'Consommation kWh': 5000 + 20 * dju + rng.normal(scale=50, size=30),
+        'DJU': dju,
+        'Occupation': rng.uniform(0.5, 1.0, size=30)
+    }).to_csv(chemin, index=False)
+
+
+def _lire(sortie):
+    with open(sortie, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def test_lot_analyse_puis_reprend(tmp_path, capsys):
+    for i in range(2):
+        _ecrire_site(tmp_path / f"site_{i}.csv", i)
+    (tmp_path / "notes.txt").write_text("ignoré")
+    sortie = str(tmp_path / "resultats.csv")
+    arguments = [str(tmp_path), '--sortie', sortie, '--modele', 'lineaire', '--processus', '2']
+
+    assert lot_ipmvp.main(arguments) == 0
+    lignes = _lire(sortie)
+    assert [ligne['statut'] for ligne in lignes] == ['ok', 'ok']
+    assert {ligne['colonne_conso'] for ligne in lignes} == {'Consommation kWh'}
+    assert all(float(ligne['r2']) > 0.9 for ligne in lignes)
+    assert all('DJU' in ligne['features'] for ligne in lignes)
+
+    # Deuxième passage : fichiers inchangés, rien n'est réanalysé
+    capsys.readouterr()
+    assert lot_ipmvp.main(arguments) == 0
+    assert "2 déjà à jour, 0 à analyser" in capsys.readouterr().out
+
+    # Paramètres modifiés : tout est réanalysé
+    assert lot_ipmvp.main(arguments + ['--max-features', '1']) == 0
+    assert "0 déjà à jour, 2 à analyser" in capsys.readouterr().out
+
+
+def test_lot_reprend_les_erreurs(tmp_path, capsys):
+    for i in range(2):
+        _ecrire_site(tmp_path / f"site_{i}.csv", i)
+    sortie = str(tmp_path / "resultats.csv")
+    arguments = [str(tmp_path), '--sortie', sortie, '--modele', 'lineaire', '--processus', '1']
+    assert lot_ipmvp.main(arguments) == 0
+
+    # Erreur passagère enregistrée pour un fichier inchangé : il est réanalysé à la reprise
+    lignes = _lire(sortie)
+    lignes[0].update({'statut': 'erreur', 'message': "interrompu"})
+    with open(sortie, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=lot_ipmvp.COLONNES_SORTIE)
+        writer.writeheader()
+        writer.writerows(lignes)
+
+    capsys.readouterr()
+    assert lot_ipmvp.main(arguments) == 0
+    assert "1 déjà à jour, 1 à analyser" in capsys.readouterr().out
+    assert [ligne['statut'] for ligne in _lire(sortie)] == ['ok', 'ok']
+
+
+def test_forcer_conserve_les_autres_fichiers(tmp_path, capsys):
+    for i in range(2):
+        _ecrire_site(tmp_path / f"site_{i}.csv", i)
+    sortie = str(tmp_path / "resultats.csv")
+    options = ['--sortie', sortie, '--modele', 'lineaire', '--processus', '1']
+    assert lot_ipmvp.main([str(tmp_path)] + options) == 0
+
+    capsys.readouterr()
+    assert lot_ipmvp.main([str(tmp_path / "site_0.csv"), '--forcer'] + options) == 0
+    assert "1 fichiers, 0 déjà à jour, 1 à analyser" in capsys.readouterr().out
+    assert [os.path.basename(ligne['fichier']) for ligne in _lire(sortie)] == ['site_0.csv', 'site_1.csv']
+
+
+def _arret_brutal(chemin, options):
+    os._exit(1)
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                    reason="le remplacement d'analyser_fichier doit être hérité par les processus")
+def test_processus_interrompu(tmp_path, monkeypatch, capsys):
+    for i in range(2):
+        _ecrire_site(tmp_path / f"site_{i}.csv", i)
+    sortie = str(tmp_path / "resultats.csv")
+    arguments = [str(tmp_path), '--sortie', sortie, '--modele', 'lineaire', '--processus', '1']
+
+    # Processus de calcul arrêté : une ligne d'erreur par fichier, sans interrompre le lot
+    monkeypatch.setattr(lot_ipmvp, "analyser_fichier", _arret_brutal)
+    assert lot_ipmvp.main(arguments) == 0
+    lignes = _lire(sortie)
+    assert [ligne['statut'] for ligne in lignes] == ['erreur', 'erreur']
+    assert all('BrokenProcessPool' in ligne['message'] for ligne in lignes)
+
+    monkeypatch.undo()
+    capsys.readouterr()
+    assert lot_ipmvp.main(arguments) == 0
+    assert "0 déjà à jour, 2 à analyser" in capsys.readouterr().out
+    assert [ligne['statut'] for ligne in _lire(sortie)] == ['ok', 'ok']
+
+
+def test_lot_sans_fichier(tmp_path):
+    assert lot_ipmvp.main([str(tmp_path), '--sortie', str(tmp_path / "resultats.csv")]) == 1
@@ -0,0 +1,106 @@
+import functools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import moteur_ipmvp
+from moteur_ipmvp import calculate_t_stats, periodes_glissantes, rechercher_modeles, types_modeles_a_tester
+from moteur_regression import MatriceGram, extraire_resultat
+
+
+@pytest.fixture
+def donnees_mensuelles(donnees_regression):
+    X, y = donnees_regression
+    dates = pd.Series(pd.date_range('2019-01-01', periods=len(y), freq='MS'))
+    return dates, X, y
+
+
+def _resume(resultat):
+    return [(m['model_type'], tuple(m['features']), m['period'], round(m['r2'], 10))
+            for m in resultat['classement'].meilleurs()]
+
+
+def test_recherche_parallele_egal_sequentielle(donnees_mensuelles):
+    dates, X, y = donnees_mensuelles
+    periodes = periodes_glissantes(dates)[::12]
+    types_modeles = types_modeles_a_tester("Linéaire")
+    sequentiel = rechercher_modeles(X, y, types_modeles, 3, dates=dates, periodes=periodes)
+    parallele = rechercher_modeles(X, y, types_modeles, 3, dates=dates, periodes=periodes,
+                                   parallele=True, max_workers=2)
+
+    assert parallele['nb_periodes'] == sequentiel['nb_periodes'] == len(periodes)
+    assert parallele['meilleur']['period'] == sequentiel['meilleur']['period']
+    assert parallele['meilleur']['model_info']['features'] == sequentiel['meilleur']['model_info']['features']
+    assert _resume(parallele) == _resume(sequentiel)
+
+
+def test_egalites_de_r2_departagees_comme_en_sequentiel(donnees_mensuelles, monkeypatch):
+    dates, X, y = donnees_mensuelles
+    X = X.assign(dju_bis=X['dju'], occupation_bis=X['occupation'])  # modèles de R² identiques
+    periodes = periodes_glissantes(dates)[::24]
+    types_modeles = types_modeles_a_tester("Linéaire") + [("Lasso", "Régression Lasso (chemin α)", {'alpha': None})]
+    sequentiel = rechercher_modeles(X, y, types_modeles, 1, dates=dates, periodes=periodes, taille_classement=6)
+
+    # Une tâche par combinaison, reçues de la dernière à la première
+    monkeypatch.setattr(moteur_ipmvp, "rechercher_en_parallele",
+                        functools.partial(moteur_ipmvp.rechercher_en_parallele, taille_lot=1))
+    monkeypatch.setattr(moteur_ipmvp, "as_completed", lambda futures: list(futures)[::-1])
+    parallele = rechercher_modeles(X, y, types_modeles, 1, dates=dates, periodes=periodes, taille_classement=6,
+                                   parallele=True, max_workers=2)
+    assert _resume(parallele) == _resume(sequentiel)
+
+
+@pytest.mark.parametrize('model_type', ["Polynomiale", "Automatique (meilleur modèle)"])
+@pytest.mark.parametrize('parallele', [False, True])
+def test_branch_and_bound_modeles_polynomiaux(donnees_mensuelles, model_type, parallele):
+    dates, X, y = donnees_mensuelles
+    X = X.assign(vent=X['bruit'] * 2 + 1)
+    resultat = rechercher_modeles(X, y, types_modeles_a_tester(model_type), 3, recherche_bb=True,
+                                  parallele=parallele, max_workers=2)
+
+    assert resultat['stats_bb']['evalues'] > 0
+    types = {m['model_type'] for m in resultat['classement'].meilleurs()}
+    assert "Polynomiale" in types
+    assert resultat['meilleur']['model_info']['r2'] > 0.9
+
+
+def test_valeurs_t_du_lot_egal_calculate_t_stats(donnees_regression):
+    X, y = donnees_regression
+    X = X.assign(constante=5.0, dju_double=2 * X['dju'])
+    combos = [('dju', 'occupation'), ('bruit', 'jours'), ('dju', 'constante'), ('djf', 'bruit'),
+              ('dju', 'dju_double')]
+    lot = MatriceGram(X, y).evaluer_lot(combos)
+
+    for i, combo in enumerate(combos):
+        resultat = extraire_resultat(lot, i)
+        reference = calculate_t_stats(X[list(combo)], y, resultat['model'], resultat['coefficients'])
+        if 'constante' in combo or 'dju_double' in combo:
+            # Combinaison colinéaire : valeurs t indéfinies pour elle seule
+            assert all(stat is None for stat in reference.values())
+            assert np.isnan(lot['t_values'][i]).all() and np.isnan(lot['p_values'][i]).all()
+            continue
+        for j, feature in enumerate(combo):
+            assert lot['t_values'][i, j] == pytest.approx(reference[feature]['t_value'], rel=1e-8)
+            assert lot['p_values'][i, j] == pytest.approx(reference[feature]['p_value'], rel=1e-6, abs=1e-300)
+
+
+def test_recherche_sans_periode_et_criteres(donnees_regression):
+    X, y = donnees_regression
+    appels = []
+    resultat = rechercher_modeles(X, y, types_modeles_a_tester("Linéaire"), 3,
+                                  criteres={'r2_min': 0.5, 'cv_rmse_max': 0.2, 'biais_max': 5},
+                                  progression=lambda fraction, message: appels.append(fraction))
+
+    meilleur = resultat['meilleur']
+    assert resultat['nb_periodes'] == 1
+    assert (meilleur['period'], meilleur['lo'], meilleur['hi']) == ('selected', 0, len(y))
+    assert set(meilleur['model_info']['features']) == {'dju', 'occupation', 'djf'}
+    assert appels[0] == 0.0 and appels[-1] == 1.0
+    # Toutes les combinaisons de 1 à 3 variables parmi 5 sont proposées au classement
+    assert resultat['classement'].nb_proposes == 5 + 10 + 10
+
+    # Critère inatteignable : aucun meilleur modèle, mais le classement reste rempli
+    resultat = rechercher_modeles(X, y, types_modeles_a_tester("Linéaire"), 2, criteres={'r2_min': 1.1})
+    assert resultat['meilleur'] is None
+    assert len(resultat['classement']) > 0
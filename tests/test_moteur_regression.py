@@ -0,0 +1,147 @@
+from itertools import combinations
+from math import comb
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import PolynomialFeatures
+
+from moteur_regression import (BanquePolynomiale, FenetresGlissantes, MatriceGram, evaluer_lot_polynomial,
+                               extraire_resultat, meilleurs_sous_ensembles)
+
+
+def _moindres_carres(X, y):
+    """Référence : moindres carrés sur [1, X] par np.linalg.lstsq"""
+    Z = np.column_stack([np.ones(len(y)), np.asarray(X, dtype=float)])
+    beta = np.linalg.lstsq(Z, np.asarray(y, dtype=float), rcond=None)[0]
+    residus = np.asarray(y, dtype=float) - Z @ beta
+    return beta, float(residus @ residus)
+
+
+def test_ajuster_egal_moindres_carres(donnees_regression):
+    X, y = donnees_regression
+    combo = ['dju', 'occupation', 'djf']
+    resultat = MatriceGram(X, y).ajuster(combo)
+    beta, ssr = _moindres_carres(X[combo], y)
+
+    assert resultat['intercept'] == pytest.approx(beta[0], rel=1e-9)
+    np.testing.assert_allclose(resultat['coefficients'], beta[1:], rtol=1e-9)
+    assert resultat['ssr'] == pytest.approx(ssr, rel=1e-8)
+    sst = float(((y - y.mean()) ** 2).sum())
+    assert resultat['r2'] == pytest.approx(1 - ssr / sst, rel=1e-10)
+    # RMSE corrigé IPMVP : n - p - 1 degrés de liberté
+    assert resultat['rmse'] == pytest.approx(np.sqrt(ssr / (len(y) - 4)), rel=1e-8)
+    np.testing.assert_allclose(resultat['model'].predict(X[combo]), beta[0] + X[combo].to_numpy() @ beta[1:],
+                               rtol=1e-9)
+
+
+def test_ajuster_grandes_consommations(donnees_regression):
+    # Le décalage des colonnes préserve la précision sur des valeurs élevées
+    X, y = donnees_regression
+    y = y + 1e7
+    beta, _ = _moindres_carres(X[['dju']], y)
+    resultat = MatriceGram(X, y).ajuster(['dju'])
+    assert resultat['coefficients'][0] == pytest.approx(beta[1], rel=1e-7)
+    assert resultat['intercept'] == pytest.approx(beta[0], rel=1e-12)
+
+
+def test_depuis_produits(donnees_regression):
+    X, y = donnees_regression
+    gram = MatriceGram(X, y)
+    copie = MatriceGram.depuis_produits(gram.G, gram.features, gram.decalage)
+    assert copie.n == len(y)
+    assert copie.ajuster(['dju'])['ssr'] == pytest.approx(gram.ajuster(['dju'])['ssr'])
+
+
+def test_evaluer_lot_egal_ajustements_separes(donnees_regression):
+    X, y = donnees_regression
+    gram = MatriceGram(X, y)
+    combos = list(combinations(X.columns, 2))
+    lot = gram.evaluer_lot(combos)
+
+    assert lot['features'] == combos
+    for i, combo in enumerate(combos):
+        beta, ssr = _moindres_carres(X[list(combo)], y)
+        assert lot['ssr'][i] == pytest.approx(ssr, rel=1e-8)
+        assert lot['intercept'][i] == pytest.approx(beta[0], rel=1e-9)
+        np.testing.assert_allclose(lot['coefficients'][i], beta[1:], rtol=1e-8)
+        # Moindres carrés avec constante : biais nul
+        assert abs(lot['nmbe'][i]) < 1e-12
+
+
+def test_evaluer_lot_variables_colineaires(donnees_regression):
+    # Repli pseudo-inverse : prédictions identiques au modèle sans la variable dupliquée
+    X, y = donnees_regression
+    X = X.assign(dju_double=2 * X['dju'])
+    lot = MatriceGram(X, y).evaluer_lot([('dju', 'dju_double'), ('dju', 'occupation')])
+    _, ssr = _moindres_carres(X[['dju']], y)
+    assert lot['ssr'][0] == pytest.approx(ssr, rel=1e-6)
+    assert np.isfinite(lot['coefficients'][1]).all()
+
+
+def test_fenetres_glissantes_egal_recalcul(donnees_regression):
+    X, y = donnees_regression
+    dates = pd.Series(pd.date_range('2020-01-01', periods=len(y), freq='MS'))
+    X = X.copy()
+    X.loc[30, 'bruit'] = np.nan  # Ligne invalide : exclue des produits, fenêtres concernées rejetées
+    fenetres = [(f"p{i}", dates[i], dates[i + 11]) for i in range(len(y) - 11)]
+
+    glissantes = FenetresGlissantes(dates, X, y)
+    glissantes.RECALAGE = 7  # Alterner mises à jour et recalages complets
+    for nom, debut, fin, lo, hi, gram in glissantes.parcourir(fenetres):
+        masque = ((dates >= debut) & (dates <= fin)).to_numpy()
+        assert (lo, hi) == (np.flatnonzero(masque)[0], np.flatnonzero(masque)[-1] + 1)
+        if X[masque].isna().any().any():
+            assert gram is None
+            continue
+        reference = MatriceGram(X[masque], y[masque], decalage=glissantes.decalage)
+        np.testing.assert_allclose(gram.G, reference.G, rtol=1e-9, atol=1e-6)
+
+
+def test_branch_and_bound_egal_recherche_exhaustive():
+    rng = np.random.default_rng(7)
+    X = pd.DataFrame(rng.normal(size=(80, 8)), columns=[f"x{i}" for i in range(8)])
+    X['x7'] = X['x1'] + 0.1 * rng.normal(size=80)  # Variables corrélées : ordre de parcours non trivial
+    y = 5 * X['x1'] - 3 * X['x4'] + X['x6'] + rng.normal(size=80)
+    gram = MatriceGram(X, y)
+
+    meilleurs, stats = meilleurs_sous_ensembles(gram, list(X.columns), 4)
+    assert sorted(meilleurs) == [1, 2, 3, 4]
+    assert stats['total'] == sum(comb(8, k) for k in range(1, 5))
+    assert stats['evalues'] < stats['total']
+    for k, combo in meilleurs.items():
+        exhaustif = min(combinations(X.columns, k), key=gram.ssr)
+        assert gram.ssr(combo) == pytest.approx(gram.ssr(exhaustif), rel=1e-10)
+
+
+def test_banque_polynomiale_egal_sklearn(donnees_regression):
+    X, y = donnees_regression
+    combo = ('dju', 'occupation')
+    banque = BanquePolynomiale(X, 2)
+    lot = evaluer_lot_polynomial(MatriceGram(banque.donnees, y), [combo], 2, banque.centres)
+    resultat = extraire_resultat(lot, 0)
+
+    expansion = PolynomialFeatures(2, include_bias=False).fit(X[list(combo)])
+    reference = LinearRegression().fit(expansion.transform(X[list(combo)]), y)
+    assert list(resultat['model'].termes_) == list(expansion.get_feature_names_out())
+    np.testing.assert_allclose(resultat['model'].coef_, reference.coef_, rtol=1e-6)
+    assert resultat['model'].intercept_ == pytest.approx(reference.intercept_, rel=1e-8)
+    np.testing.assert_allclose(resultat['model'].predict(X), reference.predict(expansion.transform(X[list(combo)])),
+                               rtol=1e-9)
+
+
+def test_branch_and_bound_rend_l_ordre_des_candidats():
+    # Candidats triés par SSR pendant la recherche : la combinaison rendue doit nommer des
+    # interactions existantes de la banque polynomiale
+    rng = np.random.default_rng(3)
+    X = pd.DataFrame(rng.normal(size=(60, 6)), columns=list('abcdef'))
+    y = 3 * X['f'] + X['e'] + 0.1 * rng.normal(size=60)
+    banque = BanquePolynomiale(X, 2)
+    gram = MatriceGram(banque.donnees, y)
+
+    meilleurs, _ = meilleurs_sous_ensembles(gram, banque.features, 3)
+    for combo in meilleurs.values():
+        assert list(combo) == sorted(combo, key=banque.features.index)
+        assert set(banque.termes(combo)) <= set(banque.donnees.columns)
+    assert set(meilleurs[2]) == {'e', 'f'}
@@ -0,0 +1,54 @@
+import pytest
+
+pytest.importorskip("statsmodels")
+
+import optimized_model  # noqa: E402
+from optimized_model import CacheLRU, OptimizedModelIPMVP, empreinte_donnees, vider_cache_combinaisons  # noqa: E402
+
+
+def test_cache_lru_evince_le_moins_recent():
+    cache = CacheLRU(taille=2)
+    cache.ajouter('a', 1)
+    cache.ajouter('b', 2)
+    assert cache.get('a') == 1  # 'a' devient le plus récent
+    cache.ajouter('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c'), len(cache)) == (1, 3, 2)
+
+
+def test_empreinte_donnees(donnees_regression):
+    X, y = donnees_regression
+    assert empreinte_donnees(X, y) == empreinte_donnees(X.copy(), y.copy())
+    assert empreinte_donnees(X, y) != empreinte_donnees(X, y + 1)
+    assert empreinte_donnees(X, y) != empreinte_donnees(X.rename(columns={'dju': 'dju_18'}), y)
+
+
+def test_recherche_mise_en_cache(donnees_regression, monkeypatch):
+    X, y = donnees_regression
+    vider_cache_combinaisons()
+    premier = OptimizedModelIPMVP()
+    assert premier.trouver_meilleur_modele(X, y, max_features=3)
+
+    # Même recherche sur les mêmes données : servie par le cache, sans nouvelle recherche
+    def interdite(*args, **kwargs):
+        raise AssertionError("recherche refaite")
+    monkeypatch.setattr(optimized_model.OptimizedModelIPMVP, '_rechercher', interdite)
+    second = OptimizedModelIPMVP()
+    progression = []
+    assert second.trouver_meilleur_modele(X.copy(), y.copy(), max_features=3, progress_callback=progression.append)
+    assert progression == [1.0]
+    assert (second.best_features, second.best_model_type, second.best_formula) == \
+        (premier.best_features, premier.best_model_type, premier.best_formula)
+    assert (second.best_y_pred == premier.best_y_pred).all()
+
+    # Paramètres différents : nouvelle recherche
+    with pytest.raises(AssertionError, match="recherche refaite"):
+        OptimizedModelIPMVP().trouver_meilleur_modele(X, y, max_features=2)
+
+
+def test_copie_de_l_application_identique():
+    import os
+    racine = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    copies = [open(os.path.join(racine, *chemin), 'rb').read().replace(b'\r\n', b'\n')
+              for chemin in (("optimized_model.py",), (".streamlit", "optimized_model.py"))]
+    assert copies[0] == copies[1]
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from moteur_ipmvp import rechercher_modeles, types_modeles_a_tester
+from points_rupture import FORMES, ajuster_points_rupture
+
+
+@pytest.fixture
+def temperatures():
+    rng = np.random.default_rng(5)
+    return pd.Series(rng.uniform(-5, 30, size=120), name='temperature')
+
+
+@pytest.mark.parametrize('forme, consommation, points', [
+    ('3P chauffage', lambda t: 500 + 40 * np.maximum(0, 15 - t), (15,)),
+    ('3P climatisation', lambda t: 300 + 25 * np.maximum(0, t - 22), (22,)),
+    ('4P', lambda t: 400 + 30 * np.maximum(0, 18 - t) + 10 * np.maximum(0, t - 18), (18,)),
+    ('5P', lambda t: 400 + 30 * np.maximum(0, 12 - t) + 20 * np.maximum(0, t - 22), (12, 22)),
+])
+def test_points_de_rupture_retrouves(temperatures, forme, consommation, points):
+    rng = np.random.default_rng(6)
+    y = consommation(temperatures.to_numpy()) + rng.normal(scale=5, size=len(temperatures))
+    resultat = ajuster_points_rupture(temperatures, y, forme, nb_candidats=71)
+
+    model = resultat['model']
+    # Grille de 71 candidats sur ~35 °C : pas d'environ 0,5 °C
+    np.testing.assert_allclose(model.points_rupture_, points, atol=1.0)
+    assert resultat['r2'] > 0.99
+    assert list(model.feature_names_in_) == ['temperature']
+
+    # Coefficients du meilleur candidat égaux aux moindres carrés sur ses termes
+    t = temperatures.to_numpy()
+    colonnes = [np.ones(len(y))]
+    if forme != '3P climatisation':
+        colonnes.append(np.maximum(model.points_rupture_[0] - t, 0))
+    if forme != '3P chauffage':
+        colonnes.append(np.maximum(t - model.points_rupture_[-1], 0))
+    beta = np.linalg.lstsq(np.column_stack(colonnes), y, rcond=None)[0]
+    np.testing.assert_allclose(np.r_[model.intercept_, model.coef_], beta, rtol=1e-6)
+
+
+def test_donnees_insuffisantes():
+    assert ajuster_points_rupture(np.arange(5.0), np.arange(5.0), '3P chauffage') is None
+    assert ajuster_points_rupture(np.arange(30.0), np.arange(30.0), '6P') is None
+
+
+def test_recherche_garde_chaque_forme(temperatures):
+    y = pd.Series(500 + 40 * np.maximum(0, 15 - temperatures))
+    X = temperatures.to_frame().assign(occupation=np.linspace(0, 1, len(y)))
+    resultat = rechercher_modeles(X, y, types_modeles_a_tester("Points de rupture"), 1)
+
+    classement = resultat['classement'].meilleurs()
+    assert len(classement) == 2 * len(FORMES)
+    assert {m['forme'] for m in classement if m['features'] == ['temperature']} == set(FORMES)
+    assert len(resultat['classement'].resultats().classement()) == 2 * len(FORMES)
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import Lasso, Ridge
+
+from regularisation import RidgeGCV, chemin_lasso, chemin_ridge, supports_chemin_lasso
+
+
+def _standardisees(X):
+    X = np.asarray(X, dtype=float)
+    return (X - X.mean(axis=0)) / X.std(axis=0)
+
+
+def test_chemin_ridge_egal_sklearn(donnees_regression):
+    X, y = donnees_regression
+    alphas = np.logspace(-2, 3, 6)
+    chemin = chemin_ridge(X, y, alphas)
+    Xs = _standardisees(X)
+
+    for i, alpha in enumerate(alphas):
+        # Même pénalité que sklearn sur les variables standardisées
+        reference = Ridge(alpha=alpha).fit(Xs, y)
+        y_pred = X.to_numpy() @ chemin['coefficients'][i] + chemin['intercept'][i]
+        np.testing.assert_allclose(y_pred, reference.predict(Xs), rtol=1e-9)
+        assert chemin['ssr'][i] == pytest.approx(float(((y - reference.predict(Xs)) ** 2).sum()), rel=1e-8)
+
+
+def test_chemin_ridge_gcv_egal_matrice_chapeau(donnees_regression):
+    X, y = donnees_regression
+    alphas = np.logspace(-2, 3, 6)
+    chemin = chemin_ridge(X, y, alphas)
+    Xs = _standardisees(X)
+    n = len(y)
+
+    for i, alpha in enumerate(alphas):
+        # Matrice chapeau explicite (la constante compte pour un degré de liberté)
+        H = Xs @ np.linalg.solve(Xs.T @ Xs + alpha * np.eye(Xs.shape[1]), Xs.T) + np.ones((n, n)) / n
+        residus = y.to_numpy() - H @ y.to_numpy()
+        gcv = (residus @ residus / n) / (1 - np.trace(H) / n) ** 2
+        assert chemin['ddl'][i] == pytest.approx(np.trace(H), rel=1e-10)
+        assert chemin['gcv'][i] == pytest.approx(gcv, rel=1e-8)
+
+
+def test_ridge_gcv_retient_le_minimum(donnees_regression):
+    X, y = donnees_regression
+    modele = RidgeGCV().fit(X, y)
+    i = int(np.argmin(modele.chemin_['gcv']))
+    assert modele.alpha_ == modele.chemin_['alphas'][i]
+    np.testing.assert_allclose(modele.coef_, modele.chemin_['coefficients'][i])
+
+
+def test_chemin_lasso_egal_sklearn(donnees_regression):
+    X, y = donnees_regression
+    chemin = chemin_lasso(X, y)
+    Xs = _standardisees(X)
+
+    assert np.all(np.diff(chemin['alphas']) < 0)
+    assert not chemin['supports'][0].any()  # alpha_max : tous les coefficients sont nuls
+    for i in range(0, len(chemin['alphas']), 10):
+        reference = Lasso(alpha=chemin['alphas'][i], tol=1e-10, max_iter=100000).fit(Xs, y)
+        np.testing.assert_allclose(chemin['coefficients'][i] * X.std(axis=0, ddof=0).to_numpy(),
+                                   reference.coef_, rtol=1e-4, atol=1e-2)
+        y_pred = X.to_numpy() @ chemin['coefficients'][i] + chemin['intercept'][i]
+        assert chemin['ssr'][i] == pytest.approx(float(((y - y_pred) ** 2).sum()), rel=1e-8)
+
+
+def test_supports_chemin_lasso(donnees_regression):
+    X, y = donnees_regression
+    supports = supports_chemin_lasso(X, y, max_features=2)
+    assert supports
+    assert len({support for support, _ in supports}) == len(supports)
+    for support, modele in supports:
+        assert 1 <= len(support) <= 2
+        assert list(modele.feature_names_in_) == list(support)
+        assert modele.predict(X[list(support)]).shape == (len(y),)
+    # Les variables les plus explicatives entrent en premier sur le chemin
+    assert supports[0][0] == ('dju',)
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from stockage_meteo import ELEMENTS, StockageMeteo, plages_contigues
+
+
+def _observations(debut, fin):
+    dates = pd.date_range(debut, fin, freq='D')
+    return pd.DataFrame({'date': dates, **{element: np.arange(len(dates), dtype=float) for element in ELEMENTS}})
+
+
+def test_plages_contigues():
+    dates = pd.DatetimeIndex(['2022-01-01', '2022-01-02', '2022-01-05', '2022-01-07', '2022-01-08'])
+    assert plages_contigues(dates) == [('2022-01-01', '2022-01-02'), ('2022-01-05', '2022-01-05'),
+                                       ('2022-01-07', '2022-01-08')]
+    assert plages_contigues(pd.DatetimeIndex([])) == []
+
+
+def test_seules_les_dates_absentes_sont_manquantes(tmp_path):
+    stockage = StockageMeteo(chemin=str(tmp_path / "meteo.sqlite"))
+    assert stockage.adresse_resolue("Paris,FR") is None
+
+    observations = _observations('2022-01-01', '2022-01-31')
+    observations.loc[3, 'humidity'] = np.nan
+    stockage.enregistrer("Paris,FR", "Paris, Île-de-France, France", observations.drop(index=range(10, 15)))
+
+    assert stockage.adresse_resolue("Paris,FR") == "Paris, Île-de-France, France"
+    assert stockage.plages_manquantes("Paris, Île-de-France, France", '2021-12-30', '2022-02-02') == [
+        ('2021-12-30', '2021-12-31'), ('2022-01-11', '2022-01-15'), ('2022-02-01', '2022-02-02')]
+
+    lues = stockage.lire("Paris, Île-de-France, France", '2022-01-01', '2022-01-10')
+    assert len(lues) == 10
+    assert np.isnan(lues.loc[3, 'humidity'])
+    assert lues['temp_mean'].tolist() == list(range(10))
+
+
+def test_dates_futures_non_stockees(tmp_path):
+    stockage = StockageMeteo(chemin=str(tmp_path / "meteo.sqlite"))
+    aujourdhui = pd.Timestamp.today().normalize()
+    debut, fin = aujourdhui - pd.Timedelta(days=2), aujourdhui + pd.Timedelta(days=2)
+    stockage.enregistrer("Lyon,FR", "Lyon", _observations(debut, fin))
+
+    # Journée en cours et prévisions : toujours redemandées au service
+    assert stockage.plages_manquantes("Lyon", debut.strftime('%Y-%m-%d'), fin.strftime('%Y-%m-%d')) == [
+        (aujourdhui.strftime('%Y-%m-%d'), fin.strftime('%Y-%m-%d'))]
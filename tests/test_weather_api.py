@@ -0,0 +1,119 @@
+import importlib.util
+import os
+
+import pandas as pd
+import pytest
+import requests
+
+pytest.importorskip("streamlit")
+
+from stockage_meteo import StockageMeteo
+
+# Le client météo est à côté de l'application, dans .streamlit (chargé par son chemin :
+# .streamlit contient aussi une copie d'optimized_model)
+_CHEMIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".streamlit", "weather_api.py")
+_spec = importlib.util.spec_from_file_location("weather_api", _CHEMIN)
+weather_api = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(weather_api)
+
+
+def _reponse(debut, fin, adresse="Paris, Île-de-France, France"):
+    dates = pd.date_range(debut, fin, freq='D')
+    return {'resolvedAddress': adresse,
+            'days': [{'datetime': date.strftime('%Y-%m-%d'), 'temp': float(date.dayofyear), 'tempmax': 20.0,
+                      'tempmin': 5.0, 'humidity': 70.0, 'precip': 1.0} for date in dates]}
+
+
+def test_decouper_periode():
+    assert weather_api.decouper_periode('2021-11-15', '2023-02-10') == [
+        ('2021-11-15', '2021-12-31'), ('2022-01-01', '2022-12-31'), ('2023-01-01', '2023-02-10')]
+    assert weather_api.decouper_periode('2022-03-01', '2022-09-30') == [('2022-03-01', '2022-09-30')]
+    assert weather_api.decouper_periode('2022-12-31', '2022-12-31') == [('2022-12-31', '2022-12-31')]
+    assert weather_api.decouper_periode('2022-12-31', '2023-01-01') == [
+        ('2022-12-31', '2022-12-31'), ('2023-01-01', '2023-01-01')]
+    assert weather_api.decouper_periode('2023-01-02', '2023-01-01') == []
+
+
+def test_fusionner_tranches_dans_l_ordre_des_dates():
+    tranches = weather_api.decouper_periode('2021-12-20', '2023-01-10')
+    reponses = [_reponse(debut, fin) for debut, fin in reversed(tranches)]
+    observations = weather_api.fusionner_tranches(reponses)
+    assert observations['date'].tolist() == list(pd.date_range('2021-12-20', '2023-01-10', freq='D'))
+    assert observations['sunshine_hours'].eq(0).all()
+    assert weather_api.fusionner_tranches([]).empty
+
+
+def test_session_http_tentatives_et_delais(monkeypatch):
+    session = weather_api.session_http()
+    assert weather_api.session_http() is session
+    tentatives = session.get_adapter("https://weather.visualcrossing.com").max_retries
+    assert tentatives.total == 4
+    assert tentatives.backoff_factor == 0.5
+    assert set(tentatives.status_forcelist) == {429, 500, 502, 503, 504}
+    assert tentatives.respect_retry_after_header
+
+    appels = []
+
+    class Reponse:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {}
+
+    class Session:
+        def get(self, url, **options):
+            appels.append((url, options))
+            return Reponse()
+
+    monkeypatch.setattr(weather_api, "session_http", Session)
+    weather_api.WeatherAPI(api_key="cle")._requete("Paris,FR", '2022-01-01', '2022-12-31', {'key': "cle"})
+    url, options = appels[0]
+    assert url.endswith("/Paris,FR/2022-01-01/2022-12-31")
+    assert options['timeout'] == weather_api.DELAIS_REQUETE
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Client météo sur un stockage temporaire ; _requete est remplacée par chaque test"""
+    monkeypatch.setattr(weather_api, "StockageMeteo", lambda: StockageMeteo(chemin=str(tmp_path / "meteo.sqlite")))
+    return weather_api.WeatherAPI(api_key="cle")
+
+
+def test_seule_la_tranche_en_echec_est_reprise(client, monkeypatch):
+    demandes = []
+
+    def requete(location, debut, fin, params):
+        demandes.append((debut, fin))
+        if (debut, fin) == ('2022-01-01', '2022-12-31') and demandes.count((debut, fin)) == 1:
+            raise requests.ConnectionError("coupure")
+        return _reponse(debut, fin)
+
+    monkeypatch.setattr(client, "_requete", requete)
+    observations, adresse = client.get_daily_observations("Paris", '2021-06-01', '2023-03-31')
+    assert adresse == "Paris, Île-de-France, France"
+    assert observations['date'].tolist() == list(pd.date_range('2021-06-01', '2023-03-31', freq='D'))
+    assert sorted(demandes) == [('2021-06-01', '2021-12-31'), ('2022-01-01', '2022-12-31'),
+                                ('2022-01-01', '2022-12-31'), ('2023-01-01', '2023-03-31')]
+
+
+def test_tranches_recuperees_conservees_en_cas_d_echec(client, monkeypatch):
+    demandes = []
+
+    def requete(location, debut, fin, params):
+        demandes.append((debut, fin))
+        if debut == '2022-01-01':
+            raise requests.HTTPError("503 Service Unavailable")
+        return _reponse(debut, fin)
+
+    monkeypatch.setattr(client, "_requete", requete)
+    with pytest.raises(RuntimeError, match="2022-01-01 - 2022-12-31"):
+        client.get_daily_observations("Paris", '2021-06-01', '2023-03-31')
+
+    # Nouvelle analyse : seule l'année en échec est demandée
+    demandes.clear()
+    monkeypatch.setattr(client, "_requete", lambda location, debut, fin, params: (
+        demandes.append((debut, fin)) or _reponse(debut, fin)))
+    observations, _ = client.get_daily_observations("Paris", '2021-06-01', '2023-03-31')
+    assert demandes == [('2022-01-01', '2022-12-31')]
+    assert len(observations) == len(pd.date_range('2021-06-01', '2023-03-31', freq='D'))